@@ -48,6 +48,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "tracker.middleware.InstrumentationMiddleware",
+    "tracker.middleware.ReplicaPinningMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -89,9 +91,62 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("POSTGRES_HOST"),
         "PORT": os.getenv("POSTGRES_PORT"),
+        # Постоянные подключения с проверкой перед повторным использованием.
+        "CONN_MAX_AGE": int(os.getenv("POSTGRES_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Реплики для чтения: хосты через запятую в POSTGRES_REPLICA_HOSTS.
+for number, host in enumerate(filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",")), start=1):
+    DATABASES[f"replica_{number}"] = {**DATABASES["default"], "HOST": host.strip(), "TEST": {"MIRROR": "default"}}
+
+DATABASE_ROUTERS = ["tracker.routers.PrimaryReplicaRouter"]
+TRACKER_DB_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+# Сколько секунд после записи клиент читает из основной базы.
+TRACKER_DB_PIN_SECONDS = 5
+TRACKER_DB_HEALTH_CHECK_INTERVAL = 10
+TRACKER_DB_REPLICA_CACHE_TIMEOUT = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Кэш ответов API сбрасывается по версии данных, которая хранится в этом же кэше, поэтому кэш должен
+# быть общим для всех процессов (веб-процессов, обработчиков заданий, команд). Для рабочей нагрузки
+# рекомендуется Redis или Memcached (CACHE_BACKEND и CACHE_LOCATION); без них кэш хранится в таблице
+# базы данных (создается командой createcachetable), и каждое обращение к кэшу — SQL-запрос.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache")
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.getenv("CACHE_LOCATION", "tracker_cache"),
+        # Ограничение количества записей поддерживают только бэкенды базы данных, файлов и памяти процесса;
+        # Redis и Memcached вытесняют записи сами и не принимают этот параметр.
+        "OPTIONS": (
+            {}
+            if CACHE_BACKEND.endswith(("RedisCache", "MemcacheCache", "PyLibMCCache"))
+            else {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "10000"))}
+        ),
+    }
+}
+
+TRACKER_RESPONSE_CACHE_TIMEOUT = 300
+# Одновременные одинаковые запросы к аналитике вычисляются один раз в процессе; при общем бэкенде
+# кэша вычисление можно объединить и между процессами.
+TRACKER_COALESCE_ACROSS_PROCESSES = os.getenv("TRACKER_COALESCE_ACROSS_PROCESSES", "") == "1"
+TRACKER_COALESCE_TIMEOUT = 30
+TRACKER_SYNC_SETTLE_SECONDS = 5
+# Через сколько дней после последнего изменения завершенные деревья задач переносятся в архив.
+TRACKER_ARCHIVE_AFTER_DAYS = 90
+# За сколько часов до срока активная задача попадает в предупреждения сканера сроков.
+TRACKER_DEADLINE_WARNING_HOURS = 24
+# Очередь фоновых заданий: первая задержка повтора (удваивается с каждой попыткой), ее предел
+# и время, после которого выполняющееся задание считается брошенным обработчиком.
+TRACKER_JOB_RETRY_DELAY = 5
+TRACKER_JOB_MAX_RETRY_DELAY = 15 * 60
+TRACKER_JOB_LEASE_SECONDS = 10 * 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -137,6 +192,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "tracker.pagination.KeysetPagination",
 }
 
 SPECTACULAR_SETTINGS = {
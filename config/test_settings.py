@@ -0,0 +1,36 @@
+"""
+Настройки для запуска тестов без PostgreSQL: основная база и реплика — две локальные базы SQLite.
+
+    python manage.py test --settings=config.test_settings
+
+Тестовый запуск использует базы SQLite в памяти; файлы баз (они в .gitignore) создают только
+команды управления, запущенные с этими настройками (`migrate`, `benchmark_endpoints` и др.).
+Реплика не получает изменений основной базы, поэтому чтение с нее включается только
+в тестах маршрутизации (через override_settings(TRACKER_DB_REPLICAS=["replica"])).
+Тесты выполняются в одном процессе, поэтому кэш хранится в памяти и не добавляет SQL-запросов
+к проверяемым количествам запросов.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+        "TEST": {"NAME": ":memory:"},
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db_replica.sqlite3",
+        "TEST": {"NAME": ":memory:"},
+    },
+}
+
+TRACKER_DB_REPLICAS = []
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
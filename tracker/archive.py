@@ -0,0 +1,129 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .hierarchy import get_forest
+from .models import ArchivedTask, Task
+
+ARCHIVE_FIELDS = ("id", "name", "parent_task_id", "assignee_id", "deadline", "status", "created_at", "updated_at")
+ARCHIVE_BATCH_SIZE = 1000
+
+
+def get_archive_cutoff(days=None):
+    """Момент, раньше которого должна была последний раз измениться задача, чтобы попасть в архив."""
+    if days is None:
+        days = getattr(settings, "TRACKER_ARCHIVE_AFTER_DAYS", 90)
+    return timezone.now() - timedelta(days=days)
+
+
+def _is_archivable(task, cutoff):
+    return task.status == "completed" and task.updated_at < cutoff
+
+
+def _load_trees(roots, limit):
+    """
+    Загрузить деревья первых из корней `roots`, в которых вместе не больше `limit` задач.
+
+    Деревья загружаются одним запросом, ограниченным `limit` + 1 задачей; если ограничение
+    достигнуто, запрос повторяется для первой половины корней.
+
+    Returns:
+        tuple: {ID корня: задачи дерева} в порядке корней и ID корня, дерево которого одно
+        больше `limit` задач (None, если такого нет; деревья тогда не загружаются).
+    """
+    while True:
+        forest = get_forest(roots, fields=ARCHIVE_FIELDS, using="default", limit=limit + 1)
+        if len(forest) <= limit:
+            break
+        if len(roots) == 1:
+            return {}, roots[0]
+        roots = roots[: len(roots) // 2]
+
+    parents = {task.id: task.parent_task_id for task in forest}
+    trees = {root_id: [] for root_id in roots}
+    for task in forest:
+        root_id = task.id
+        while root_id not in trees:
+            root_id = parents[root_id]
+        trees[root_id].append(task)
+    return trees, None
+
+
+def archive_batch(cutoff, after_id=0, batch_size=ARCHIVE_BATCH_SIZE, log=None):
+    """
+    Перенести в архив одну порцию деревьев задач.
+
+    Дерево архивируется целиком, если все его задачи завершены и не менялись с момента `cutoff`,
+    поэтому ни одна задача в `Task` не ссылается на задачу в архиве. Деревья набираются по ID корней
+    после `after_id`, пока в порции не больше `batch_size` задач; дерево, которое одно больше `batch_size`
+    задач, остается в `Task` (его переносит запуск с большим размером порции). Каждая порция выполняется
+    в отдельной короткой транзакции; перед копированием блокируются все задачи порции. Если задача
+    изменилась после загрузки деревьев или к дереву добавилась подзадача, порция пропускается
+    и будет повторена при следующем запуске.
+
+    Returns:
+        tuple: ID последнего просмотренного корня (None, если корней больше нет),
+        количество перенесенных задач и количество деревьев, оставленных в `Task`.
+    """
+    log = log or (lambda message: None)
+    with transaction.atomic():
+        roots = list(
+            Task.objects.select_for_update()
+            .filter(parent_task__isnull=True, status="completed", updated_at__lt=cutoff, pk__gt=after_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not roots:
+            return None, 0, 0
+
+        trees, oversized = _load_trees(roots, batch_size)
+        if oversized is not None:
+            log(f"Дерево задачи {oversized} больше порции ({batch_size} задач) и оставлено в основной таблице")
+            return oversized, 0, 1
+
+        archived = []
+        archived_trees = skipped = 0
+        for tasks in trees.values():
+            if not all(_is_archivable(task, cutoff) for task in tasks):
+                skipped += 1
+                continue
+            archived.extend(tasks)
+            archived_trees += 1
+        last_root_id = list(trees)[-1]
+
+        if archived:
+            ids = [task.id for task in archived]
+            # Блокировка до конца транзакции: задача, измененная между проверкой и удалением,
+            # оказалась бы и в `Task`, и в архиве, или в архив попала бы ее устаревшая копия.
+            versions = dict(Task.objects.select_for_update().filter(pk__in=ids).values_list("id", "updated_at"))
+            changed = any(versions.get(task.id) != task.updated_at for task in archived)
+            if changed or Task.objects.filter(parent_task__in=ids).exclude(pk__in=ids).exists():
+                return last_root_id, 0, skipped + archived_trees
+            ArchivedTask.objects.bulk_create(
+                [ArchivedTask(**{field: getattr(task, field) for field in ARCHIVE_FIELDS}) for task in archived],
+                batch_size=ARCHIVE_BATCH_SIZE,
+            )
+            Task.objects.filter(pk__in=ids).delete()
+    return last_root_id, len(archived), skipped
+
+
+def archive_tasks(cutoff, batch_size=ARCHIVE_BATCH_SIZE, log=None):
+    """
+    Перенести в архив все подходящие деревья задач порциями.
+
+    Прерванный перенос безопасно запускать повторно: перенесенные задачи уже отсутствуют в `Task`.
+
+    Returns:
+        tuple: Количество перенесенных задач и количество деревьев, оставленных в `Task`.
+    """
+    log = log or (lambda message: None)
+    after_id, total, skipped = 0, 0, 0
+    while True:
+        after_id, archived, batch_skipped = archive_batch(cutoff, after_id, batch_size, log)
+        if after_id is None:
+            return total, skipped
+        total += archived
+        skipped += batch_skipped
+        log(f"Перенесено задач: {total}, последний корень: {after_id}")
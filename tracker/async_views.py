@@ -0,0 +1,146 @@
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, transaction
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException, MethodNotAllowed, NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .fastpath import get_value_columns, iter_value_rows
+from .filters import TaskFilterBackend
+from .middleware import instrumented_connections, timed_serialization
+from .models import Employee, Task
+from .pagination import KeysetPagination
+from .recommendations import WorkloadSnapshot, get_important_tasks, important_task_item, suggest_employee
+from .serializers import EmployeeSerializer, TaskSerializer
+
+_renderer = JSONRenderer()
+
+
+def _render(data, status=200):
+    return HttpResponse(_renderer.render(data), status=status, content_type="application/json")
+
+
+def async_api_view(view):
+    """
+    Асинхронное представление только для чтения с ответом в том же JSON, что и у DRF.
+
+    Обработчик получает DRF `Request` и возвращает данные ответа; исключения DRF
+    превращаются в ответ с кодом и телом, как в синхронных представлениях.
+    """
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            if request.method != "GET":
+                raise MethodNotAllowed(request.method)
+            return _render(await view(Request(request), *args, **kwargs))
+        except APIException as exc:
+            detail = exc.detail if isinstance(exc.detail, (dict, list)) else {"detail": exc.detail}
+            return _render(detail, exc.status_code)
+
+    return wrapper
+
+
+async def run_concurrently(*funcs):
+    """
+    Выполнить независимые синхронные функции с запросами к базе данных параллельно.
+
+    Асинхронный ORM выполняет все запросы запроса в одном потоке, поэтому независимые выборки
+    не перекрываются. Здесь каждая функция выполняется в отдельном потоке со своим подключением;
+    по завершении подключение закрывается по тем же правилам, что и в конце HTTP-запроса.
+    Внутри транзакции другие подключения не видят ее изменений, поэтому функции выполняются
+    последовательно в текущем подключении.
+
+    Returns:
+        list: Результаты функций в порядке аргументов.
+    """
+    in_transaction = await sync_to_async(lambda: transaction.get_connection().in_atomic_block)()
+    if in_transaction:
+        return [await sync_to_async(func)() for func in funcs]
+
+    def in_own_connection(func):
+        def run():
+            try:
+                with instrumented_connections():
+                    return func()
+            finally:
+                close_old_connections()
+
+        return sync_to_async(run, thread_sensitive=False)
+
+    return await asyncio.gather(*[in_own_connection(func)() for func in funcs])
+
+
+async def _list(request, queryset, serializer_class):
+    columns = get_value_columns(serializer_class)
+    paginator = KeysetPagination()
+    page = await paginator.apaginate_queryset(queryset.values(*[column for _, column, _ in columns]), request)
+    with timed_serialization():
+        data = list(iter_value_rows(page, columns))
+    return paginator.get_paginated_data(data)
+
+
+async def _detail(queryset, serializer_class, pk):
+    columns = get_value_columns(serializer_class)
+    try:
+        row = await queryset.values(*[column for _, column, _ in columns]).aget(pk=pk)
+    except queryset.model.DoesNotExist:
+        raise NotFound()
+    with timed_serialization():
+        return next(iter_value_rows([row], columns))
+
+
+@async_api_view
+async def employee_list(request):
+    return await _list(request, Employee.objects.all(), EmployeeSerializer)
+
+
+@async_api_view
+async def employee_detail(request, pk):
+    return await _detail(Employee.objects.all(), EmployeeSerializer, pk)
+
+
+@async_api_view
+async def busy_employees(request):
+    """Асинхронный вариант `EmployeeViewSet.busy_employees`."""
+    paginator = KeysetPagination()
+    queryset = Employee.objects.order_by("-active_tasks_count", "-id").values(
+        "id", "full_name", "position", "active_tasks_count"
+    )
+    employees = await paginator.apaginate_queryset(queryset, request)
+    return paginator.get_paginated_data(
+        [
+            {
+                "ФИО": employee["full_name"],
+                "ID": employee["id"],
+                "Должность": employee["position"],
+                "Количество активных задач": employee["active_tasks_count"],
+            }
+            for employee in employees
+        ]
+    )
+
+
+@async_api_view
+async def task_list(request):
+    queryset = TaskFilterBackend().filter_queryset(request, Task.objects.all(), None)
+    return await _list(request, queryset, TaskSerializer)
+
+
+@async_api_view
+async def task_detail(request, pk):
+    return await _detail(Task.objects.all(), TaskSerializer, pk)
+
+
+@async_api_view
+async def important_tasks(request):
+    """
+    Асинхронный вариант `TaskViewSet.important_tasks`.
+
+    Снимок загруженности сотрудников и важные задачи загружаются параллельно.
+    """
+    snapshot, tasks = await run_concurrently(WorkloadSnapshot.load, lambda: list(get_important_tasks()))
+    return [important_task_item(task, *suggest_employee(task, snapshot)) for task in tasks]
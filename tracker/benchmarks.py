@@ -0,0 +1,195 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from .archive import archive_tasks, get_archive_cutoff
+from .caching import get_cache
+from .datasets import seed_dataset
+from .deadlines import scan_deadlines
+from .jobs import precompute
+from .models import EmployeeWorkloadRollup, StatusRollup, Task
+from .search import reset_ngram_indexes
+from .workload import DEFAULT_RANGE_DAYS, take_snapshot
+
+# Эндпоинты и допустимое количество SQL-запросов. Бюджет не зависит от объема данных:
+# рост числа запросов вместе с данными означает проблему N+1.
+ENDPOINTS = [
+    ("employee-list", "/api/employees/", 2),
+    ("employee-detail", "/api/employees/{employee}/", 2),
+    ("busy-employees", "/api/employees/busy_employees/", 3),
+    ("task-list", "/api/tasks/", 2),
+    ("task-list-filtered", "/api/tasks/?status=in_progress&ordering=deadline", 2),
+    ("task-detail", "/api/tasks/{task}/", 2),
+    ("important-tasks", "/api/tasks/important_tasks/", 5),
+    ("assignment-plan", "/api/tasks/assignment_plan/?seed=1", 4),
+    ("task-rollups", "/api/tasks/rollups/", 2),
+    ("task-tree", "/api/tasks/{root}/tree/", 1),
+    ("task-ancestors", "/api/tasks/{leaf}/ancestors/", 1),
+    ("task-export", "/api/tasks/export/?status=in_progress", 1),
+    ("changes", "/api/changes/", 3),
+    ("dashboard", "/api/tasks/dashboard/", 1),
+    ("dashboard-employees", "/api/tasks/dashboard/?breakdown=employee", 1),
+    ("workload-employees", "/api/workload/employees/?employee={employee}&granularity=week", 1),
+    ("workload-statuses", "/api/workload/statuses/", 1),
+    ("archived-tasks", "/api/archived-tasks/?ordering=deadline", 1),
+    ("search", "/api/search/?q=Задача+12", 5),
+    ("search-prefix", "/api/search/?q=Сотрудник+1&mode=prefix&type=employees", 3),
+    ("deadline-alerts", "/api/deadline-alerts/", 2),
+    ("alert-tasks", "/api/deadline-alerts/tasks/?kind=overdue", 2),
+    ("alert-tasks-employee", "/api/deadline-alerts/tasks/?employee={employee}", 2),
+    ("precomputed", "/api/precomputed/important_tasks/", 3),
+]
+
+DEFAULT_SIZES = [1000, 10_000]
+# Замеры выполняются в одном процессе с кэшем в памяти: запросы к кэшу в базе данных
+# не должны попадать в бюджеты запросов эндпоинтов. Стоимость попадания в кэш в базе данных
+# (только чтение, без записи) проверяется отдельным тестом кэша ответов.
+BENCHMARK_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+DEFAULT_THRESHOLD = 0.25
+# Изменения латентности меньше этой величины считаются шумом измерения.
+MIN_REGRESSION_MS = 2.0
+
+
+def prepare_dataset(size, seed=None):
+    """
+    Заполнить таблицы, которые эндпоинты читают вместо таблицы задач.
+
+    В архив переносятся отдельные деревья из `size` / 10 задач, завершенных раньше срока архивации.
+    Предупреждения о сроках создаются первым запуском сканера, снимок загруженности копируется
+    на предыдущие дни, чтобы история покрывала весь период по умолчанию. Аналитика вычисляется
+    последней, по окончательным данным набора. Индексы поиска в памяти процесса сбрасываются:
+    в них остались бы объекты предыдущего (откаченного) набора.
+    """
+    reset_ngram_indexes()
+    cutoff = get_archive_cutoff()
+    _, archived_ids = seed_dataset(0, max(size // 10, 10), seed=seed)
+    Task.objects.filter(pk__gte=archived_ids[0]).update(status="completed", updated_at=cutoff - timedelta(days=1))
+    archive_tasks(cutoff)
+
+    scan_deadlines()
+    take_snapshot()
+    today = timezone.localdate()
+    for model in (EmployeeWorkloadRollup, StatusRollup):
+        fields = [field.attname for field in model._meta.concrete_fields if field.name not in ("id", "date")]
+        rows = list(model.objects.values(*fields))
+        model.objects.bulk_create(
+            [model(date=today - timedelta(days=days), **row) for days in range(1, DEFAULT_RANGE_DAYS) for row in rows],
+            batch_size=1000,
+        )
+    precompute("important_tasks")
+
+
+def measure_endpoint(client, url, repeat):
+    """
+    Выполнить GET-запрос несколько раз с пустым кэшем.
+
+    Returns:
+        tuple: Медианная латентность в миллисекундах и количество SQL-запросов последнего выполнения.
+    """
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        get_cache().clear()
+        cache.clear()
+        with CaptureQueriesContext(connections["default"]) as context:
+            started = time.perf_counter()
+            response = client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            timings.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url}: ответ {response.status_code}")
+        queries = len(context.captured_queries)
+    return statistics.median(timings), queries
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=5, seed=1, endpoints=None, log=None):
+    """
+    Замерить все эндпоинты на наборах данных нескольких размеров.
+
+    Каждый набор создается в транзакции, которая откатывается после замеров.
+
+    Args:
+        sizes: Количество задач в наборах; сотрудников в 100 раз меньше.
+        endpoints: Имена замеряемых эндпоинтов (по умолчанию все).
+
+    Returns:
+        dict: {размер: {эндпоинт: {"latency_ms": ..., "queries": ...}}}.
+    """
+    log = log or (lambda message: None)
+    client = Client()
+    results = {}
+    for size in sizes:
+        with (
+            transaction.atomic(),
+            override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"], CACHES=BENCHMARK_CACHES),
+        ):
+            employee_ids, task_ids = seed_dataset(max(size // 100, 10), size, seed=seed)
+            ids = {"employee": employee_ids[0], "task": task_ids[0], "root": task_ids[0], "leaf": task_ids[-1]}
+            prepare_dataset(size, seed=seed)
+            results[str(size)] = {}
+            for name, url, _ in ENDPOINTS:
+                if endpoints and name not in endpoints:
+                    continue
+                latency, queries = measure_endpoint(client, url.format(**ids), repeat)
+                results[str(size)][name] = {"latency_ms": round(latency, 2), "queries": queries}
+                log(f"{size:>9} {name:<20} {latency:9.2f} мс {queries:4} запросов")
+            transaction.set_rollback(True)
+    return results
+
+
+def check_results(results, baseline=None, threshold=DEFAULT_THRESHOLD):
+    """
+    Проверить результаты по бюджетам запросов и по сохраненному базовому замеру.
+
+    Эндпоинт без записи в базовом замере для размера, который в нем есть, тоже считается нарушением:
+    иначе регрессия нового эндпоинта осталась бы незамеченной до обновления базового замера.
+    Размеры, которых в базовом замере нет, проверяются только по бюджетам запросов.
+
+    Returns:
+        list: Описания нарушений; пустой список, если нарушений нет.
+    """
+    budgets = {name: budget for name, _, budget in ENDPOINTS}
+    violations = []
+    for size, endpoints in results.items():
+        for name, result in endpoints.items():
+            if result["queries"] > budgets[name]:
+                violations.append(f"{name} ({size}): {result['queries']} запросов при бюджете {budgets[name]}")
+            if baseline is None or size not in baseline:
+                continue
+            previous = baseline[size].get(name)
+            if previous is None:
+                violations.append(f"{name} ({size}): нет в базовом замере, обновите его с --update-baseline")
+                continue
+            limit = previous["latency_ms"] * (1 + threshold)
+            if result["latency_ms"] > limit and result["latency_ms"] - previous["latency_ms"] > MIN_REGRESSION_MS:
+                violations.append(
+                    f"{name} ({size}): {result['latency_ms']} мс, базовый замер {previous['latency_ms']} мс"
+                )
+    return violations
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, results):
+    """Сохранить результаты в базовый замер, сохранив в нем результаты незамеренных эндпоинтов и размеров."""
+    baseline = load_baseline(path) or {}
+    for size, endpoints in results.items():
+        baseline.setdefault(size, {}).update(endpoints)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(baseline, file, ensure_ascii=False, indent=2, sort_keys=True)
+        file.write("\n")
@@ -0,0 +1,141 @@
+from django.db import transaction
+from drf_spectacular.utils import OpenApiTypes, extend_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .middleware import timed_serialization
+
+
+class BulkModelMixin:
+    """
+    Массовое создание, обновление и удаление объектов через `/bulk/`.
+
+    Вся пачка проверяется целиком: поля — сериализатором `bulk_serializer_class`,
+    связи и существование объектов — запросами на всю пачку, а не на каждый элемент.
+    Запись выполняется через `bulk_create`/`bulk_update` в одной транзакции.
+    При ошибках ничего не сохраняется, а в ответе возвращается список ошибок по элементам.
+    """
+
+    bulk_serializer_class = None
+    bulk_batch_size = 1000
+    bulk_max_items = 10000
+
+    @extend_schema(
+        methods=["POST", "PATCH"],
+        description="Массово создать (POST) или частично обновить (PATCH) объекты. Принимает массив объектов.",
+    )
+    @extend_schema(
+        methods=["DELETE"],
+        description="Массово удалить объекты. Принимает массив идентификаторов.",
+        request=OpenApiTypes.OBJECT,
+        responses={204: None},
+    )
+    @action(
+        detail=False,
+        methods=["post", "patch", "delete"],
+        url_path="bulk",
+        pagination_class=None,
+        filter_backends=[],
+    )
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"detail": "Ожидается непустой массив."})
+        if len(items) > self.bulk_max_items:
+            raise ValidationError({"detail": f"Не более {self.bulk_max_items} элементов за запрос."})
+
+        if request.method == "POST":
+            return self.perform_bulk_create(items)
+        if request.method == "PATCH":
+            return self.perform_bulk_update(items)
+        return self.perform_bulk_delete(items)
+
+    def get_serializer_class(self):
+        if self.action == "bulk" and self.bulk_serializer_class is not None:
+            return self.bulk_serializer_class
+        return super().get_serializer_class()
+
+    def check_bulk_items(self, items, errors, instances=None):
+        """
+        Проверить связи всей пачки и дописать ошибки элементов в `errors`.
+
+        Args:
+            items: Проверенные сериализатором данные элементов.
+            errors: Список ошибок по элементам, дополняется на месте.
+            instances: Обновляемые объекты по идентификатору (только при обновлении).
+        """
+
+    def validate_bulk(self, items, partial=False, instances=None):
+        child = self.get_serializer(many=True, partial=partial).child
+        validated, errors = [], []
+        for item in items:
+            try:
+                validated.append(child.run_validation(item))
+                errors.append({})
+            except ValidationError as exc:
+                validated.append(None)
+                errors.append(dict(exc.detail) if isinstance(exc.detail, dict) else {"non_field_errors": exc.detail})
+
+        checked_items = [item for item in validated if item is not None]
+        checked_errors = [item_errors for item, item_errors in zip(validated, errors) if item is not None]
+        if instances is not None:
+            seen = set()
+            for item, item_errors in zip(checked_items, checked_errors):
+                if item["id"] not in instances:
+                    item_errors["id"] = ["Объект не найден."]
+                elif item["id"] in seen:
+                    item_errors["id"] = ["Объект указан в пачке несколько раз."]
+                seen.add(item["id"])
+        if checked_items:
+            self.check_bulk_items(checked_items, checked_errors, instances)
+
+        if any(errors):
+            raise ValidationError({"errors": errors})
+        return validated
+
+    def perform_bulk_create(self, items):
+        model = self.get_queryset().model
+        validated = self.validate_bulk(items)
+        objs = []
+        for data in validated:
+            data.pop("id", None)
+            objs.append(model(**data))
+        with transaction.atomic():
+            objs = model.objects.bulk_create(objs, batch_size=self.bulk_batch_size)
+        with timed_serialization():
+            data = self.get_serializer(objs, many=True).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def perform_bulk_update(self, items):
+        model = self.get_queryset().model
+        ids = [item["id"] for item in items if isinstance(item, dict) and isinstance(item.get("id"), int)]
+        instances = model.objects.in_bulk(ids)
+        validated = self.validate_bulk(items, partial=True, instances=instances)
+
+        objs = []
+        fields = set()
+        for data in validated:
+            obj = instances[data.pop("id")]
+            for attr, value in data.items():
+                setattr(obj, attr, value)
+            fields.update(data)
+            objs.append(obj)
+        if fields:
+            with transaction.atomic():
+                model.objects.bulk_update(objs, sorted(fields), batch_size=self.bulk_batch_size)
+        with timed_serialization():
+            data = self.get_serializer(objs, many=True).data
+        return Response(data)
+
+    def perform_bulk_delete(self, items):
+        model = self.get_queryset().model
+        ids = [item for item in items if isinstance(item, int) and not isinstance(item, bool)]
+        existing = set(model.objects.filter(pk__in=ids).values_list("pk", flat=True))
+        errors = [{} if item in existing else {"id": ["Объект не найден."]} for item in items]
+        if any(errors):
+            raise ValidationError({"errors": errors})
+        with transaction.atomic():
+            model.objects.filter(pk__in=existing).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,152 @@
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from .routers import reads_primary_only, used_replica
+
+DATA_VERSION_KEY = "tracker:data-version"
+CACHED_HEADERS = ("ETag", "Last-Modified")
+
+# Счетчики попаданий и промахов хранятся в памяти процесса, как и гистограммы метрик:
+# запись в общий кэш на каждый запрос (в DatabaseCache — отдельная транзакция) стоила бы дороже попадания.
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[getattr(settings, "TRACKER_CACHE_ALIAS", "default")]
+
+
+def get_timeout():
+    """
+    Время хранения ответа в кэше.
+
+    Ответ, прочитанный с реплики, мог отстать от основной базы уже после смены версии данных,
+    поэтому хранится не дольше TRACKER_DB_REPLICA_CACHE_TIMEOUT секунд.
+    """
+    timeout = getattr(settings, "TRACKER_RESPONSE_CACHE_TIMEOUT", 300)
+    if used_replica():
+        timeout = min(timeout, getattr(settings, "TRACKER_DB_REPLICA_CACHE_TIMEOUT", 5))
+    return timeout
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def get_data_version():
+    """
+    Получить текущую версию данных.
+
+    Если версия отсутствует в кэше, она инициализируется текущим временем в наносекундах,
+    чтобы после вытеснения ключа не вернуться к одной из уже использованных версий.
+    """
+    cache = get_cache()
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(DATA_VERSION_KEY)
+    return version
+
+
+def _bump():
+    # Новая версия — текущее время, а не incr: incr в DatabaseCache не атомарен (чтение и запись)
+    # и сбрасывает время хранения ключа. Версии сравниваются только на равенство, поэтому
+    # параллельные смены версии не теряются: каждая записывает значение, отличное от прежнего.
+    get_cache().set(DATA_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def bump_data_version(using="default"):
+    """
+    Сменить версию данных, сделав недействительными все закэшированные ответы.
+
+    Версия меняется сразу и повторно после фиксации транзакции: иначе параллельный запрос,
+    прочитавший данные до фиксации, мог бы сохранить устаревший ответ под новой версией.
+    """
+    _bump()
+    transaction.on_commit(_bump, using=using)
+
+
+def response_cache_key(request, version):
+    return f"tracker:response:{version}:{request.method}:{request.build_absolute_uri()}"
+
+
+def get_cache_stats():
+    """Количество попаданий и промахов кэша ответов в текущем процессе."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.update(hits=0, misses=0)
+
+
+def cache_response(view_method):
+    """
+    Кэшировать успешные ответы метода ViewSet до следующего изменения данных.
+
+    Ключ включает версию данных и полный URL запроса, поэтому любая запись в `Employee`
+    или `Task` через ORM делает недействительными все ранее сохраненные ответы.
+    Вместе с данными сохраняются заголовки ETag и Last-Modified: попадание в кэш
+    обслуживает и условные запросы без обращения к базе данных.
+    Если у ответа задан атрибут `cache_expires_at`, ответ хранится не дольше этого момента.
+    В ответ добавляется заголовок `X-Cache: HIT` или `X-Cache: MISS`. Попадание только читает
+    кэш (версию данных и ответ) и ничего в него не записывает.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        cache = get_cache()
+        key = response_cache_key(request, get_data_version())
+        # Клиент, закрепленный за основной базой после записи, не должен получить ответ, прочитанный с реплики.
+        entry = None if reads_primary_only() else cache.get(key)
+        if entry is not None:
+            _count("hits")
+            headers = entry["headers"]
+            response = get_conditional_response(
+                request._request,
+                etag=headers.get("ETag"),
+                last_modified=parse_http_date_safe(headers.get("Last-Modified")),
+            )
+            if response is None:
+                response = Response(entry["data"], headers=headers)
+            response["X-Cache"] = "HIT"
+            return response
+
+        _count("misses")
+        response = view_method(self, request, *args, **kwargs)
+        if isinstance(response, Response) and response.status_code == 200:
+            headers = {name: response[name] for name in CACHED_HEADERS if name in response}
+            timeout = get_timeout()
+            # Ответ, зависящий от текущего времени, хранится только до момента, когда он изменится.
+            expires_at = getattr(response, "cache_expires_at", None)
+            if expires_at is not None:
+                timeout = min(timeout, int((expires_at - timezone.now()).total_seconds()))
+            if timeout > 0:
+                cache.set(key, {"data": response.data, "headers": headers}, timeout)
+        response["X-Cache"] = "MISS"
+        return response
+
+    return wrapper
+
+
+class CachedResponseMixin:
+    """Кэширование списка и детального представления ViewSet по версии данных."""
+
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
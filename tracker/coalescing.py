@@ -0,0 +1,164 @@
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .caching import get_cache, get_data_version
+from .routers import reads_primary_only
+
+LOCK_PREFIX = "tracker:single-flight:lock"
+RESULT_PREFIX = "tracker:single-flight:result"
+# Заголовки запроса, от которых зависит ответ при той же версии данных и том же URL.
+CONDITIONAL_HEADERS = ("HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE")
+POLL_INTERVAL = 0.05
+
+
+def get_wait_timeout():
+    """Сколько секунд ждать чужого вычисления, прежде чем выполнить его самостоятельно."""
+    return getattr(settings, "TRACKER_COALESCE_TIMEOUT", 30)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Объединение одновременных вычислений с одинаковым ключом внутри процесса.
+
+    Первый вызов с ключом выполняет функцию, остальные вызовы, пришедшие до ее завершения,
+    ждут и получают тот же результат (или то же исключение). После завершения ключ освобождается,
+    поэтому результат не кэшируется: следующий вызов снова выполнит функцию.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        Выполнить функцию или дождаться результата уже выполняющегося вызова с тем же ключом.
+
+        Returns:
+            tuple: Результат и признак того, что он получен от другого вызова.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(get_wait_timeout()):
+                return func(), False
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+_flights = SingleFlight()
+
+
+def compute_across_processes(key, func):
+    """
+    Выполнить функцию в одном процессе из всех, использующих общий кэш.
+
+    Процесс, захвативший блокировку в кэше (`cache.add`), выполняет функцию и сохраняет результат
+    на время ожидания; остальные опрашивают кэш. Если результат не появился за TRACKER_COALESCE_TIMEOUT
+    секунд (например, процесс-вычислитель завершился с ошибкой), функция выполняется самостоятельно.
+    Результат должен сериализоваться бэкендом кэша.
+
+    Returns:
+        tuple: Результат и признак того, что он вычислен другим процессом.
+    """
+    cache = get_cache()
+    timeout = get_wait_timeout()
+    lock_key = f"{LOCK_PREFIX}:{key}"
+    result_key = f"{RESULT_PREFIX}:{key}"
+    deadline = time.monotonic() + timeout
+    while True:
+        result = cache.get(result_key)
+        if result is not None:
+            return result, True
+        if cache.add(lock_key, 1, timeout):
+            try:
+                result = func()
+                cache.set(result_key, result, timeout)
+                return result, False
+            finally:
+                cache.delete(lock_key)
+        if time.monotonic() >= deadline:
+            return func(), False
+        time.sleep(POLL_INTERVAL)
+
+
+def flight_key(request):
+    """Ключ вычисления ответа: версия данных, URL, условные заголовки и закрепление за основной базой."""
+    conditions = "|".join(request.META.get(header, "") for header in CONDITIONAL_HEADERS)
+    return (
+        f"{get_data_version()}:{request.method}:{request.build_absolute_uri()}:"
+        f"{conditions}:{int(reads_primary_only())}"
+    )
+
+
+def coalesce_requests(view_method):
+    """
+    Вычислять ответ метода ViewSet один раз для одновременных одинаковых безопасных запросов.
+
+    Запросы с тем же URL, версией данных и условными заголовками, пришедшие, пока ответ
+    вычисляется, получают копию этого ответа. При TRACKER_COALESCE_ACROSS_PROCESSES
+    вычисление объединяется и между процессами через блокировку в кэше ответов (нужен общий бэкенд).
+    Изменяющие запросы выполняются как обычно. Ответ, полученный от другого запроса,
+    содержит заголовок `X-Coalesced: 1`.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return view_method(self, request, *args, **kwargs)
+
+        def compute():
+            response = view_method(self, request, *args, **kwargs)
+            # Ответ 304 не содержит данных.
+            return (
+                response.status_code,
+                getattr(response, "data", None),
+                dict(response.items()),
+                getattr(response, "cache_expires_at", None),
+            )
+
+        key = flight_key(request)
+        if getattr(settings, "TRACKER_COALESCE_ACROSS_PROCESSES", False):
+            (payload, remote), shared = _flights.do(key, lambda: compute_across_processes(key, compute))
+            shared = shared or remote
+        else:
+            payload, shared = _flights.do(key, compute)
+        status_code, data, headers, expires_at = payload
+        headers = dict(headers)
+        headers.pop("Content-Type", None)
+        response = Response(data, status=status_code, headers=headers)
+        response.cache_expires_at = expires_at
+        if shared:
+            response["X-Coalesced"] = "1"
+        return response
+
+    return wrapper
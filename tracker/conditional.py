@@ -0,0 +1,92 @@
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max, Subquery
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.exceptions import NotFound
+
+from .models import Tombstone
+
+TOMBSTONE_MODELS = {model for model, _ in Tombstone.MODEL_CHOICES}
+
+
+def get_fingerprint(querysets):
+    """
+    Получить отпечаток данных выборок без их сериализации.
+
+    Для каждой выборки выполняется один агрегирующий запрос: максимальное время
+    изменения и количество строк. Удаление меняет количество, вставка и изменение —
+    максимальное время изменения. Время последнего изменения учитывает и последнее
+    надгробие модели, иначе после удаления строк Last-Modified не сдвинулся бы вперед.
+
+    Returns:
+        tuple: Строка отпечатка и время последнего изменения (или None для пустых выборок).
+    """
+    parts = []
+    last_modified = None
+    for queryset in querysets:
+        aggregates = {"last": Max("updated_at"), "count": Count("pk")}
+        model_name = queryset.model._meta.model_name
+        if model_name in TOMBSTONE_MODELS:
+            # Некоррелированный подзапрос вычисляется базой данных один раз на запрос.
+            deleted = Tombstone.objects.filter(model=model_name).order_by("-deleted_at").values("deleted_at")[:1]
+            aggregates["deleted"] = Max(Subquery(deleted))
+        stats = queryset.order_by().aggregate(**aggregates)
+        parts.append(f"{stats['last'].isoformat() if stats['last'] else ''}:{stats['count']}")
+        for moment in (stats["last"], stats.get("deleted")):
+            if moment and (last_modified is None or moment > last_modified):
+                last_modified = moment
+    return "|".join(parts), last_modified
+
+
+def conditional_get(get_querysets):
+    """
+    Поддержка условных GET-запросов (ETag, Last-Modified) для метода ViewSet.
+
+    Args:
+        get_querysets: Функция (view, request, *args, **kwargs), возвращающая выборки,
+            от которых зависит ответ.
+
+    Ответ 304 возвращается до вызова обработчика, то есть без выборки и сериализации данных.
+    """
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            fingerprint, last_modified = get_fingerprint(get_querysets(self, request, *args, **kwargs))
+            digest = hashlib.sha1(f"{request.get_full_path()}|{fingerprint}".encode()).hexdigest()
+            etag = quote_etag(digest)
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view_method(self, request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response["ETag"] = etag
+                if timestamp is not None:
+                    response["Last-Modified"] = http_date(timestamp)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+class ConditionalGetMixin:
+    """Условные GET-запросы для списка и детального представления ViewSet."""
+
+    def get_object_querysets(self, **kwargs):
+        """Выборка объекта детального представления; некорректный ключ — 404, как и у поиска объекта DRF."""
+        try:
+            return [self.get_queryset().filter(pk=kwargs["pk"])]
+        except (ValueError, TypeError):
+            raise NotFound()
+
+    @conditional_get(lambda view, request, *args, **kwargs: [view.filter_queryset(view.get_queryset())])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get(lambda view, request, *args, **kwargs: view.get_object_querysets(**kwargs))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
@@ -0,0 +1,142 @@
+from datetime import timedelta
+
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from .deadlines import get_warning_hours
+from .models import ACTIVE_STATUSES, Task
+
+BREAKDOWNS = {
+    "employee": "assignee_id",
+    "parent": "parent_task_id",
+}
+BREAKDOWN_DEFAULT_LIMIT = 100
+BREAKDOWN_MAX_LIMIT = 1000
+
+# Счетчики, которые складываются по группам, и их названия в ответе.
+COUNTERS = {
+    "total": "Всего задач",
+    "active": "Активных",
+    "completed": "Завершено",
+    "overdue": "Просрочено",
+    "due_soon": "Скоро срок",
+    "unassigned": "Без исполнителя",
+}
+BREAKDOWN_COUNTERS = ("total", "active", "completed", "overdue", "due_soon")
+MINIMUMS = ("next_overdue", "next_due_soon")
+
+
+def get_aggregates(now, horizon):
+    """
+    Условные агрегаты по статусу, сроку и исполнителю для одного прохода по задачам.
+
+    Сначала идут счетчики, затем минимумы сроков (MINIMUMS).
+    """
+    active = Q(status__in=ACTIVE_STATUSES)
+    aggregates = {
+        "total": Count("pk"),
+        "active": Count("pk", filter=active),
+        "overdue": Count("pk", filter=active & Q(deadline__lte=now)),
+        "due_soon": Count("pk", filter=active & Q(deadline__gt=now, deadline__lte=horizon)),
+        "unassigned": Count("pk", filter=active & Q(assignee__isnull=True)),
+    }
+    for status, _ in Task.STATUS_CHOICES:
+        aggregates[status] = Count("pk", filter=Q(status=status))
+    # Ближайшие моменты, когда изменятся счетчики просроченных задач и задач со скорым сроком.
+    aggregates["next_overdue"] = Min("deadline", filter=active & Q(deadline__gt=now))
+    aggregates["next_due_soon"] = Min("deadline", filter=active & Q(deadline__gt=horizon))
+    return aggregates
+
+
+def _merge(target, values, counters):
+    """Прибавить к итогам группы значения строки: первые `counters` значений — счетчики, остальные — минимумы."""
+    for index in range(counters):
+        target[index] += values[index]
+    for index in range(counters, len(values)):
+        value = values[index]
+        if value is not None and (target[index] is None or value < target[index]):
+            target[index] = value
+
+
+def _breakdown(groups, label, limit):
+    overdue, active = BREAKDOWN_COUNTERS.index("overdue"), BREAKDOWN_COUNTERS.index("active")
+    rows = sorted(
+        groups.items(), key=lambda item: (-item[1][overdue], -item[1][active], item[0] is None, item[0] or 0)
+    )
+    return [
+        {label: group_id, **{COUNTERS[name]: counts[index] for index, name in enumerate(BREAKDOWN_COUNTERS)}}
+        for group_id, counts in rows[:limit]
+    ]
+
+
+def get_dashboard(breakdowns=(), limit=BREAKDOWN_DEFAULT_LIMIT, hours=None, now=None):
+    """
+    Получить основные показатели задач одним группирующим запросом к `Task`.
+
+    Все счетчики — условные агрегаты (`COUNT(*) FILTER (WHERE ...)`) по статусу, сроку и исполнителю.
+    С разбивкой запрос группирует задачи по исполнителю (и родителю), а итоги и разбивки
+    складываются из строк этого же запроса; без разбивки выполняется один агрегирующий запрос.
+    Объем результата с разбивкой по родителям растет с количеством родительских задач.
+
+    Args:
+        breakdowns: Разбивки: "employee" — по исполнителям, "parent" — по родительским задачам.
+        limit: Сколько строк каждой разбивки вернуть (по убыванию просроченных, затем активных задач).
+        hours: За сколько часов до срока задача считается задачей со скорым сроком.
+
+    Returns:
+        tuple: Показатели и момент, до которого они не изменятся без изменения данных
+        (None, если таких моментов нет).
+    """
+    now = now or timezone.now()
+    if hours is None:
+        hours = get_warning_hours()
+    horizon = now + timedelta(hours=hours)
+    aggregates = get_aggregates(now, horizon)
+    queryset = Task.objects.order_by()
+
+    if not breakdowns:
+        busy = Count("assignee", distinct=True, filter=Q(status__in=ACTIVE_STATUSES))
+        totals = queryset.aggregate(busy=busy, **aggregates)
+        busy_employees = totals.pop("busy")
+        groups = {}
+    else:
+        fields = ["assignee_id"] + (["parent_task_id"] if "parent" in breakdowns else [])
+        names = list(aggregates)
+        counters = len(names) - len(MINIMUMS)
+        positions = [names.index(name) for name in BREAKDOWN_COUNTERS]
+        active = names.index("active")
+        values = [0] * counters + [None] * len(MINIMUMS)
+        groups = {name: {} for name in breakdowns}
+        busy = set()
+        # Строки — кортежи: поля группировки, затем агрегаты в порядке `names`.
+        for row in queryset.values(*fields).annotate(**aggregates).values_list(*fields, *names):
+            keys, row = dict(zip(fields, row)), row[len(fields):]
+            _merge(values, row, counters)
+            if row[active] and keys["assignee_id"] is not None:
+                busy.add(keys["assignee_id"])
+            counts = [row[position] for position in positions]
+            for name, group in groups.items():
+                group_id = keys[BREAKDOWNS[name]]
+                if name == "parent" and group_id is None:
+                    continue
+                if group_id in group:
+                    _merge(group[group_id], counts, len(counts))
+                else:
+                    group[group_id] = list(counts)
+        totals = dict(zip(names, values))
+        busy_employees = len(busy)
+
+    result = {COUNTERS[name]: totals.get(name) or 0 for name in COUNTERS}
+    result["По статусам"] = {status: totals.get(status) or 0 for status, _ in Task.STATUS_CHOICES}
+    result["Занятых сотрудников"] = busy_employees
+    result["Ближайший срок"] = totals.get("next_overdue")
+    if "employee" in breakdowns:
+        result["По сотрудникам"] = _breakdown(groups["employee"], "ID сотрудника", limit)
+    if "parent" in breakdowns:
+        result["По родительским задачам"] = _breakdown(groups["parent"], "ID родительской задачи", limit)
+
+    changes = [totals.get("next_overdue")]
+    if totals.get("next_due_soon") is not None:
+        changes.append(totals["next_due_soon"] - timedelta(hours=hours))
+    changes = [moment for moment in changes if moment is not None]
+    return result, min(changes, default=None)
@@ -0,0 +1,92 @@
+import random
+from datetime import timedelta
+from itertools import accumulate
+
+from django.utils import timezone
+
+from .models import Employee, Task
+
+STATUS_WEIGHTS = {"completed": 60, "in_progress": 25, "not_started": 15}
+UNASSIGNED_SHARE = 0.1
+# Во сколько раз каждый следующий уровень вложенности меньше предыдущего.
+DEPTH_RATIO = 0.85
+INSERT_CHUNK_SIZE = 50_000
+
+
+def get_layer_sizes(tasks, max_depth):
+    """Распределить задачи по уровням вложенности: корней больше всего, глубже — геометрически меньше."""
+    weights = [DEPTH_RATIO**depth for depth in range(max_depth + 1)]
+    total = sum(weights)
+    sizes = [int(tasks * weight / total) for weight in weights]
+    sizes[0] += tasks - sum(sizes)
+    return [size for size in sizes if size]
+
+
+def seed_dataset(employees, tasks, max_depth=20, seed=None, batch_size=1000, log=None):
+    """
+    Создать набор данных с реалистичным распределением.
+
+    Задачи создаются по уровням вложенности: родитель каждой задачи выбирается среди задач
+    предыдущего уровня, поэтому цепочки предков достигают `max_depth`. Статусы распределены
+    неравномерно (STATUS_WEIGHTS), нагрузка сотрудников — по закону Ципфа, часть задач
+    не назначена. Вставка выполняется через `bulk_create` порциями не более INSERT_CHUNK_SIZE
+    объектов, так что счетчики активных задач пересчитываются один раз на порцию.
+
+    Args:
+        employees: Количество сотрудников.
+        tasks: Количество задач.
+        max_depth: Максимальная глубина вложенности задач.
+        seed: Seed генератора случайных чисел для воспроизводимого набора.
+        batch_size: Размер пачки одного INSERT.
+        log: Функция для вывода прогресса.
+
+    Returns:
+        tuple: Списки ID созданных сотрудников и задач.
+    """
+    rng = random.Random(seed)
+    log = log or (lambda message: None)
+    now = timezone.now()
+
+    employee_ids = [
+        employee.id
+        for employee in Employee.objects.bulk_create(
+            [
+                Employee(full_name=f"Сотрудник {number}", position=rng.choice(["Разработчик", "Аналитик", "Менеджер"]))
+                for number in range(employees)
+            ],
+            batch_size=batch_size,
+        )
+    ]
+    log(f"Создано сотрудников: {len(employee_ids)}")
+
+    statuses = list(STATUS_WEIGHTS)
+    status_weights = list(accumulate(STATUS_WEIGHTS.values()))
+    employee_weights = list(accumulate(1 / rank for rank in range(1, len(employee_ids) + 1)))
+
+    def make_task(number, parent_id):
+        assignee_id = None
+        if employee_ids and rng.random() >= UNASSIGNED_SHARE:
+            assignee_id = rng.choices(employee_ids, cum_weights=employee_weights)[0]
+        return Task(
+            name=f"Задача {number}",
+            parent_task_id=parent_id,
+            assignee_id=assignee_id,
+            status=rng.choices(statuses, cum_weights=status_weights)[0],
+            deadline=now + timedelta(minutes=rng.randint(-30 * 24 * 60, 90 * 24 * 60)),
+        )
+
+    task_ids = []
+    previous_layer = [None]
+    number = 0
+    for depth, size in enumerate(get_layer_sizes(tasks, max_depth)):
+        layer = []
+        for start in range(0, size, INSERT_CHUNK_SIZE):
+            objs = []
+            for _ in range(min(INSERT_CHUNK_SIZE, size - start)):
+                objs.append(make_task(number, rng.choice(previous_layer)))
+                number += 1
+            layer.extend(task.id for task in Task.objects.bulk_create(objs, batch_size=batch_size))
+        log(f"Уровень {depth}: создано задач {len(layer)}")
+        task_ids.extend(layer)
+        previous_layer = layer
+    return employee_ids, task_ids
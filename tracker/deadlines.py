@@ -0,0 +1,234 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from .models import ACTIVE_STATUSES, DeadlineAlert, DeadlineScanState, Employee, Task, Tombstone
+from .sync import get_settle_window
+
+SCAN_BATCH_SIZE = 1000
+ALERT_KINDS = [kind for kind, _ in DeadlineAlert.KIND_CHOICES]
+ALERTS_DEFAULT_LIMIT = 100
+ALERTS_MAX_LIMIT = 1000
+SCAN_FIELDS = ("id", "status", "deadline", "assignee_id")
+
+
+def get_warning_hours():
+    """За сколько часов до срока задача считается задачей со скорым сроком."""
+    return getattr(settings, "TRACKER_DEADLINE_WARNING_HOURS", 24)
+
+
+def _alert_kind(row, now, horizon):
+    if row["status"] not in ACTIVE_STATUSES:
+        return None
+    if row["deadline"] <= now:
+        return "overdue"
+    if row["deadline"] <= horizon:
+        return "approaching"
+    return None
+
+
+def _keyset(queryset, field, batch_size):
+    """Строки выборки порциями по возрастанию (`field`, id) без смещения."""
+    last = None
+    while True:
+        page = queryset
+        if last is not None:
+            page = page.filter(Q(**{f"{field}__gt": last[field]}) | Q(**{field: last[field], "id__gt": last["id"]}))
+        rows = list(page.order_by(field, "id")[:batch_size])
+        if not rows:
+            return
+        yield rows
+        last = rows[-1]
+
+
+def _iter_deadline_range(lower, upper, batch_size):
+    """
+    Активные задачи со сроком в полуинтервале (`lower`, `upper`] порциями.
+
+    Для каждого активного статуса читается диапазон индекса `(status, deadline)`.
+    """
+    for status in ACTIVE_STATUSES:
+        queryset = Task.objects.using("default").filter(status=status, deadline__lte=upper)
+        if lower is not None:
+            queryset = queryset.filter(deadline__gt=lower)
+        yield from _keyset(queryset.values(*SCAN_FIELDS), "deadline", batch_size)
+
+
+def _apply(rows, now, horizon):
+    """
+    Привести предупреждения задач порции в соответствие с их статусом и сроком.
+
+    Записываются только изменившиеся предупреждения; время обнаружения сохраняется,
+    пока не меняется вид предупреждения.
+
+    Returns:
+        Counter: Количество новых предупреждений по видам и количество снятых (`removed`).
+    """
+    existing = {alert.task_id: alert for alert in DeadlineAlert.objects.filter(task_id__in=[row["id"] for row in rows])}
+    counts = Counter()
+    changed, removed = [], []
+    for row in rows:
+        kind = _alert_kind(row, now, horizon)
+        alert = existing.get(row["id"])
+        if kind is None:
+            if alert is not None:
+                removed.append(row["id"])
+            continue
+        current = (kind, row["assignee_id"], row["deadline"])
+        if alert is not None and (alert.kind, alert.assignee_id, alert.deadline) == current:
+            continue
+        if alert is None or alert.kind != kind:
+            counts[kind] += 1
+        changed.append(
+            DeadlineAlert(
+                task_id=row["id"],
+                assignee_id=row["assignee_id"],
+                kind=kind,
+                deadline=row["deadline"],
+                raised_at=alert.raised_at if alert is not None and alert.kind == kind else now,
+            )
+        )
+    with transaction.atomic():
+        DeadlineAlert.objects.bulk_create(
+            changed,
+            update_conflicts=True,
+            unique_fields=["task_id"],
+            update_fields=["assignee_id", "kind", "deadline", "raised_at"],
+        )
+        if removed:
+            DeadlineAlert.objects.filter(task_id__in=removed).delete()
+    counts["removed"] += len(removed)
+    return counts
+
+
+def scan_deadlines(hours=None, batch_size=SCAN_BATCH_SIZE, log=None):
+    """
+    Обновить предупреждения о просроченных задачах и задачах со скорым сроком.
+
+    Сканер хранит границы уже обработанных сроков в `DeadlineScanState` и за запуск читает только:
+
+    - активные задачи, срок которых прошел после предыдущей границы просрочки;
+    - активные задачи, срок которых вошел в окно `hours` часов после предыдущей границы окна;
+    - задачи, измененные после предыдущего запуска (по индексу `(updated_at, id)`, с запасом
+      TRACKER_SYNC_SETTLE_SECONDS), — смена статуса, срока или исполнителя, новые задачи со сроком
+      внутри уже обработанного диапазона;
+    - надгробия задач, удаленных после предыдущего запуска.
+
+    Поэтому время запуска зависит от количества новых событий, а не от количества задач. Первый запуск
+    обрабатывает все активные задачи со сроком до конца окна. Окно `hours` сохраняется в состоянии:
+    если оно сузилось, предупреждения о скором сроке за пределами нового окна снимаются, если
+    расширилось — дочитывается только добавленная часть окна. Границы сохраняются после каждого этапа,
+    а записи предупреждений идемпотентны, поэтому прерванный или одновременный запуск безопасен.
+
+    Returns:
+        dict: Количество новых предупреждений по видам и количество снятых предупреждений.
+    """
+    log = log or (lambda message: None)
+    if hours is None:
+        hours = get_warning_hours()
+    now = timezone.now()
+    horizon = now + timedelta(hours=hours)
+    state, _ = DeadlineScanState.objects.get_or_create(pk=1)
+    states = DeadlineScanState.objects.filter(pk=state.pk)
+    counts = Counter()
+
+    for rows in _iter_deadline_range(state.overdue_until, now, batch_size):
+        counts.update(_apply(rows, now, horizon))
+    states.update(overdue_until=now)
+    log(f"Просроченных задач: {counts['overdue']}")
+
+    if state.warning_hours is not None and hours < state.warning_hours:
+        counts["removed"] += DeadlineAlert.objects.filter(kind="approaching", deadline__gt=horizon).delete()[0]
+    lower = max(state.approaching_until, now) if state.approaching_until else now
+    if lower < horizon:
+        for rows in _iter_deadline_range(lower, horizon, batch_size):
+            counts.update(_apply(rows, now, horizon))
+    states.update(approaching_until=horizon, warning_hours=hours)
+    log(f"Задач со скорым сроком: {counts['approaching']}")
+
+    if state.changes_since is not None:
+        since = state.changes_since - get_settle_window()
+        changed = Task.objects.using("default").filter(updated_at__gte=since).values(*SCAN_FIELDS, "updated_at")
+        for rows in _keyset(changed, "updated_at", batch_size):
+            counts.update(_apply(rows, now, horizon))
+        deleted = (
+            Tombstone.objects.using("default")
+            .filter(model="task", deleted_at__gte=since)
+            .values_list("object_id", flat=True)
+            .iterator(chunk_size=batch_size)
+        )
+        batch = []
+        for task_id in deleted:
+            batch.append(task_id)
+            if len(batch) == batch_size:
+                counts["removed"] += DeadlineAlert.objects.filter(task_id__in=batch).delete()[0]
+                batch = []
+        if batch:
+            counts["removed"] += DeadlineAlert.objects.filter(task_id__in=batch).delete()[0]
+    states.update(changes_since=now)
+    return {kind: counts[kind] for kind in [*ALERT_KINDS, "removed"]}
+
+
+def get_alert_groups():
+    """
+    Получить количество предупреждений по сотрудникам одним группирующим запросом.
+
+    Returns:
+        list: Сотрудники (и задачи без исполнителя) по убыванию количества просроченных задач.
+    """
+    groups = list(
+        DeadlineAlert.objects.order_by()
+        .values("assignee_id")
+        .annotate(
+            overdue=Count("pk", filter=Q(kind="overdue")),
+            approaching=Count("pk", filter=Q(kind="approaching")),
+            nearest=Min("deadline"),
+        )
+        .order_by("-overdue", "-approaching", "assignee_id")
+    )
+    names = dict(
+        Employee.objects.filter(pk__in=[group["assignee_id"] for group in groups if group["assignee_id"]])
+        .values_list("id", "full_name")
+    )
+    return [
+        {
+            "ID сотрудника": group["assignee_id"],
+            "ФИО": names.get(group["assignee_id"]),
+            "Просрочено": group["overdue"],
+            "Скоро срок": group["approaching"],
+            "Ближайший срок": group["nearest"],
+        }
+        for group in groups
+    ]
+
+
+def get_alerts(employee_id=None, kind=None, limit=ALERTS_DEFAULT_LIMIT):
+    """
+    Получить предупреждения по возрастанию срока вместе с названиями задач.
+
+    Args:
+        employee_id: ID сотрудника; 0 — задачи без исполнителя.
+        kind: "overdue" или "approaching".
+    """
+    alerts = DeadlineAlert.objects.order_by("deadline", "task_id")
+    if employee_id is not None:
+        alerts = alerts.filter(assignee_id=employee_id or None)
+    if kind is not None:
+        alerts = alerts.filter(kind=kind)
+    alerts = list(alerts.values("task_id", "assignee_id", "kind", "deadline", "raised_at")[:limit])
+    names = dict(Task.objects.filter(pk__in=[alert["task_id"] for alert in alerts]).values_list("id", "name"))
+    return [
+        {
+            "ID задачи": alert["task_id"],
+            "Название": names.get(alert["task_id"]),
+            "ID сотрудника": alert["assignee_id"],
+            "Вид": alert["kind"],
+            "Срок": alert["deadline"],
+            "Обнаружено": alert["raised_at"],
+        }
+        for alert in alerts
+    ]
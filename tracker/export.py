@@ -0,0 +1,57 @@
+import csv
+import json
+
+from rest_framework import serializers
+
+EXPORT_FIELDS = ["id", "name", "parent_task", "assignee", "deadline", "status", "created_at"]
+EXPORT_CHUNK_SIZE = 2000
+
+_datetime_field = serializers.DateTimeField()
+
+
+class _Echo:
+    """Псевдо-файл для csv.writer: возвращает записанную строку вместо буферизации."""
+
+    def write(self, value):
+        return value
+
+
+def iter_task_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Построчно выгрузить задачи без создания экземпляров модели.
+
+    Строки читаются порциями через `iterator()`, на PostgreSQL — серверным курсором,
+    поэтому потребление памяти не зависит от размера выборки. Значения приводятся
+    к тому же представлению, что и в `TaskSerializer`.
+    """
+    rows = queryset.values_list("id", "name", "parent_task", "assignee", "deadline", "status", "created_at")
+    for task_id, name, parent_task, assignee, deadline, status, created_at in rows.iterator(chunk_size=chunk_size):
+        yield [
+            task_id,
+            name,
+            parent_task,
+            assignee,
+            _datetime_field.to_representation(deadline),
+            status,
+            _datetime_field.to_representation(created_at),
+        ]
+
+
+def iter_ndjson(*querysets):
+    for queryset in querysets:
+        for row in iter_task_rows(queryset):
+            yield json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def iter_csv(*querysets):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for queryset in querysets:
+        for row in iter_task_rows(queryset):
+            yield writer.writerow(["" if value is None else value for value in row])
+
+
+EXPORT_FORMATS = {
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+    "csv": (iter_csv, "text/csv"),
+}
@@ -0,0 +1,113 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Task
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Фильтрация и сортировка задач по параметрам запроса.
+
+    Поддерживаемые фильтры и сортировки подобраны так, чтобы каждая комбинация
+    обслуживалась индексом: `(status, deadline)`, `(assignee, status)`, `deadline`
+    или индексом внешнего ключа `parent_task`. Без явной сортировки выборка упорядочена
+    так, как ее отдает используемый индекс: диапазон по сроку — по сроку, задачи
+    исполнителя — по статусу, выборка по статусу — по статусу и сроку.
+    """
+
+    ordering_param = "ordering"
+    orderings = {
+        "id": ("id",),
+        "-id": ("-id",),
+        "deadline": ("deadline", "id"),
+        "-deadline": ("-deadline", "-id"),
+        "status": ("status", "deadline", "id"),
+        "-status": ("-status", "-deadline", "-id"),
+    }
+    statuses = {value for value, _ in Task.STATUS_CHOICES}
+
+    range_ordering = ("deadline", "id")
+    assignee_ordering = ("status", "id")
+    status_ordering = ("status", "deadline", "id")
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        filters = {}
+
+        if params.get("status"):
+            values = params["status"].split(",")
+            unknown = set(values) - self.statuses
+            if unknown:
+                raise ValidationError({"status": f"Неизвестный статус: {', '.join(sorted(unknown))}."})
+            filters["status__in"] = values
+
+        if params.get("assignee"):
+            if params["assignee"] == "null":
+                filters["assignee__isnull"] = True
+            else:
+                filters["assignee"] = self.parse_id(params, "assignee")
+
+        if params.get("parent_task"):
+            filters["parent_task"] = self.parse_id(params, "parent_task")
+
+        if params.get("top_level") in ("1", "true"):
+            filters["parent_task__isnull"] = True
+
+        if params.get("deadline_after"):
+            filters["deadline__gte"] = self.parse_deadline(params, "deadline_after")
+        if params.get("deadline_before"):
+            filters["deadline__lt"] = self.parse_deadline(params, "deadline_before")
+
+        queryset = queryset.filter(**filters)
+
+        ordering = params.get(self.ordering_param)
+        if ordering:
+            if ordering not in self.orderings:
+                raise ValidationError(
+                    {self.ordering_param: f"Допустимые значения: {', '.join(self.orderings)}."}
+                )
+            queryset = queryset.order_by(*self.orderings[ordering])
+        elif "deadline__gte" in filters or "deadline__lt" in filters:
+            # Диапазон по сроку без явной сортировки обходим по индексу срока.
+            queryset = queryset.order_by(*self.range_ordering)
+        elif "assignee" in filters or "assignee__isnull" in filters:
+            # Задачи исполнителя — в порядке индекса `(assignee, status)`.
+            queryset = queryset.order_by(*self.assignee_ordering)
+        elif "status__in" in filters:
+            # Выборка по статусу — в порядке индекса `(status, deadline)`.
+            queryset = queryset.order_by(*self.status_ordering)
+        return queryset
+
+    @staticmethod
+    def parse_id(params, name):
+        try:
+            return int(params[name])
+        except ValueError:
+            raise ValidationError({name: "Ожидается целочисленный идентификатор или null."})
+
+    @staticmethod
+    def parse_deadline(params, name):
+        try:
+            value = parse_datetime(params[name])
+        except ValueError:
+            value = None
+        if value is None:
+            raise ValidationError({name: "Ожидается дата и время в формате ISO 8601."})
+        return value if timezone.is_aware(value) else timezone.make_aware(value)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [
+            ("status", "string", "Статус или несколько статусов через запятую."),
+            ("assignee", "string", "ID исполнителя или null для неназначенных задач."),
+            ("parent_task", "integer", "ID родительской задачи."),
+            ("top_level", "boolean", "Только задачи без родительской задачи."),
+            ("deadline_after", "string", "Срок не раньше указанного момента (ISO 8601)."),
+            ("deadline_before", "string", "Срок раньше указанного момента (ISO 8601)."),
+            (self.ordering_param, "string", f"Сортировка: {', '.join(self.orderings)}."),
+        ]
+        return [
+            {"name": name, "required": False, "in": "query", "description": description, "schema": {"type": kind}}
+            for name, kind, description in parameters
+        ]
@@ -0,0 +1,176 @@
+from django.db import connections, router
+
+from .models import Task
+
+# Рекурсивные CTE используют UNION, а не UNION ALL: повторяющиеся строки отбрасываются,
+# поэтому обход завершается даже на данных, где цикл уже успел образоваться.
+SUBTREE_SQL = """
+    WITH RECURSIVE subtree(id) AS (
+        SELECT id FROM {table} WHERE id IN ({placeholders})
+        UNION
+        SELECT child.id FROM {table} child JOIN subtree ON child.parent_task_id = subtree.id
+    )
+    SELECT {columns} FROM {table} WHERE id IN (SELECT id FROM subtree{limit})
+"""
+
+ANCESTORS_SQL = """
+    WITH RECURSIVE chain(id, parent_task_id) AS (
+        SELECT id, parent_task_id FROM {table} WHERE id IN ({placeholders})
+        UNION
+        SELECT parent.id, parent.parent_task_id FROM {table} parent JOIN chain ON parent.id = chain.parent_task_id
+    )
+    SELECT {columns} FROM {table} WHERE id IN (SELECT id FROM chain)
+"""
+
+# Ограничение числа параметров в одном запросе (SQLite допускает не более 999 в старых версиях).
+CHAIN_BATCH_SIZE = 500
+
+
+def _table(using):
+    return connections[using].ops.quote_name(Task._meta.db_table)
+
+
+def get_subtree(task_id):
+    """
+    Получить задачу со всеми потомками одним запросом.
+
+    Returns:
+        list: Задачи поддерева в порядке обхода в глубину с атрибутом `depth`
+        (0 — корень). Пустой список, если задача не найдена.
+    """
+    using = router.db_for_read(Task)
+    sql = SUBTREE_SQL.format(table=_table(using), placeholders="%s", columns="*", limit="")
+    tasks = list(Task.objects.db_manager(using).raw(sql, [task_id]))
+    children = {}
+    root = None
+    for task in sorted(tasks, key=lambda task: task.id):
+        if task.id == task_id:
+            root = task
+        else:
+            children.setdefault(task.parent_task_id, []).append(task)
+    if root is None:
+        return []
+
+    result = []
+    visited = {root.id}
+    stack = [(root, 0)]
+    while stack:
+        task, depth = stack.pop()
+        task.depth = depth
+        result.append(task)
+        for child in reversed(children.get(task.id, [])):
+            if child.id not in visited:
+                visited.add(child.id)
+                stack.append((child, depth + 1))
+    return result
+
+
+def get_forest(root_ids, fields=("id", "parent_task_id"), using=None, limit=None):
+    """
+    Получить задачи поддеревьев нескольких корней одним запросом.
+
+    Args:
+        root_ids: ID корневых задач.
+        fields: Загружаемые столбцы, остальные поля задач откладываются.
+        limit: Загрузить не больше стольких задач (обход поддеревьев останавливается, когда они набраны).
+
+    Returns:
+        list: Задачи всех поддеревьев, включая корни.
+    """
+    root_ids = list(root_ids)
+    if not root_ids:
+        return []
+    using = using or router.db_for_read(Task)
+    sql = SUBTREE_SQL.format(
+        table=_table(using),
+        placeholders=", ".join(["%s"] * len(root_ids)),
+        columns=", ".join(fields),
+        limit="" if limit is None else " LIMIT %s",
+    )
+    params = root_ids if limit is None else [*root_ids, limit]
+    return list(Task.objects.db_manager(using).raw(sql, params))
+
+
+def get_ancestors(task_id):
+    """
+    Получить цепочку предков задачи одним запросом.
+
+    Returns:
+        list | None: Предки от непосредственного родителя до корня с атрибутом `depth`
+        (1 — родитель) или None, если задача не найдена.
+    """
+    using = router.db_for_read(Task)
+    sql = ANCESTORS_SQL.format(table=_table(using), placeholders="%s", columns="*")
+    tasks = {task.id: task for task in Task.objects.db_manager(using).raw(sql, [task_id])}
+    if task_id not in tasks:
+        return None
+
+    result = []
+    visited = {task_id}
+    parent_id = tasks[task_id].parent_task_id
+    while parent_id is not None and parent_id not in visited:
+        visited.add(parent_id)
+        parent = tasks[parent_id]
+        parent.depth = len(result) + 1
+        result.append(parent)
+        parent_id = parent.parent_task_id
+    return result
+
+
+def _load_chains(task_ids, using):
+    """Загрузить {ID: ID родителя} для задач и всех их предков, порциями по CHAIN_BATCH_SIZE."""
+    task_ids = list({task_id for task_id in task_ids if task_id is not None})
+    parents = {}
+    with connections[using].cursor() as cursor:
+        for start in range(0, len(task_ids), CHAIN_BATCH_SIZE):
+            batch = task_ids[start:start + CHAIN_BATCH_SIZE]
+            sql = ANCESTORS_SQL.format(
+                table=_table(using), placeholders=", ".join(["%s"] * len(batch)), columns="id, parent_task_id"
+            )
+            cursor.execute(sql, batch)
+            parents.update(cursor.fetchall())
+    return parents
+
+
+def get_roots(task_ids, using=None):
+    """
+    Получить корневые задачи деревьев, в которые входят указанные задачи.
+
+    Returns:
+        set: ID корневых задач (задача без родителя сама является корнем).
+    """
+    parents = _load_chains(task_ids, using or router.db_for_read(Task))
+    return {task_id for task_id, parent_id in parents.items() if parent_id is None}
+
+
+def find_cycles(new_parents, using=None):
+    """
+    Найти задачи, смена родителя которых образует цикл.
+
+    Цепочки предков всех новых родителей загружаются одним запросом на порцию, после чего
+    изменения накладываются в памяти, поэтому учитываются и циклы, которые образуются
+    только совместно несколькими изменениями одной пачки. Проверка каждой задачи — O(глубина).
+
+    Args:
+        new_parents: Словарь {ID задачи: ID нового родителя или None}.
+
+    Returns:
+        set: ID задач, для которых новый родитель образует цикл.
+    """
+    seeds = {parent_id for parent_id in new_parents.values() if parent_id is not None}
+    if not seeds:
+        return set()
+
+    parents = _load_chains(seeds, using or router.db_for_read(Task))
+    parents.update(new_parents)
+
+    cycles = set()
+    for task_id, parent_id in new_parents.items():
+        visited = set()
+        while parent_id is not None and parent_id not in visited:
+            if parent_id == task_id:
+                cycles.add(task_id)
+                break
+            visited.add(parent_id)
+            parent_id = parents.get(parent_id)
+    return cycles
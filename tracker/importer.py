@@ -0,0 +1,337 @@
+import csv
+import json
+import os
+import time
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .hierarchy import find_cycles
+from .models import CYCLE_ERROR_MESSAGE, Employee, ImportPendingParent, ImportRef, ImportState, Task
+from .serializers import EmployeeBulkSerializer, TaskBulkSerializer
+
+IMPORT_BATCH_SIZE = 5000
+IMPORT_FORMATS = ("csv", "jsonl")
+# Сколько ошибок записей выводить в отчете импорта.
+MAX_REPORTED_ERRORS = 50
+NOT_AN_OBJECT_MESSAGE = "Строка не является JSON-объектом."
+
+
+class InvalidRecords(Exception):
+    """Записи пачки не прошли проверку. Содержит список (номер записи, ошибки)."""
+
+    def __init__(self, errors):
+        super().__init__(f"Ошибок в записях: {len(errors)}")
+        self.errors = errors
+
+
+class UnresolvedReferences(InvalidRecords):
+    """
+    Ссылки на родителей не назначены на втором этапе импорта.
+
+    Все записи к этому моменту уже обработаны и сохранены, поэтому ошибка окончательная:
+    продолжать такой импорт нечего.
+    """
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    return "jsonl" if extension in ("jsonl", "ndjson") else extension
+
+
+def iter_records(file, file_format):
+    """
+    Построчно читать записи из CSV (с заголовком) или JSONL.
+
+    Пустые значения CSV считаются отсутствующими. Строка JSONL, которая не является JSON-объектом,
+    возвращается как None и отклоняется при проверке пачки вместе с остальными некорректными записями.
+    """
+    if file_format == "csv":
+        for row in csv.DictReader(file):
+            yield {key: value for key, value in row.items() if value not in ("", None)}
+        return
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield record if isinstance(record, dict) else None
+
+
+class ImportCheckpoint:
+    """
+    Состояние импорта файла в основной базе данных (`ImportState`).
+
+    Хранит количество обработанных записей, соответствие ссылок `ref` из файла созданным задачам
+    и отложенные ссылки на родителей, которые встречаются в файле позже подзадач. Состояние пачки
+    записывается в той же транзакции, что и ее объекты, поэтому прерванный в любой момент импорт
+    продолжается с записи, следующей за последней зафиксированной пачкой, без повторной вставки.
+    Потребление памяти импорта не зависит от размера файла.
+    """
+
+    def __init__(self, model, path):
+        self.state, _ = ImportState.objects.get_or_create(model=model, source=os.path.abspath(path))
+
+    @property
+    def records(self):
+        return self.state.records
+
+    def resolve(self, refs):
+        refs = list(refs)
+        result = {}
+        for start in range(0, len(refs), 500):
+            chunk = refs[start:start + 500]
+            result.update(self.state.refs.filter(ref__in=chunk).values_list("ref", "task_id"))
+        return result
+
+    def save_batch(self, records, refs, pending):
+        """
+        Записать результат пачки: новые ссылки, отложенных родителей и счетчик записей.
+
+        Вызывается внутри транзакции, в которой вставлены объекты пачки.
+        """
+        ImportRef.objects.bulk_create([ImportRef(state=self.state, ref=ref, task_id=task_id) for ref, task_id in refs])
+        ImportPendingParent.objects.bulk_create(
+            [
+                ImportPendingParent(state=self.state, task_id=task_id, parent_ref=parent_ref, record=record)
+                for task_id, parent_ref, record in pending
+            ]
+        )
+        ImportState.objects.filter(pk=self.state.pk).update(records=records, updated_at=timezone.now())
+        self.state.records = records
+
+    def iter_pending(self, batch_size):
+        """Отложенные ссылки порциями: (ID задачи, ID родителя или None, ссылка, номер записи)."""
+        last_id = 0
+        while True:
+            rows = list(
+                self.state.pending.filter(task_id__gt=last_id)
+                .order_by("task_id")
+                .values_list("task_id", "parent_ref", "record")[:batch_size]
+            )
+            if not rows:
+                return
+            parents = self.resolve({parent_ref for _, parent_ref, _ in rows})
+            yield [(task_id, parents.get(parent_ref), parent_ref, record) for task_id, parent_ref, record in rows]
+            last_id = rows[-1][0]
+
+    def resolved(self, task_ids):
+        """Удалить обработанные отложенные ссылки (внутри транзакции, назначившей родителей)."""
+        self.state.pending.filter(task_id__in=task_ids).delete()
+
+    def reset(self):
+        """Начать импорт файла заново, забыв обработанные записи и ссылки."""
+        self.state.delete()
+        self.state = ImportState.objects.create(model=self.state.model, source=self.state.source)
+
+    def delete(self):
+        """Удалить состояние завершенного импорта."""
+        self.state.delete()
+
+
+class BaseImporter:
+    """
+    Потоковый импорт записей пачками.
+
+    Каждая пачка проверяется целиком (поля — сериализатором, связи — запросом на всю пачку)
+    и вставляется через `bulk_create` в отдельной транзакции вместе с ее результатом в `ImportCheckpoint`.
+    """
+
+    model = None
+    serializer_class = None
+
+    def __init__(self, checkpoint, batch_size=IMPORT_BATCH_SIZE, skip_invalid=False, log=None):
+        self.checkpoint = checkpoint
+        self.batch_size = batch_size
+        self.skip_invalid = skip_invalid
+        self.log = log or (lambda message: None)
+        self.created = 0
+        self.skipped = []
+
+    def run(self, records):
+        """
+        Импортировать записи, пропустив уже обработанные в предыдущих запусках.
+
+        Returns:
+            int: Количество созданных объектов.
+
+        Raises:
+            InvalidRecords: Если в пачке есть ошибки и не задан пропуск некорректных записей.
+        """
+        started = time.perf_counter()
+        number = self.checkpoint.records
+        records = islice(records, number, None)
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                break
+            numbers = range(number + 1, number + len(batch) + 1)
+            number += len(batch)
+            self.import_batch(list(zip(numbers, batch)), number)
+            elapsed = time.perf_counter() - started
+            self.log(f"Обработано записей: {number}, создано: {self.created}, {self.created / elapsed:.0f} в секунду")
+        self.finish()
+        return self.created
+
+    def validate_batch(self, batch):
+        """
+        Проверить пачку.
+
+        Returns:
+            tuple: Проверенные данные корректных записей (номер, данные, исходная запись) и ошибки.
+        """
+        child = self.serializer_class()
+        valid, errors = [], []
+        for number, record in batch:
+            if record is None:
+                errors.append((number, {"non_field_errors": [NOT_AN_OBJECT_MESSAGE]}))
+                continue
+            try:
+                data = child.run_validation({key: value for key, value in record.items() if key not in ("id", "ref")})
+                data.pop("id", None)
+                valid.append((number, data, record))
+            except ValidationError as exc:
+                errors.append((number, exc.detail))
+        return valid, errors
+
+    def check_errors(self, errors):
+        if not errors:
+            return
+        if not self.skip_invalid:
+            raise InvalidRecords(errors)
+        self.skipped.extend(errors)
+
+    def import_batch(self, batch, records):
+        valid, errors = self.validate_batch(batch)
+        self.check_errors(errors)
+        with transaction.atomic():
+            self.model.objects.bulk_create([self.model(**data) for _, data, _ in valid], batch_size=self.batch_size)
+            self.checkpoint.save_batch(records, [], [])
+        self.created += len(valid)
+
+    def finish(self):
+        pass
+
+
+class EmployeeImporter(BaseImporter):
+    model = Employee
+    serializer_class = EmployeeBulkSerializer
+
+
+class TaskImporter(BaseImporter):
+    """
+    Импорт задач со ссылками на родителей внутри файла.
+
+    Запись может иметь ключ `ref` и ссылаться на родителя либо по ID существующей задачи (`parent_task`),
+    либо по `ref` другой записи файла (`parent_ref`). Ссылка на уже импортированную запись
+    разрешается при вставке, ссылка вперед — вторым этапом после вставки всех записей.
+    """
+
+    model = Task
+    serializer_class = TaskBulkSerializer
+
+    def validate_batch(self, batch):
+        valid, errors = super().validate_batch(batch)
+        checked = []
+        for number, data, record in valid:
+            record_errors = {}
+            if record.get("parent_ref") is not None and data.get("parent_task_id") is not None:
+                record_errors["parent_ref"] = ["Укажите только parent_task или parent_ref."]
+            if record.get("ref") is not None and record.get("ref") == record.get("parent_ref"):
+                record_errors["parent_ref"] = ["Задача не может быть своим собственным родителем."]
+            if record_errors:
+                errors.append((number, record_errors))
+            else:
+                checked.append((number, data, record))
+
+        assignee_ids = {data["assignee_id"] for _, data, _ in checked if data.get("assignee_id")}
+        parent_ids = {data["parent_task_id"] for _, data, _ in checked if data.get("parent_task_id")}
+        existing_assignees = set(Employee.objects.filter(pk__in=assignee_ids).values_list("pk", flat=True))
+        existing_parents = set(Task.objects.filter(pk__in=parent_ids).values_list("pk", flat=True))
+        refs = {str(record["ref"]) for _, _, record in checked if record.get("ref") is not None}
+        taken_refs = set(self.checkpoint.resolve(refs))
+
+        valid = []
+        seen_refs = set()
+        for number, data, record in checked:
+            record_errors = {}
+            if data.get("assignee_id") and data["assignee_id"] not in existing_assignees:
+                record_errors["assignee"] = [f"Сотрудник {data['assignee_id']} не найден."]
+            if data.get("parent_task_id") and data["parent_task_id"] not in existing_parents:
+                record_errors["parent_task"] = [f"Задача {data['parent_task_id']} не найдена."]
+            ref = record.get("ref")
+            if ref is not None and (str(ref) in taken_refs or str(ref) in seen_refs):
+                record_errors["ref"] = [f"Ссылка {ref} уже использована."]
+            if record_errors:
+                errors.append((number, record_errors))
+                continue
+            if ref is not None:
+                seen_refs.add(str(ref))
+            valid.append((number, data, record))
+        errors.sort(key=lambda error: error[0])
+        return valid, errors
+
+    def import_batch(self, batch, records):
+        valid, errors = self.validate_batch(batch)
+        self.check_errors(errors)
+
+        known = self.checkpoint.resolve(
+            {str(record["parent_ref"]) for _, _, record in valid if record.get("parent_ref") is not None}
+        )
+        objs = []
+        for _, data, record in valid:
+            if record.get("parent_ref") is not None:
+                data["parent_task_id"] = known.get(str(record["parent_ref"]))
+            objs.append(Task(**data))
+        with transaction.atomic():
+            Task.objects.bulk_create(objs, batch_size=self.batch_size)
+            refs, pending = [], []
+            for (number, _, record), obj in zip(valid, objs):
+                if record.get("ref") is not None:
+                    refs.append((str(record["ref"]), obj.id))
+                if record.get("parent_ref") is not None and obj.parent_task_id is None:
+                    pending.append((obj.id, str(record["parent_ref"]), number))
+            self.checkpoint.save_batch(records, refs, pending)
+        self.created += len(objs)
+
+    def finish(self):
+        """
+        Второй этап: назначить родителей по ссылкам вперед с проверкой циклов.
+
+        Задачи с ненайденными или образующими цикл ссылками уже созданы и остаются без родителя.
+
+        Raises:
+            UnresolvedReferences: Если есть такие ссылки и не задан пропуск некорректных записей.
+        """
+        errors = []
+        for rows in self.checkpoint.iter_pending(self.batch_size):
+            errors.extend(
+                (number, {"parent_ref": [f"Ссылка {parent_ref} не найдена в файле."]})
+                for _, parent_id, parent_ref, number in rows
+                if parent_id is None
+            )
+            new_parents = {task_id: parent_id for task_id, parent_id, _, _ in rows if parent_id is not None}
+            cycles = find_cycles(new_parents)
+            errors.extend(
+                (number, {"parent_ref": [CYCLE_ERROR_MESSAGE]}) for task_id, _, _, number in rows if task_id in cycles
+            )
+            updates = [Task(id=task_id, parent_task_id=parent_id) for task_id, parent_id in new_parents.items()]
+            with transaction.atomic():
+                Task.objects.bulk_update(
+                    [task for task in updates if task.id not in cycles], ["parent_task"], batch_size=self.batch_size
+                )
+                self.checkpoint.resolved([task_id for task_id, _, _, _ in rows])
+        errors.sort(key=lambda error: error[0])
+        if errors and not self.skip_invalid:
+            raise UnresolvedReferences(errors)
+        self.check_errors(errors)
+
+
+IMPORTERS = {
+    "employees": EmployeeImporter,
+    "tasks": TaskImporter,
+}
@@ -0,0 +1,284 @@
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .conditional import get_fingerprint
+from .deadlines import scan_deadlines
+from .models import Employee, Job, PrecomputedResult, Task
+from .recommendations import important_task_item, recommend_assignees
+from .rollups import get_rollups
+from .workload import take_snapshot
+
+JOB_BATCH_SIZE = 10
+JOB_POLL_INTERVAL = 1.0
+ROLLUP_WARM_BATCH_SIZE = 1000
+
+JOB_HANDLERS = {}
+
+
+def job_handler(name):
+    """Зарегистрировать функцию `handler(payload)` как обработчик заданий с именем `name`."""
+
+    def decorator(func):
+        JOB_HANDLERS[name] = func
+        return func
+
+    return decorator
+
+
+def get_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def get_retry_delay(attempts):
+    """Задержка перед повторной попыткой: удваивается с каждой попыткой до TRACKER_JOB_MAX_RETRY_DELAY секунд."""
+    base = getattr(settings, "TRACKER_JOB_RETRY_DELAY", 5)
+    limit = getattr(settings, "TRACKER_JOB_MAX_RETRY_DELAY", 15 * 60)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), limit))
+
+
+def get_lease():
+    """Сколько секунд задание может выполняться, прежде чем оно будет считаться брошенным обработчиком."""
+    return timedelta(seconds=getattr(settings, "TRACKER_JOB_LEASE_SECONDS", 10 * 60))
+
+
+def enqueue(name, payload=None, key="", delay=0, max_attempts=5):
+    """
+    Поставить задание в очередь.
+
+    Если задан ключ и задание с тем же ключом уже ждет выполнения, новое задание не создается.
+    Задание с тем же ключом, которое уже выполняется, не мешает постановке: оно могло прочитать
+    данные до изменений, ради которых ставится новое задание.
+
+    Returns:
+        tuple: Задание и признак того, что оно создано.
+    """
+    if name not in JOB_HANDLERS:
+        raise ValueError(f"Неизвестное задание: {name}.")
+    using = router.db_for_write(Job)
+    fields = {
+        "name": name,
+        "payload": payload or {},
+        "max_attempts": max_attempts,
+        "run_after": timezone.now() + timedelta(seconds=delay),
+    }
+    if key:
+        existing = Job.objects.using(using).filter(key=key, status=Job.QUEUED).first()
+        if existing is not None:
+            return existing, False
+    try:
+        with transaction.atomic(using=using):
+            return Job.objects.using(using).create(key=key, **fields), True
+    except IntegrityError:
+        # Задание с тем же ключом поставлено одновременно с этим.
+        return Job.objects.using(using).get(key=key, status=Job.QUEUED), False
+
+
+def release_stale_jobs(now=None):
+    """Вернуть в очередь задания, обработчик которых не завершил их за время аренды."""
+    now = now or timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=now - get_lease())
+    released = 0
+    for job in stale.only("id", "key"):
+        try:
+            with transaction.atomic():
+                released += Job.objects.filter(pk=job.pk, status=Job.RUNNING).update(
+                    status=Job.QUEUED, locked_by="", locked_at=None, run_after=now
+                )
+        except IntegrityError:
+            # Задание с тем же ключом уже ждет выполнения и заменяет брошенное.
+            Job.objects.filter(pk=job.pk).update(status=Job.FAILED, finished_at=now, last_error="Аренда истекла.")
+    return released
+
+
+def claim_jobs(worker, batch_size=JOB_BATCH_SIZE, names=None):
+    """
+    Забрать пачку готовых к выполнению заданий.
+
+    На базах с `SELECT ... FOR UPDATE SKIP LOCKED` (PostgreSQL) строки, выбранные другими обработчиками,
+    пропускаются без ожидания. На SQLite, где блокировки строк нет, одно и то же задание могут выбрать
+    несколько обработчиков, но условное обновление статуса достается только первому из них.
+
+    Returns:
+        list: Задания, переведенные в статус «выполняется» этим обработчиком.
+    """
+    now = timezone.now()
+    using = router.db_for_write(Job)
+    jobs = Job.objects.using(using)
+    with transaction.atomic(using=using):
+        queued = jobs.filter(status=Job.QUEUED, run_after__lte=now).order_by("run_after", "id")
+        if names:
+            queued = queued.filter(name__in=names)
+        if connections[using].features.has_select_for_update_skip_locked:
+            queued = queued.select_for_update(skip_locked=True)
+        ids = list(queued.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return []
+        jobs.filter(pk__in=ids, status=Job.QUEUED).update(
+            status=Job.RUNNING, locked_by=worker, locked_at=now, attempts=F("attempts") + 1
+        )
+    claimed = jobs.filter(pk__in=ids, status=Job.RUNNING, locked_by=worker, locked_at=now)
+    return list(claimed.order_by("run_after", "id"))
+
+
+def run_job(job):
+    """
+    Выполнить задание и записать результат.
+
+    При ошибке задание возвращается в очередь с экспоненциальной задержкой, пока не исчерпаны попытки.
+
+    Returns:
+        bool: Выполнено ли задание успешно.
+    """
+    try:
+        JOB_HANDLERS[job.name](job.payload)
+    except Exception:
+        now = timezone.now()
+        error = traceback.format_exc()
+        jobs = Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by)
+        if job.attempts >= job.max_attempts:
+            jobs.update(status=Job.FAILED, finished_at=now, last_error=error)
+            return False
+        try:
+            with transaction.atomic():
+                jobs.update(
+                    status=Job.QUEUED,
+                    locked_by="",
+                    locked_at=None,
+                    run_after=now + get_retry_delay(job.attempts),
+                    last_error=error,
+                )
+        except IntegrityError:
+            # Задание с тем же ключом уже поставлено заново и заменяет повтор этого.
+            jobs.update(status=Job.FAILED, finished_at=now, last_error=error)
+        return False
+    Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by).update(
+        status=Job.DONE, finished_at=timezone.now(), last_error=""
+    )
+    return True
+
+
+def run_worker(
+    worker=None, batch_size=JOB_BATCH_SIZE, names=None, burst=False, poll_interval=JOB_POLL_INTERVAL, log=None
+):
+    """
+    Выполнять задания из очереди.
+
+    Args:
+        burst: Завершиться, когда готовых заданий не останется.
+
+    Returns:
+        tuple: Количество успешно выполненных и завершившихся ошибкой заданий.
+    """
+    log = log or (lambda message: None)
+    worker = worker or get_worker_id()
+    done = failed = 0
+    while True:
+        release_stale_jobs()
+        jobs = claim_jobs(worker, batch_size, names)
+        if not jobs:
+            if burst:
+                return done, failed
+            time.sleep(poll_interval)
+            continue
+        for job in jobs:
+            started = time.perf_counter()
+            if run_job(job):
+                done += 1
+                log(f"{job}: выполнено за {time.perf_counter() - started:.2f} с")
+            else:
+                failed += 1
+                log(f"{job}: ошибка (попытка {job.attempts} из {job.max_attempts})")
+
+
+# Предвычисляемая аналитика: функция вычисления и выборки, от которых зависит результат.
+PRECOMPUTED = {
+    "important_tasks": (
+        lambda: [important_task_item(*recommendation) for recommendation in recommend_assignees()],
+        lambda: [Task.objects.all(), Employee.objects.all()],
+    ),
+}
+
+
+def precompute(name):
+    """
+    Вычислить и сохранить результат аналитики.
+
+    Отпечаток данных снимается до вычисления: если данные изменятся во время вычисления,
+    результат будет считаться устаревшим.
+    """
+    compute, get_querysets = PRECOMPUTED[name]
+    fingerprint, _ = get_fingerprint(get_querysets())
+    data = compute()
+    PrecomputedResult.objects.update_or_create(
+        name=name, defaults={"data": data, "fingerprint": fingerprint, "computed_at": timezone.now()}
+    )
+    return data
+
+
+def get_precomputed(name):
+    """
+    Получить последний сохраненный результат аналитики.
+
+    Если данные изменились после вычисления, возвращается сохраненный результат, а пересчет
+    ставится в очередь (не более одного ожидающего пересчета на результат). Если результата еще нет,
+    он вычисляется сразу.
+
+    Returns:
+        tuple: Данные, время вычисления и признак того, что результат устарел.
+    """
+    _, get_querysets = PRECOMPUTED[name]
+    result = PrecomputedResult.objects.filter(name=name).first()
+    if result is None:
+        return precompute(name), timezone.now(), False
+    stale = result.fingerprint != get_fingerprint(get_querysets())[0]
+    if stale:
+        enqueue("precompute", {"name": name}, key=f"precompute:{name}")
+    return result.data, result.computed_at, stale
+
+
+def get_queue_stats():
+    """Количество заданий по статусам и время, с которого ждет самое старое готовое задание."""
+    counts = dict(Job.objects.order_by().values("status").annotate(count=Count("pk")).values_list("status", "count"))
+    oldest = (
+        Job.objects.filter(status=Job.QUEUED, run_after__lte=timezone.now())
+        .order_by("run_after", "id")
+        .values_list("run_after", flat=True)
+        .first()
+    )
+    return {**{status: counts.get(status, 0) for status, _ in Job.STATUS_CHOICES}, "oldest_ready": oldest}
+
+
+@job_handler("precompute")
+def precompute_job(payload):
+    precompute(payload["name"])
+
+
+@job_handler("warm_rollups")
+def warm_rollups_job(payload):
+    """Пересчитать сводки всех корневых задач порциями (в общем кэше их затем читают веб-процессы)."""
+    roots = Task.objects.filter(parent_task__isnull=True).order_by("id").values_list("id", flat=True)
+    last_id = 0
+    while True:
+        ids = list(roots.filter(pk__gt=last_id)[:ROLLUP_WARM_BATCH_SIZE])
+        if not ids:
+            return
+        get_rollups(ids)
+        last_id = ids[-1]
+
+
+@job_handler("snapshot_workload")
+def snapshot_workload_job(payload):
+    take_snapshot()
+
+
+@job_handler("scan_deadlines")
+def scan_deadlines_job(payload):
+    scan_deadlines(payload.get("hours"))
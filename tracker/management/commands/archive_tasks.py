@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tracker.archive import ARCHIVE_BATCH_SIZE, archive_tasks, get_archive_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Перенести в архив деревья завершенных задач, не менявшиеся дольше заданного срока. "
+        "Перенос идет короткими транзакциями; прерванный запуск можно просто повторить."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=None,
+            help="Срок в днях с последнего изменения (по умолчанию TRACKER_ARCHIVE_AFTER_DAYS).",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="Наибольшее количество задач в одной транзакции."
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        archived, skipped = archive_tasks(
+            get_archive_cutoff(options["older_than_days"]), options["batch_size"], log=self.stdout.write
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Перенесено задач: {archived} за {elapsed:.1f} с. "
+                f"Оставлено деревьев с незавершенными или недавно измененными задачами: {skipped}."
+            )
+        )
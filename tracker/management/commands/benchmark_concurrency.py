@@ -0,0 +1,131 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import urlopen
+
+from asgiref.sync import ThreadSensitiveContext
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнить обработку одновременных запросов синхронным (WSGI) и асинхронным (ASGI) путем. "
+        "Использует данные текущей базы, их можно создать командой seed_data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Общее количество запросов.")
+        parser.add_argument("--concurrency", type=int, default=10, help="Количество одновременных запросов.")
+        parser.add_argument("--path", default="tasks/important_tasks/", help="Путь эндпоинта относительно /api/.")
+        parser.add_argument(
+            "--wsgi-url",
+            help="Адрес запущенного WSGI-сервера (например, http://localhost:8000). "
+            "Без адресов серверов замер выполняется внутри процесса.",
+        )
+        parser.add_argument("--asgi-url", help="Адрес запущенного ASGI-сервера.")
+        parser.add_argument(
+            "--db-latency-ms",
+            type=float,
+            default=0,
+            help="Задержка, добавляемая к каждому SQL-запросу при замере внутри процесса, "
+            "чтобы смоделировать сетевую базу данных.",
+        )
+
+    def handle(self, *args, **options):
+        if bool(options["wsgi_url"]) != bool(options["asgi_url"]):
+            raise CommandError("Адреса --wsgi-url и --asgi-url задаются вместе.")
+
+        if options["wsgi_url"]:
+            sync_timings, sync_total = self.measure_server(f"{options['wsgi_url']}/api/{options['path']}", options)
+            async_timings, async_total = self.measure_server(f"{options['asgi_url']}/api/{options['path']}", options)
+        else:
+            self.add_db_latency(options["db_latency_ms"] / 1000)
+            # Кэш ответов отключается, чтобы сравнивать обработку запросов, а не попадания в кэш.
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"], TRACKER_RESPONSE_CACHE_TIMEOUT=0
+            ):
+                sync_timings, sync_total = self.measure_sync_worker(f"/api/{options['path']}", options)
+                async_timings, async_total = asyncio.run(
+                    self.measure_event_loop(f"/api/async/{options['path']}", options)
+                )
+
+        for name, timings, total in (("WSGI", sync_timings, sync_total), ("ASGI", async_timings, async_total)):
+            self.stdout.write(
+                f"{name}: {len(timings) / total:.1f} запросов/с, медиана {statistics.median(timings):.1f} мс, "
+                f"p95 {statistics.quantiles(timings, n=20)[-1]:.1f} мс"
+            )
+
+    @staticmethod
+    def add_db_latency(latency):
+        """Добавить задержку ко всем SQL-запросам, включая подключения, созданные в других потоках."""
+        if not latency:
+            return
+
+        def delay(execute, sql, params, many, context):
+            time.sleep(latency)
+            return execute(sql, params, many, context)
+
+        def install(connection, **kwargs):
+            if delay not in connection.execute_wrappers:
+                connection.execute_wrappers.append(delay)
+
+        for connection in connections.all():
+            install(connection)
+        connection_created.connect(install, weak=False)
+
+    @staticmethod
+    def measure_server(url, options):
+        """Отправить запросы к запущенному серверу с заданным числом одновременных соединений."""
+
+        def fetch(_):
+            started = time.perf_counter()
+            with urlopen(url) as response:
+                response.read()
+            return (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options["concurrency"]) as executor:
+            timings = list(executor.map(fetch, range(options["requests"])))
+        return timings, time.perf_counter() - started
+
+    @staticmethod
+    def measure_sync_worker(path, options):
+        """
+        Смоделировать синхронный воркер gunicorn: запросы обрабатываются строго по одному,
+        поэтому время ответа включает ожидание в очереди из `concurrency` запросов.
+        """
+        client = Client()
+        durations = []
+        started = time.perf_counter()
+        for _ in range(options["requests"]):
+            request_started = time.perf_counter()
+            client.get(path)
+            durations.append((time.perf_counter() - request_started) * 1000)
+        total = time.perf_counter() - started
+        timings = []
+        for start in range(0, len(durations), options["concurrency"]):
+            batch = durations[start:start + options["concurrency"]]
+            timings.extend(sum(batch[: index + 1]) for index in range(len(batch)))
+        return timings, total
+
+    @staticmethod
+    async def measure_event_loop(path, options):
+        """Обработать запросы асинхронными представлениями в одном цикле событий, как ASGI-сервер."""
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(options["concurrency"])
+
+        async def fetch():
+            async with semaphore, ThreadSensitiveContext():
+                started = time.perf_counter()
+                await client.get(path)
+                return (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        timings = await asyncio.gather(*[fetch() for _ in range(options["requests"])])
+        return timings, time.perf_counter() - started
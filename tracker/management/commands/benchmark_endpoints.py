@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.benchmarks import (
+    DEFAULT_SIZES,
+    DEFAULT_THRESHOLD,
+    ENDPOINTS,
+    check_results,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Замерить латентность и количество SQL-запросов всех эндпоинтов на наборах данных нескольких размеров. "
+        "Завершается с ошибкой при превышении бюджета запросов или регрессии относительно базового замера."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Количество задач в наборах.")
+        parser.add_argument(
+            "--endpoints",
+            nargs="+",
+            choices=[name for name, _, _ in ENDPOINTS],
+            help="Замерить только эти эндпоинты (по умолчанию все).",
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Количество запросов к эндпоинту, берется медиана.")
+        parser.add_argument(
+            "--baseline",
+            default=str(settings.BASE_DIR / "benchmarks" / "baseline.json"),
+            help="Файл базового замера.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help="Допустимый рост латентности относительно базового замера (0.25 — на 25%%).",
+        )
+        parser.add_argument(
+            "--update-baseline", action="store_true", help="Сохранить результаты как новый базовый замер."
+        )
+
+    def handle(self, *args, **options):
+        results = run_benchmarks(
+            options["sizes"], repeat=options["repeat"], endpoints=options["endpoints"], log=self.stdout.write
+        )
+        baseline = None if options["update_baseline"] else load_baseline(options["baseline"])
+        violations = check_results(results, baseline, options["threshold"])
+        for violation in violations:
+            self.stderr.write(violation)
+        if violations:
+            raise CommandError(f"Нарушений: {len(violations)}")
+
+        if options["update_baseline"]:
+            save_baseline(options["baseline"], results)
+            self.stdout.write(self.style.SUCCESS(f"Базовый замер сохранен в {options['baseline']}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Бюджеты запросов и латентность в пределах нормы."))
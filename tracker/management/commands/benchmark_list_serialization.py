@@ -0,0 +1,74 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from tracker.fastpath import get_value_columns, iter_value_rows
+from tracker.models import Employee, Task
+from tracker.serializers import EmployeeSerializer, TaskSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнить скорость обычной сериализации списков и быстрого пути через values(). "
+        "Тестовые данные создаются во временной транзакции и откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, nargs="+", default=[10_000, 100_000], help="Количество строк в замерах."
+        )
+        parser.add_argument("--repeat", type=int, default=3, help="Количество повторов, берется лучшее время.")
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        for rows in options["rows"]:
+            with transaction.atomic():
+                self.create_rows(rows)
+                for serializer_class in (EmployeeSerializer, TaskSerializer):
+                    queryset = serializer_class.Meta.model.objects.order_by("id")
+                    columns = get_value_columns(serializer_class)
+                    slow, slow_content = self.measure(
+                        lambda: renderer.render(serializer_class(queryset.all(), many=True).data), options["repeat"]
+                    )
+                    fast, fast_content = self.measure(
+                        lambda: renderer.render(
+                            list(iter_value_rows(queryset.values(*[column for _, column, _ in columns]), columns))
+                        ),
+                        options["repeat"],
+                    )
+                    if slow_content != fast_content:
+                        raise CommandError(f"{serializer_class.__name__}: ответы быстрого пути отличаются.")
+                    self.stdout.write(
+                        f"{serializer_class.Meta.model.__name__}, строк {rows}: сериализатор {slow:.3f} с, "
+                        f"values() {fast:.3f} с, ускорение x{slow / fast:.1f}"
+                    )
+                transaction.set_rollback(True)
+
+    @staticmethod
+    def create_rows(rows):
+        employees = Employee.objects.bulk_create(
+            [Employee(full_name=f"Сотрудник {number}", position="Разработчик") for number in range(rows)],
+            batch_size=1000,
+        )
+        deadline = timezone.now() + timedelta(days=1)
+        Task.objects.bulk_create(
+            [
+                Task(name=f"Задача {number}", assignee=employees[number], deadline=deadline + timedelta(seconds=number))
+                for number in range(rows)
+            ],
+            batch_size=1000,
+        )
+
+    @staticmethod
+    def measure(func, repeat):
+        best, content = None, None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            content = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, content
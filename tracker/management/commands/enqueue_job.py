@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.jobs import JOB_HANDLERS, enqueue
+
+
+class Command(BaseCommand):
+    help = "Поставить фоновое задание в очередь (например, по расписанию cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", choices=sorted(JOB_HANDLERS), help="Имя задания.")
+        parser.add_argument("--payload", default="{}", help="Параметры задания в JSON.")
+        parser.add_argument(
+            "--key", default=None, help="Ключ для исключения дублей (по умолчанию — имя задания и параметры)."
+        )
+        parser.add_argument("--delay", type=int, default=0, help="Через сколько секунд выполнить задание.")
+
+    def handle(self, *args, **options):
+        try:
+            payload = json.loads(options["payload"])
+        except ValueError:
+            raise CommandError("Параметры задания должны быть JSON-объектом.")
+        if not isinstance(payload, dict):
+            raise CommandError("Параметры задания должны быть JSON-объектом.")
+        key = options["key"]
+        if key is None:
+            key = f"{options['name']}:{json.dumps(payload, sort_keys=True)}"
+        job, created = enqueue(options["name"], payload, key=key, delay=options["delay"])
+        if created:
+            self.stdout.write(self.style.SUCCESS(f"Задание {job} поставлено в очередь."))
+        else:
+            self.stdout.write(f"Задание {job} с тем же ключом уже ждет выполнения.")
@@ -0,0 +1,115 @@
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from tracker.importer import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    IMPORTERS,
+    MAX_REPORTED_ERRORS,
+    ImportCheckpoint,
+    InvalidRecords,
+    UnresolvedReferences,
+    detect_format,
+    iter_records,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Потоково импортировать сотрудников или задачи из CSV или JSONL. Задачи могут ссылаться "
+        "на родителей из того же файла по ключу ref (parent_ref), в том числе на записи ниже по файлу."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", choices=list(IMPORTERS), help="Что импортировать.")
+        parser.add_argument("path", help="Путь к файлу.")
+        parser.add_argument(
+            "--format", choices=IMPORT_FORMATS, help="Формат файла (по умолчанию определяется по расширению)."
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Количество записей в одной пачке."
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Продолжить прерванный импорт этого файла с первой необработанной записи.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Начать прерванный импорт этого файла заново (уже созданные объекты не удаляются).",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Проверить и вставить записи в транзакции, затем откатить ее."
+        )
+        parser.add_argument(
+            "--skip-invalid", action="store_true", help="Пропускать некорректные записи вместо остановки импорта."
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or detect_format(options["path"])
+        if file_format not in IMPORT_FORMATS:
+            raise CommandError(f"Не удалось определить формат файла, укажите --format ({', '.join(IMPORT_FORMATS)}).")
+
+        if options["resume"] and options["restart"]:
+            raise CommandError("Укажите только --resume или --restart.")
+
+        started = time.perf_counter()
+        # Обычный импорт фиксирует каждую пачку вместе с состоянием импорта отдельно, пробный выполняется
+        # в одной откатываемой транзакции (вместе с состоянием).
+        with transaction.atomic() if options["dry_run"] else nullcontext():
+            checkpoint = ImportCheckpoint(options["model"], options["path"])
+            if checkpoint.records:
+                if options["restart"]:
+                    checkpoint.reset()
+                elif options["resume"]:
+                    self.stdout.write(f"Продолжение импорта после записи {checkpoint.records}")
+                else:
+                    raise CommandError(
+                        f"Импорт этого файла прерван после записи {checkpoint.records}: "
+                        "укажите --resume, чтобы продолжить его, или --restart, чтобы начать заново."
+                    )
+            importer = IMPORTERS[options["model"]](
+                checkpoint, options["batch_size"], options["skip_invalid"], log=self.stdout.write
+            )
+            try:
+                with open(options["path"], encoding="utf-8", newline="") as file:
+                    importer.run(iter_records(file, file_format))
+            except UnresolvedReferences as error:
+                # Все записи уже сохранены, продолжать нечего: состояние импорта удаляется.
+                if not options["dry_run"]:
+                    checkpoint.delete()
+                self.report_errors(error.errors)
+                raise CommandError(
+                    f"Импорт завершен с ошибками: {error}. Задачи созданы ({importer.created}), но указанные "
+                    "ссылки на родителей не назначены; повторный запуск не нужен."
+                )
+            except InvalidRecords as error:
+                self.report_errors(error.errors)
+                raise CommandError(
+                    f"Импорт остановлен: {error}. Записей обработано и сохранено до ошибки: {checkpoint.records}. "
+                    "Исправьте файл и продолжите импорт с ключом --resume."
+                )
+            if options["dry_run"]:
+                transaction.set_rollback(True)
+            else:
+                checkpoint.delete()
+
+        self.report_errors(importer.skipped)
+        elapsed = time.perf_counter() - started
+        prefix = "Проверено (без сохранения)" if options["dry_run"] else "Создано"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}: {importer.created} за {elapsed:.1f} с ({importer.created / elapsed:.0f} в секунду), "
+                f"пропущено некорректных записей: {len(importer.skipped)}."
+            )
+        )
+
+    def report_errors(self, errors):
+        for number, detail in errors[:MAX_REPORTED_ERRORS]:
+            self.stderr.write(f"Запись {number}: {detail}")
+        if len(errors) > MAX_REPORTED_ERRORS:
+            self.stderr.write(f"... и еще {len(errors) - MAX_REPORTED_ERRORS}")
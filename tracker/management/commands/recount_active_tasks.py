@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+
+from tracker.caching import bump_data_version
+from tracker.models import Employee
+
+
+class Command(BaseCommand):
+    help = "Пересчитать и проверить хранимое количество активных задач сотрудников."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Только проверить счетчики, не изменяя данные. Завершается с ошибкой при расхождениях.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            mismatched = list(
+                Employee.objects.with_actual_active_tasks_count()
+                .exclude(active_tasks_count=F("actual_active_tasks_count"))
+                .values_list("id", "active_tasks_count", "actual_active_tasks_count")
+            )
+            for employee_id, stored, actual in mismatched:
+                self.stdout.write(f"Сотрудник {employee_id}: сохранено {stored}, фактически {actual}")
+
+            if options["check"]:
+                if mismatched:
+                    raise CommandError(f"Найдено расхождений: {len(mismatched)}")
+                self.stdout.write(self.style.SUCCESS("Счетчики активных задач корректны."))
+                return
+
+            Employee.objects.filter(pk__in=[employee_id for employee_id, _, _ in mismatched]).recount_active_tasks()
+            if mismatched:
+                # Исправление не сопровождается записью задач, поэтому закэшированные ответы сбрасываются явно.
+                bump_data_version()
+        self.stdout.write(self.style.SUCCESS(f"Исправлено счетчиков: {len(mismatched)}"))
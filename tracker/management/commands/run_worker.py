@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from tracker.jobs import JOB_BATCH_SIZE, JOB_POLL_INTERVAL, run_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Выполнять фоновые задания из очереди в базе данных. Для нескольких обработчиков "
+        "запустите команду в нескольких процессах."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=JOB_BATCH_SIZE, help="Сколько заданий забирать из очереди за раз."
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=JOB_POLL_INTERVAL, help="Пауза в секундах, когда очередь пуста."
+        )
+        parser.add_argument("--name", action="append", dest="names", help="Выполнять только задания с этим именем.")
+        parser.add_argument("--burst", action="store_true", help="Завершиться, когда готовых заданий не останется.")
+
+    def handle(self, *args, **options):
+        done, failed = run_worker(
+            batch_size=options["batch_size"],
+            names=options["names"],
+            burst=options["burst"],
+            poll_interval=options["sleep"],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Выполнено заданий: {done}, с ошибкой: {failed}."))
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tracker.deadlines import SCAN_BATCH_SIZE, scan_deadlines
+
+
+class Command(BaseCommand):
+    help = (
+        "Обновить предупреждения о просроченных задачах и задачах со скорым сроком. "
+        "Обрабатываются только задачи, пересекшие границу сроков или измененные после предыдущего запуска."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=int,
+            default=None,
+            help="За сколько часов до срока предупреждать (по умолчанию TRACKER_DEADLINE_WARNING_HOURS).",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=SCAN_BATCH_SIZE, help="Количество задач в одной транзакции."
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = scan_deadlines(options["hours"], options["batch_size"], log=self.stdout.write)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Новых предупреждений: просрочено {result['overdue']}, скоро срок {result['approaching']}; "
+                f"снято {result['removed']} за {elapsed:.1f} с."
+            )
+        )
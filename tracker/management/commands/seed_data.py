@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tracker.datasets import seed_dataset
+
+
+class Command(BaseCommand):
+    help = "Создать тестовый набор сотрудников и задач с глубокими цепочками подзадач."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=10_000, help="Количество сотрудников.")
+        parser.add_argument("--tasks", type=int, default=1_000_000, help="Количество задач.")
+        parser.add_argument("--max-depth", type=int, default=20, help="Максимальная глубина вложенности задач.")
+        parser.add_argument("--seed", type=int, default=None, help="Seed для воспроизводимого набора данных.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Размер пачки одного INSERT.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with transaction.atomic():
+            employee_ids, task_ids = seed_dataset(
+                options["employees"],
+                options["tasks"],
+                max_depth=options["max_depth"],
+                seed=options["seed"],
+                batch_size=options["batch_size"],
+                log=self.stdout.write,
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано сотрудников: {len(employee_ids)}, задач: {len(task_ids)} "
+                f"за {time.perf_counter() - started:.1f} с"
+            )
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from tracker.workload import take_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Записать снимок загруженности за текущий день: количество активных задач сотрудников "
+        "и задач по статусам. Повторный запуск в тот же день обновляет снимок."
+    )
+
+    def handle(self, *args, **options):
+        result = take_snapshot()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Снимок за {result['date']}: записано строк сотрудников {result['employees']}, "
+                f"статусов {result['statuses']}."
+            )
+        )
@@ -0,0 +1,87 @@
+import threading
+from bisect import bisect_left
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Histogram:
+    """
+    Гистограмма в памяти процесса с накопительными корзинами в формате Prometheus.
+
+    Наблюдение — поиск корзины делением пополам и несколько сложений под блокировкой.
+    """
+
+    def __init__(self, name, description, buckets):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        """
+        Учесть значение.
+
+        Args:
+            labels: Кортеж пар (имя метки, значение), определяющий ряд гистограммы.
+            value: Наблюдаемое значение.
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def collect(self):
+        """Вернуть снимок рядов: {метки: (количества по корзинам, сумма)}."""
+        with self._lock:
+            return {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+
+    def render(self):
+        """Представить гистограмму в текстовом формате Prometheus."""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                bucket_labels = format_labels((*labels, ("le", bound if bound == "+Inf" else repr(float(bound)))))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {total!r}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+REQUEST_DURATION = Histogram(
+    "tracker_request_duration_seconds", "Полное время обработки запроса.", DURATION_BUCKETS
+)
+DB_DURATION = Histogram("tracker_db_duration_seconds", "Время SQL-запросов за запрос.", DURATION_BUCKETS)
+RENDER_DURATION = Histogram(
+    "tracker_render_duration_seconds", "Время отрисовки ответа рендерером DRF.", DURATION_BUCKETS
+)
+SERIALIZE_DURATION = Histogram(
+    "tracker_serialize_duration_seconds", "Время сериализации данных ответа без SQL-запросов.", DURATION_BUCKETS
+)
+QUERY_COUNT = Histogram("tracker_db_queries", "Количество SQL-запросов за запрос.", QUERY_COUNT_BUCKETS)
+
+HISTOGRAMS = (REQUEST_DURATION, DB_DURATION, SERIALIZE_DURATION, RENDER_DURATION, QUERY_COUNT)
+
+
+def render_metrics():
+    return "".join(histogram.render() for histogram in HISTOGRAMS)
@@ -0,0 +1,162 @@
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+from .metrics import DB_DURATION, QUERY_COUNT, RENDER_DURATION, REQUEST_DURATION, SERIALIZE_DURATION
+from .routers import routing_context
+
+
+class _RequestStats:
+    __slots__ = ("queries", "db_time", "serialize_time", "render_started", "render_time", "_lock")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.render_started = None
+        self.render_time = 0.0
+        self._lock = threading.Lock()
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            # Запросы одного HTTP-запроса могут выполняться параллельно в нескольких потоках.
+            with self._lock:
+                self.db_time += elapsed
+                self.queries += 1
+
+
+_current_stats = ContextVar("tracker_request_stats", default=None)
+
+
+@contextmanager
+def instrumented_connections():
+    """
+    Учитывать SQL-запросы подключений текущего потока в статистике текущего HTTP-запроса.
+
+    Подключения к базе данных привязаны к потоку, поэтому код, выполняющий запросы в другом
+    потоке (например, через `sync_to_async(thread_sensitive=False)`), должен войти в этот контекст сам.
+    """
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats.execute_wrapper))
+        yield
+
+
+@contextmanager
+def timed_serialization():
+    """
+    Учитывать время блока как время сериализации данных ответа текущего HTTP-запроса.
+
+    SQL-запросы внутри блока (например, выборка, которую вычисляет сериализатор) учитываются
+    во времени базы данных и из времени сериализации вычитаются.
+    """
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    db_time = stats.db_time
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        with stats._lock:
+            stats.serialize_time += max(elapsed - (stats.db_time - db_time), 0.0)
+
+
+class InstrumentationMiddleware:
+    """
+    Измерение количества SQL-запросов, времени базы данных, сериализации и отрисовки ответа и полного времени запроса.
+
+    Значения добавляются в заголовок `Server-Timing` и в гистограммы процесса по маршруту
+    (имени представления), доступные в формате Prometheus по `GET /api/metrics/`.
+    Запросы считаются через `execute_wrapper` всех подключений, время сериализации (serialize) —
+    в блоках `timed_serialization` представлений, время отрисовки (render) — от
+    `process_template_response` до окончания `response.render()`, то есть только преобразование
+    готовых данных рендерером.
+    Для потоковых ответов учитываются только запросы, выполненные до начала передачи тела.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = request._instrumentation = _RequestStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            with instrumented_connections():
+                response = self.get_response(request)
+        finally:
+            _current_stats.reset(token)
+        total = time.perf_counter() - started
+
+        match = request.resolver_match
+        labels = (("method", request.method), ("route", match.view_name if match else "unmatched"))
+        REQUEST_DURATION.observe(labels, total)
+        DB_DURATION.observe(labels, stats.db_time)
+        SERIALIZE_DURATION.observe(labels, stats.serialize_time)
+        RENDER_DURATION.observe(labels, stats.render_time)
+        QUERY_COUNT.observe(labels, stats.queries)
+
+        response["Server-Timing"] = (
+            f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries", '
+            f"serialize;dur={stats.serialize_time * 1000:.2f}, "
+            f"render;dur={stats.render_time * 1000:.2f}, total;dur={total * 1000:.2f}"
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        stats = request._instrumentation
+        stats.render_started = time.perf_counter()
+
+        def finish(rendered):
+            stats.render_time = time.perf_counter() - stats.render_started
+
+        response.add_post_render_callback(finish)
+        return response
+
+
+class ReplicaPinningMiddleware:
+    """
+    Закрепление клиента за основной базой данных после записи.
+
+    Изменяющие запросы выполняются целиком в основной базе и выставляют cookie на
+    TRACKER_DB_PIN_SECONDS секунд: пока она действует, чтение этого клиента тоже идет в основную
+    базу, и он видит свои изменения, даже если реплики от нее отстают.
+    """
+
+    cookie_name = "tracker_db_pin"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        unsafe = request.method not in SAFE_METHODS
+        try:
+            pinned_until = float(request.COOKIES.get(self.cookie_name, 0))
+        except ValueError:
+            pinned_until = 0
+
+        with routing_context(pinned=unsafe or pinned_until > time.time()):
+            response = self.get_response(request)
+
+        if unsafe:
+            window = getattr(settings, "TRACKER_DB_PIN_SECONDS", 5)
+            response.set_cookie(
+                self.cookie_name, str(time.time() + window), max_age=window, httponly=True, samesite="Lax"
+            )
+        return response
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.15 on 2026-10-16 20:44
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_active_tasks_count(apps, schema_editor):
+    Employee = apps.get_model("tracker", "Employee")
+    Task = apps.get_model("tracker", "Task")
+    active_tasks = (
+        Task.objects.filter(assignee=OuterRef("pk"), status__in=["not_started", "in_progress"])
+        .order_by()
+        .values("assignee")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    Employee.objects.update(active_tasks_count=Coalesce(Subquery(active_tasks), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0003_alter_task_assignee"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employee",
+            name="active_tasks_count",
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(fill_active_tasks_count, migrations.RunPython.noop),
+    ]
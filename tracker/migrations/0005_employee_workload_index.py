@@ -0,0 +1,22 @@
+# Generated by Django 5.1.15 on 2026-10-16 20:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0004_employee_active_tasks_count"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="employee",
+            name="active_tasks_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="employee",
+            index=models.Index(fields=["active_tasks_count", "id"], name="tracker_emp_active__61a34d_idx"),
+        ),
+    ]
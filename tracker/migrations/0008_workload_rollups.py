@@ -0,0 +1,53 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0007_tombstone_sync_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmployeeWorkloadRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("employee_id", models.BigIntegerField()),
+                ("active_tasks", models.PositiveIntegerField()),
+            ],
+            options={
+                "indexes": [models.Index(fields=["date"], name="tracker_emp_date_007c51_idx")],
+                "constraints": [
+                    models.UniqueConstraint(fields=("employee_id", "date"), name="tracker_employee_rollup_unique")
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="StatusRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("not_started", "Не начата"),
+                            ("in_progress", "Выполняется"),
+                            ("completed", "Завершена"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("tasks", models.PositiveIntegerField()),
+                ("updated", models.PositiveIntegerField()),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("date", "status"), name="tracker_status_rollup_unique")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:40
+
+from django.db import migrations
+
+TRIGRAM_INDEXES = [
+    ("tracker_employee_full_name_trgm", "tracker_employee", "full_name"),
+    ("tracker_task_name_trgm", "tracker_task", "name"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # Триграммные индексы есть только в PostgreSQL; на других базах поиск использует индекс в памяти процесса.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY не выполняется внутри транзакции, зато не блокирует запись в таблицы.
+    atomic = False
+
+    dependencies = [
+        ("tracker", "0009_archived_task"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
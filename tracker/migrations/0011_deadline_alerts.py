@@ -0,0 +1,47 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:28
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0010_trigram_search_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeadlineScanState",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("overdue_until", models.DateTimeField(blank=True, null=True)),
+                ("approaching_until", models.DateTimeField(blank=True, null=True)),
+                ("changes_since", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="DeadlineAlert",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("task_id", models.BigIntegerField(unique=True)),
+                ("assignee_id", models.BigIntegerField(blank=True, null=True)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("approaching", "Скоро срок"), ("overdue", "Просрочена")],
+                        max_length=20,
+                    ),
+                ),
+                ("deadline", models.DateTimeField()),
+                ("raised_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["assignee_id", "kind"], name="tracker_dea_assigne_65e9dd_idx"),
+                    models.Index(fields=["deadline", "task_id"], name="tracker_dea_deadlin_bec307_idx"),
+                ],
+            },
+        ),
+    ]
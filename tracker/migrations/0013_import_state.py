@@ -0,0 +1,65 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0012_job_queue"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportState",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("model", models.CharField(max_length=20)),
+                ("source", models.CharField(max_length=500)),
+                ("records", models.PositiveBigIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("model", "source"), name="tracker_import_state_unique")
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ImportRef",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("ref", models.CharField(max_length=200)),
+                ("task_id", models.BigIntegerField()),
+                (
+                    "state",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="refs", to="tracker.importstate"
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("state", "ref"), name="tracker_import_ref_unique")],
+            },
+        ),
+        migrations.CreateModel(
+            name="ImportPendingParent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("task_id", models.BigIntegerField()),
+                ("parent_ref", models.CharField(max_length=200)),
+                ("record", models.PositiveBigIntegerField()),
+                (
+                    "state",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="pending", to="tracker.importstate"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["state", "task_id"], name="tracker_imp_state_i_acc159_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0013_import_state"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="archivedtask",
+            name="deadline",
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="archivedtask",
+            name="status",
+            field=models.CharField(
+                choices=[("not_started", "Не начата"), ("in_progress", "Выполняется"), ("completed", "Завершена")],
+                db_index=True,
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["status", "deadline"], name="tracker_arc_status_c91a77_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["assignee", "status"], name="tracker_arc_assigne_269827_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["updated_at", "id"], name="tracker_arc_updated_2760eb_idx"),
+        ),
+    ]
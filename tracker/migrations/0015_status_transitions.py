@@ -0,0 +1,52 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:41
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0014_archived_task_indexes"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="statusrollup",
+            old_name="updated",
+            new_name="transitions",
+        ),
+        migrations.CreateModel(
+            name="StatusTransition",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("task_id", models.BigIntegerField()),
+                (
+                    "from_status",
+                    models.CharField(
+                        choices=[
+                            ("not_started", "Не начата"),
+                            ("in_progress", "Выполняется"),
+                            ("completed", "Завершена"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "to_status",
+                    models.CharField(
+                        choices=[
+                            ("not_started", "Не начата"),
+                            ("in_progress", "Выполняется"),
+                            ("completed", "Завершена"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("changed_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["changed_at"], name="tracker_sta_changed_aaf446_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-17 00:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0015_status_transitions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="deadlinescanstate",
+            name="warning_hours",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
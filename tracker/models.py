@@ -1,11 +1,136 @@
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, router, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from .caching import bump_data_version
 
-class Employee(models.Model):
+ACTIVE_STATUSES = ["not_started", "in_progress"]
+
+CYCLE_ERROR_MESSAGE = "Родительская задача не может быть подзадачей этой задачи."
+
+
+class VersionedQuerySet(models.QuerySet):
+    """
+    Выборка, меняющая версию данных при массовых изменениях (см. `tracker.caching`).
+
+    Модели таких выборок должны иметь поле `updated_at`.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        bump_data_version(self.db)
+        return objs
+
+    def update(self, **kwargs):
+        # auto_now не срабатывает при update(), поэтому время изменения проставляется явно.
+        kwargs.setdefault("updated_at", timezone.now())
+        rows = super().update(**kwargs)
+        bump_data_version(self.db)
+        return rows
+
+    update.alters_data = True
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list("pk", flat=True))
+            result = super().delete()
+            model_name = self.model._meta.model_name
+            Tombstone.objects.using(self.db).bulk_create(
+                [Tombstone(model=model_name, object_id=pk) for pk in pks], batch_size=1000
+            )
+        bump_data_version(self.db)
+        return result
+
+    delete.alters_data = True
+
+
+class VersionedModel(models.Model):
+    """
+    Модель, меняющая версию данных при сохранении и удалении экземпляров.
+
+    Удаление экземпляра выполняется через выборку, поэтому проходит тот же путь,
+    что и массовое удаление: пересчет связанных данных и запись надгробия.
+    """
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        bump_data_version(kwargs.get("using") or router.db_for_write(self.__class__, instance=self))
+
+    def delete(self, using=None, keep_parents=False):
+        using = using or router.db_for_write(self.__class__, instance=self)
+        result = self.__class__._default_manager.using(using).filter(pk=self.pk).delete()
+        setattr(self, self._meta.pk.attname, None)
+        return result
+
+    class Meta:
+        abstract = True
+
+
+class EmployeeQuerySet(VersionedQuerySet):
+    def update_counters(self, **kwargs):
+        """
+        Обновить хранимые счетчики, не меняя `updated_at` и версию данных.
+
+        Счетчики меняются только вместе с задачами, и версию данных меняет запись задач. Изменение
+        только счетчика не должно выглядеть как изменение сотрудника для delta-синхронизации и ETag
+        его представлений, поэтому ответы, показывающие счетчики, зависят и от выборки задач.
+        """
+        return super(VersionedQuerySet, self).update(**kwargs)
+
+    update_counters.alters_data = True
+
+    def recount_active_tasks(self):
+        """
+        Пересчитать хранимое количество активных задач для сотрудников из выборки (см. `update_counters`).
+
+        Returns:
+            int: Количество обновленных сотрудников.
+        """
+        active_tasks = (
+            Task.objects.filter(assignee=OuterRef("pk"), status__in=ACTIVE_STATUSES)
+            .order_by()
+            .values("assignee")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return self.update_counters(active_tasks_count=Coalesce(Subquery(active_tasks), 0))
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            # Явно снимаем назначение вместо SET_NULL, чтобы изменение задач попало в счетчики и delta-синхронизацию.
+            Task.objects.using(self.db).filter(assignee__in=self.values("pk")).update(assignee=None)
+            return super().delete()
+
+    delete.alters_data = True
+
+    def with_actual_active_tasks_count(self):
+        """Добавить к выборке фактическое количество активных задач, посчитанное по таблице задач."""
+        return self.annotate(
+            actual_active_tasks_count=Count("tasks", filter=models.Q(tasks__status__in=ACTIVE_STATUSES))
+        )
+
+
+class Employee(VersionedModel):
     full_name = models.CharField(max_length=100, db_index=True)
     position = models.CharField(max_length=100)
+    active_tasks_count = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = EmployeeQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        # Счетчик активных задач обновляется только операциями над задачами,
+        # поэтому сохранение сотрудника не должно перезаписывать его устаревшим значением.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "active_tasks_count"
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.full_name
@@ -13,10 +138,91 @@ class Employee(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["full_name"]),
+            models.Index(fields=["active_tasks_count", "id"]),
+            models.Index(fields=["updated_at", "id"]),
         ]
 
 
-class Task(models.Model):
+def _invalidate_rollups(task_ids, using):
+    from .rollups import invalidate_rollups
+
+    invalidate_rollups(task_ids, using)
+
+
+def _record_status_transitions(transitions, using):
+    """Записать в журнал смены статуса: (ID задачи, старый статус, новый статус)."""
+    StatusTransition.objects.using(using).bulk_create(
+        [
+            StatusTransition(task_id=task_id, from_status=old_status, to_status=new_status)
+            for task_id, old_status, new_status in transitions
+        ],
+        batch_size=1000,
+    )
+
+
+class TaskQuerySet(VersionedQuerySet):
+    """
+    Выборка задач, поддерживающая счетчики активных задач сотрудников, кэш сводок
+    по деревьям задач и журнал смен статуса при массовых операциях.
+    """
+
+    COUNTER_FIELDS = {"status", "assignee", "assignee_id"}
+    ROLLUP_FIELDS = {"status", "deadline", "parent_task", "parent_task_id"}
+
+    def _recount_assignees(self, assignee_ids):
+        assignee_ids = {assignee_id for assignee_id in assignee_ids if assignee_id is not None}
+        if assignee_ids:
+            Employee.objects.using(self.db).filter(pk__in=assignee_ids).recount_active_tasks()
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            self._recount_assignees(obj.assignee_id for obj in objs)
+            _invalidate_rollups({obj.parent_task_id for obj in objs}, self.db)
+        return objs
+
+    def update(self, **kwargs):
+        counted = bool(self.COUNTER_FIELDS & kwargs.keys())
+        rolled_up = bool(self.ROLLUP_FIELDS & kwargs.keys())
+        if not counted and not rolled_up:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            before = list(self.values_list("pk", "assignee", "status"))
+            pks = [pk for pk, _, _ in before]
+            if rolled_up:
+                _invalidate_rollups(pks, self.db)
+            rows = super().update(**kwargs)
+            if counted:
+                after = list(Task.objects.using(self.db).filter(pk__in=pks).values_list("pk", "assignee", "status"))
+                self._recount_assignees(
+                    {assignee_id for _, assignee_id, _ in before} | {assignee_id for _, assignee_id, _ in after}
+                )
+                old_statuses = {pk: status for pk, _, status in before}
+                _record_status_transitions(
+                    [(pk, old_statuses[pk], status) for pk, _, status in after if old_statuses[pk] != status], self.db
+                )
+            if {"parent_task", "parent_task_id"} & kwargs.keys():
+                # Задачи переместились в другие деревья — сбрасываем и их новые корни.
+                _invalidate_rollups(pks, self.db)
+        return rows
+
+    update.alters_data = True
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            before = list(self.values_list("pk", "assignee"))
+            pks = [pk for pk, _ in before]
+            _invalidate_rollups(pks, self.db)
+            # Явно отвязываем подзадачи вместо SET_NULL, чтобы обновилось их время изменения.
+            Task.objects.using(self.db).filter(parent_task__in=pks).exclude(pk__in=pks).update(parent_task=None)
+            result = super().delete()
+            self._recount_assignees({assignee_id for _, assignee_id in before})
+        return result
+
+    delete.alters_data = True
+
+
+class Task(VersionedModel):
     STATUS_CHOICES = [
         ("not_started", "Не начата"),
         ("in_progress", "Выполняется"),
@@ -29,25 +235,326 @@ class Task(models.Model):
     deadline = models.DateTimeField(db_index=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="not_started", db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TaskQuerySet.as_manager()
+
+    def _get_stored(self, using):
+        """
+        Сохраненные в базе статус, исполнитель, срок и родитель задачи (None, если задачи нет).
+
+        Читаются из базы с блокировкой строки, а не из полей экземпляра: экземпляр мог
+        устареть после массового изменения или параллельной записи.
+        """
+        return (
+            Task.objects.using(using)
+            .select_for_update()
+            .filter(pk=self.pk)
+            .values("status", "assignee", "deadline", "parent_task")
+            .first()
+        )
 
     def clean(self):
+        from .hierarchy import find_cycles
+
         if self.parent_task == self:
             raise ValidationError("Задача не может быть своим собственным родителем.")
+        if self.pk and self.parent_task_id and find_cycles({self.pk: self.parent_task_id}):
+            raise ValidationError(CYCLE_ERROR_MESSAGE)
         if self.deadline and self.deadline < timezone.now():
             raise ValidationError("Срок выполнения не может быть в прошлом.")
 
     def save(self, *args, **kwargs):
         self.full_clean()
-        super().save(*args, **kwargs)
+        using = kwargs.get("using") or router.db_for_write(self.__class__, instance=self)
+        with transaction.atomic(using=using):
+            stored = None if self._state.adding else self._get_stored(using)
+            # Сотрудник, у которого задача сейчас учтена в счетчике активных задач.
+            old_assignee_id = stored["assignee"] if stored and stored["status"] in ACTIVE_STATUSES else None
+            # Значения, которые окажутся в базе после сохранения: поля вне update_fields не записываются.
+            written = {
+                "status": self.status,
+                "assignee": self.assignee_id,
+                "deadline": self.deadline,
+                "parent_task": self.parent_task_id,
+            }
+            update_fields = kwargs.get("update_fields")
+            if stored is not None and update_fields is not None:
+                names = {self._meta.get_field(name).name for name in update_fields}
+                written = {name: value if name in names else stored[name] for name, value in written.items()}
+            if stored is None or any(stored[name] != written[name] for name in ("status", "deadline", "parent_task")):
+                # Старое дерево задачи (до сохранения) и новое — через нового родителя.
+                _invalidate_rollups({None if self._state.adding else self.pk, written["parent_task"]}, using)
+            super().save(*args, **kwargs)
+            if stored is not None and stored["status"] != written["status"]:
+                _record_status_transitions([(self.pk, stored["status"], written["status"])], using)
+            new_assignee_id = written["assignee"] if written["status"] in ACTIVE_STATUSES else None
+            if old_assignee_id != new_assignee_id:
+                employees = Employee.objects.using(using)
+                if old_assignee_id is not None:
+                    employees.filter(pk=old_assignee_id).update_counters(active_tasks_count=F("active_tasks_count") - 1)
+                if new_assignee_id is not None:
+                    employees.filter(pk=new_assignee_id).update_counters(active_tasks_count=F("active_tasks_count") + 1)
 
     def __str__(self):
         return self.name
 
     def is_active(self):
-        return self.status in ["not_started", "in_progress"]
+        return self.status in ACTIVE_STATUSES
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "deadline"]),
+            models.Index(fields=["assignee", "status"]),
+            models.Index(fields=["updated_at", "id"]),
+        ]
+
+
+class ArchivedTask(models.Model):
+    """
+    Завершенная задача, перенесенная из `Task` в архив (см. `tracker.archive`).
+
+    Задачи архивируются целыми деревьями и сохраняют свои ID, поэтому ссылки на родителей
+    внутри архива остаются согласованными.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=200)
+    parent_task = models.ForeignKey("self", on_delete=models.SET_NULL, null=True, blank=True, related_name="subtasks")
+    assignee = models.ForeignKey(
+        Employee, on_delete=models.SET_NULL, related_name="archived_tasks", null=True, blank=True
+    )
+    deadline = models.DateTimeField(db_index=True)
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES, db_index=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.name
 
     class Meta:
+        # Те же индексы, что и у `Task`: список архива фильтруется и сортируется `TaskFilterBackend`.
         indexes = [
             models.Index(fields=["status", "deadline"]),
             models.Index(fields=["assignee", "status"]),
+            models.Index(fields=["updated_at", "id"]),
+        ]
+
+
+class Tombstone(models.Model):
+    """Запись об удаленном объекте для delta-синхронизации клиентов."""
+
+    MODEL_CHOICES = [
+        ("employee", "Сотрудник"),
+        ("task", "Задача"),
+    ]
+
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "id"]),
+        ]
+
+
+class EmployeeWorkloadRollup(models.Model):
+    """
+    Количество активных задач сотрудника на дату снимка (см. `tracker.workload`).
+
+    ID сотрудника хранится без внешнего ключа, чтобы история сохранялась после удаления сотрудника.
+    """
+
+    date = models.DateField()
+    employee_id = models.BigIntegerField()
+    active_tasks = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["employee_id", "date"], name="tracker_employee_rollup_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["date"]),
+        ]
+
+
+class StatusRollup(models.Model):
+    """Количество задач в статусе на дату снимка и количество переходов задач в этот статус за этот день."""
+
+    date = models.DateField()
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    tasks = models.PositiveIntegerField()
+    transitions = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["date", "status"], name="tracker_status_rollup_unique"),
+        ]
+
+
+class StatusTransition(models.Model):
+    """
+    Смена статуса задачи. Журнал читается снимками загруженности (см. `tracker.workload`)
+    и очищается ими от уже учтенных дней.
+
+    ID задачи хранится без внешнего ключа, чтобы удаление задач не требовало обращений к журналу.
+    """
+
+    task_id = models.BigIntegerField()
+    from_status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["changed_at"]),
+        ]
+
+
+class DeadlineAlert(models.Model):
+    """
+    Активная задача, срок которой прошел или скоро наступит (см. `tracker.deadlines`).
+
+    На задачу приходится не более одной записи. ID задачи и сотрудника хранятся без внешних ключей,
+    чтобы удаление задач не требовало обращений к этой таблице: записи удаленных задач убираются
+    сканером по надгробиям.
+    """
+
+    KIND_CHOICES = [
+        ("approaching", "Скоро срок"),
+        ("overdue", "Просрочена"),
+    ]
+
+    task_id = models.BigIntegerField(unique=True)
+    assignee_id = models.BigIntegerField(null=True, blank=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    deadline = models.DateTimeField()
+    raised_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["assignee_id", "kind"]),
+            models.Index(fields=["deadline", "task_id"]),
+        ]
+
+
+class DeadlineScanState(models.Model):
+    """
+    Границы, до которых сканер сроков уже обработал задачи.
+
+    Хранится одна строка: сроки до `overdue_until` уже проверены на просрочку, сроки до `approaching_until` —
+    на приближение (с окном `warning_hours` часов), изменения задач до `changes_since` — на влияние
+    на предупреждения.
+    """
+
+    overdue_until = models.DateTimeField(null=True, blank=True)
+    approaching_until = models.DateTimeField(null=True, blank=True)
+    warning_hours = models.PositiveIntegerField(null=True, blank=True)
+    changes_since = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class Job(models.Model):
+    """
+    Фоновое задание в очереди в базе данных (см. `tracker.jobs`).
+
+    Для непустого ключа в очереди может быть не более одного ожидающего задания: повторная постановка
+    с тем же ключом возвращает уже поставленное задание.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "В очереди"),
+        (RUNNING, "Выполняется"),
+        (DONE, "Выполнено"),
+        (FAILED, "Ошибка"),
+    ]
+
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=200, blank=True, default="")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} #{self.pk}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["key"],
+                condition=models.Q(status="queued") & ~models.Q(key=""),
+                name="tracker_job_queued_key_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["status", "run_after", "id"]),
+        ]
+
+
+class PrecomputedResult(models.Model):
+    """Последний результат фонового вычисления аналитики и отпечаток данных, по которым он получен."""
+
+    name = models.CharField(max_length=100, unique=True)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    fingerprint = models.CharField(max_length=200)
+    computed_at = models.DateTimeField()
+
+
+class ImportState(models.Model):
+    """
+    Состояние импорта файла (см. `tracker.importer`): количество записей, уже сохраненных в базе.
+
+    Состояние определяется тем, что импортируется, и абсолютным путем к файлу, поэтому импорт другого
+    файла не продолжается с чужой позиции.
+    """
+
+    model = models.CharField(max_length=20)
+    source = models.CharField(max_length=500)
+    records = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["model", "source"], name="tracker_import_state_unique"),
+        ]
+
+
+class ImportRef(models.Model):
+    """Задача, созданная импортом из записи файла с ключом `ref`."""
+
+    state = models.ForeignKey(ImportState, on_delete=models.CASCADE, related_name="refs")
+    ref = models.CharField(max_length=200)
+    task_id = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["state", "ref"], name="tracker_import_ref_unique"),
+        ]
+
+
+class ImportPendingParent(models.Model):
+    """Созданная импортом задача, родитель которой (`parent_ref`) встречается в файле позже нее."""
+
+    state = models.ForeignKey(ImportState, on_delete=models.CASCADE, related_name="pending")
+    task_id = models.BigIntegerField()
+    parent_ref = models.CharField(max_length=200)
+    record = models.PositiveBigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["state", "task_id"]),
         ]
@@ -0,0 +1,208 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import DateTimeField, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Курсорная (keyset) пагинация по составному ключу сортировки.
+
+    Позиция страницы задается значениями полей сортировки последней записи, поэтому
+    любая страница выбирается условием по индексу и стоит столько же, сколько первая.
+    Сортировка берется из выборки (если она упорядочена) и дополняется первичным ключом
+    для однозначности. Поля сортировки не должны содержать NULL.
+    """
+
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    ordering = ("id",)
+    invalid_cursor_message = "Некорректный курсор."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.get_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        """Асинхронный вариант `paginate_queryset` для представлений на асинхронном ORM."""
+        return self.get_page([obj async for obj in self.get_page_queryset(queryset, request)])
+
+    def get_page_queryset(self, queryset, request):
+        """Подготовить выборку страницы: сортировка, условие курсора и срез на одну запись больше страницы."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        self.position, self.reverse = self.decode_cursor(request)
+        if self.position is not None:
+            self.position = self.parse_position(queryset.model, self.position)
+        ordering = [self._invert(field) for field in self.ordering] if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(self._after(ordering, self.position))
+        return queryset[: self.page_size + 1]
+
+    def get_page(self, results):
+        """Отрезать лишнюю запись выборки страницы и запомнить позиции для ссылок."""
+        position, reverse = self.position, self.reverse
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_previous, self.has_next = has_more, position is not None
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.first_position = self._position(results[0]) if results else position
+        self.last_position = self._position(results[-1]) if results else position
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset):
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)] or list(self.ordering)
+        if not {"id", "-id", "pk", "-pk"} & set(ordering):
+            ordering.append("-id" if ordering[-1].startswith("-") else "id")
+        return tuple(ordering)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            position, reverse = data["p"], bool(data.get("r"))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def parse_position(self, model, position):
+        """Восстановить значения полей даты и времени позиции курсора из строк isoformat()."""
+        parsed = []
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            try:
+                model_field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+            except FieldDoesNotExist:
+                model_field = None
+            if isinstance(model_field, DateTimeField):
+                try:
+                    value = parse_datetime(value) if isinstance(value, str) else None
+                except ValueError:
+                    value = None
+                if value is None:
+                    raise NotFound(self.invalid_cursor_message)
+            parsed.append(value)
+        return parsed
+
+    def encode_cursor(self, position, reverse=False):
+        # Время сохраняется через isoformat(): DjangoJSONEncoder отбрасывает микросекунды, и условие
+        # курсора по такому значению повторяло бы или пропускало записи с тем же значением поля.
+        position = [value.isoformat() if isinstance(value, datetime) else value for value in position]
+        data = {"p": position, "r": 1} if reverse else {"p": position}
+        encoded = urlsafe_b64encode(json.dumps(data, cls=DjangoJSONEncoder).encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.last_position)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first_position is None:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.first_position, reverse=True)
+
+    def get_paginated_data(self, data):
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Курсор страницы из ссылок next/previous.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Количество записей на странице (не более {self.max_page_size}).",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def _position(self, obj):
+        """Значения полей сортировки записи: экземпляра модели или строки `values()`."""
+        position = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            if isinstance(obj, dict):
+                position.append(obj["id" if name == "pk" else name])
+                continue
+            attname = "pk" if name == "pk" else obj._meta.get_field(name).attname
+            position.append(getattr(obj, attname))
+        return position
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _after(ordering, position):
+        """
+        Построить условие «строго после позиции» для составного ключа сортировки.
+
+        Помимо раскрытого лексикографического сравнения добавляется нестрогая граница
+        по первому полю, чтобы база данных могла использовать индекс как диапазон.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        first = ordering[0]
+        bound = Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": position[0]})
+        return bound & condition
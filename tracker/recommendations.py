@@ -0,0 +1,196 @@
+import heapq
+import random
+
+from django.db import transaction
+from django.db.models import Prefetch, Q
+
+from .models import Employee, Task
+
+REASON_ASSIGNED = "Уже назначенный исполнитель"
+REASON_SUBTASK_ASSIGNEE = "Сотрудник подзадачи не сильно загружен"
+REASON_LEAST_BUSY = "Случайный наименее загруженный сотрудник"
+
+# Насколько сотрудник подзадачи может быть загруженнее наименее загруженного сотрудника.
+SUBTASK_ASSIGNEE_TOLERANCE = 2
+
+
+class WorkloadSnapshot:
+    """
+    Снимок загруженности сотрудников, загружаемый одним запросом.
+
+    Хранит сотрудников с количеством активных задач и позволяет получать
+    наименее загруженных сотрудников без обращений к базе данных.
+    """
+
+    def __init__(self, employees):
+        self.employees = {employee.id: employee for employee in employees}
+        self.min_tasks = min((e.active_tasks_count for e in self.employees.values()), default=None)
+        self.least_busy = [e for e in self.employees.values() if e.active_tasks_count == self.min_tasks]
+
+    @classmethod
+    def load(cls):
+        return cls(Employee.objects.order_by("active_tasks_count", "id"))
+
+    def __bool__(self):
+        return bool(self.employees)
+
+    def get(self, employee_id):
+        return self.employees.get(employee_id)
+
+
+def get_important_tasks():
+    """
+    Получить важные задачи вместе с исполнителями их подзадач в работе.
+
+    Важная задача — не начатая или не назначенная задача, у которой есть подзадача в работе.
+    Подзадачи подгружаются одним дополнительным запросом в атрибут `in_progress_subtasks`.
+    """
+    return (
+        Task.objects.filter(
+            Q(status="not_started", subtasks__status="in_progress")
+            | Q(assignee__isnull=True, subtasks__status="in_progress")
+        )
+        .distinct()
+        .order_by("id")
+        .prefetch_related(
+            Prefetch(
+                "subtasks",
+                queryset=Task.objects.filter(status="in_progress").only("id", "parent_task", "assignee").order_by("id"),
+                to_attr="in_progress_subtasks",
+            )
+        )
+    )
+
+
+def suggest_employee(task, snapshot, rng=random):
+    """
+    Подобрать исполнителя для задачи по снимку загруженности.
+
+    Args:
+        task: Важная задача с подгруженным атрибутом `in_progress_subtasks`.
+        snapshot: Снимок загруженности сотрудников.
+        rng: Генератор случайных чисел для выбора среди наименее загруженных.
+
+    Returns:
+        tuple: Предлагаемый сотрудник (или None) и причина предложения.
+    """
+    if task.assignee_id:
+        return snapshot.get(task.assignee_id), REASON_ASSIGNED
+    if not snapshot:
+        return None, ""
+
+    subtasks = getattr(task, "in_progress_subtasks", [])
+    if subtasks:
+        subtask_employee = snapshot.get(subtasks[0].assignee_id)
+        if subtask_employee and subtask_employee.active_tasks_count <= snapshot.min_tasks + SUBTASK_ASSIGNEE_TOLERANCE:
+            return subtask_employee, REASON_SUBTASK_ASSIGNEE
+    return rng.choice(snapshot.least_busy), REASON_LEAST_BUSY
+
+
+def recommend_assignees(rng=random):
+    """
+    Рассчитать рекомендации исполнителей для всех важных задач.
+
+    Выполняет фиксированное число запросов: снимок загруженности, важные задачи
+    и их подзадачи в работе. Все рекомендации вычисляются в памяти.
+
+    Returns:
+        list: Кортежи (задача, предлагаемый сотрудник, причина предложения).
+    """
+    snapshot = WorkloadSnapshot.load()
+    return [(task, *suggest_employee(task, snapshot, rng)) for task in get_important_tasks()]
+
+
+def important_task_item(task, suggested_employee, suggested_reason):
+    """Представление важной задачи с рекомендацией в ответе API."""
+    return {
+        "Важная задача": task.name,
+        "ID задачи": task.id,
+        "Срок": task.deadline.strftime("%Y-%m-%d") if task.deadline else None,
+        "ФИО предлагаемого сотрудника": suggested_employee.full_name if suggested_employee else [],
+        "ID предлагаемого сотрудника": suggested_employee.id if suggested_employee else None,
+        "Причина предложения": suggested_reason,
+        "Количество активных задач": suggested_employee.active_tasks_count if suggested_employee else None,
+    }
+
+
+def get_unassigned_important_tasks():
+    """
+    Получить неназначенные важные задачи и исполнителя первой подзадачи в работе.
+
+    Выполняет один запрос по подзадачам в работе без создания экземпляров модели.
+
+    Returns:
+        dict: {ID задачи: ID исполнителя первой подзадачи в работе или None} в порядке ID задач.
+    """
+    rows = (
+        Task.objects.filter(status="in_progress", parent_task__isnull=False, parent_task__assignee__isnull=True)
+        .order_by("id")
+        .values_list("parent_task_id", "assignee_id")
+    )
+    preferred = {}
+    for task_id, assignee_id in rows:
+        preferred.setdefault(task_id, assignee_id)
+    return dict(sorted(preferred.items()))
+
+
+def build_assignment_plan(tasks, loads, rng=random):
+    """
+    Распределить задачи между сотрудниками с учетом выданных в этом же плане задач.
+
+    Нагрузки хранятся в куче (количество задач, случайный ключ, ID сотрудника), и каждое
+    назначение сразу увеличивает нагрузку сотрудника. Устаревшие записи кучи отбрасываются
+    при извлечении. Сотрудник подзадачи предпочитается, если его нагрузка не больше
+    минимальной на SUBTASK_ASSIGNEE_TOLERANCE. Сложность — O((задачи + сотрудники) · log сотрудники).
+
+    Args:
+        tasks: Словарь {ID задачи: ID предпочитаемого сотрудника или None}.
+        loads: Словарь {ID сотрудника: количество активных задач}; изменяется на месте.
+        rng: Генератор случайных чисел для выбора среди одинаково загруженных сотрудников.
+
+    Returns:
+        list: Кортежи (ID задачи, ID сотрудника, причина, нагрузка сотрудника после назначения).
+    """
+    if not loads:
+        return []
+    heap = [(load, rng.random(), employee_id) for employee_id, load in sorted(loads.items())]
+    heapq.heapify(heap)
+
+    plan = []
+    for task_id, preferred_id in tasks.items():
+        while heap[0][0] != loads[heap[0][2]]:
+            heapq.heappop(heap)
+        min_load = heap[0][0]
+
+        if preferred_id in loads and loads[preferred_id] <= min_load + SUBTASK_ASSIGNEE_TOLERANCE:
+            employee_id, reason = preferred_id, REASON_SUBTASK_ASSIGNEE
+        else:
+            employee_id, reason = heap[0][2], REASON_LEAST_BUSY
+        loads[employee_id] += 1
+        heapq.heappush(heap, (loads[employee_id], rng.random(), employee_id))
+        plan.append((task_id, employee_id, reason, loads[employee_id]))
+    return plan
+
+
+def plan_assignments(rng=random, apply=False):
+    """
+    Составить план назначения всех неназначенных важных задач и, при необходимости, применить его.
+
+    Args:
+        rng: Генератор случайных чисел; план детерминирован для генератора с фиксированным seed.
+        apply: Назначить исполнителей в базе данных.
+
+    Returns:
+        list: Кортежи (ID задачи, ID сотрудника, причина, нагрузка сотрудника после назначения).
+    """
+    with transaction.atomic():
+        tasks = get_unassigned_important_tasks()
+        loads = dict(Employee.objects.values_list("id", "active_tasks_count"))
+        plan = build_assignment_plan(tasks, loads, rng)
+        if apply and plan:
+            Task.objects.bulk_update(
+                [Task(id=task_id, assignee_id=employee_id) for task_id, employee_id, _, _ in plan],
+                ["assignee"],
+                batch_size=1000,
+            )
+    return plan
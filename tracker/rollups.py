@@ -0,0 +1,145 @@
+from django.db import router, transaction
+from django.utils import timezone
+
+from .caching import get_cache
+from .hierarchy import get_forest, get_roots
+from .models import ACTIVE_STATUSES, Task
+
+ROLLUP_CACHE_PREFIX = "tracker:rollup"
+ROLLUP_CACHE_TIMEOUT = 60 * 60
+
+
+def rollup_cache_key(root_id):
+    return f"{ROLLUP_CACHE_PREFIX}:{root_id}"
+
+
+class Rollup:
+    """Сводка по поддереву задачи: прогресс подзадач и нарушения сроков."""
+
+    __slots__ = ("total", "completed", "late_deadlines", "overdue_under_active", "expires_at")
+
+    def __init__(self):
+        self.total = 0
+        self.completed = 0
+        self.late_deadlines = 0
+        self.overdue_under_active = 0
+        # Ближайший момент, когда активная подзадача активного родителя станет просроченной.
+        self.expires_at = None
+
+    def merge(self, other):
+        self.total += other.total
+        self.completed += other.completed
+        self.late_deadlines += other.late_deadlines
+        self.overdue_under_active += other.overdue_under_active
+        if other.expires_at is not None and (self.expires_at is None or other.expires_at < self.expires_at):
+            self.expires_at = other.expires_at
+
+    def as_dict(self):
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "late_deadlines": self.late_deadlines,
+            "overdue_under_active": self.overdue_under_active,
+            "expires_at": self.expires_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        rollup = cls()
+        for name in cls.__slots__:
+            setattr(rollup, name, data[name])
+        return rollup
+
+
+def compute_rollups(tasks, root_ids, now=None):
+    """
+    Посчитать сводки для корней за один проход снизу вверх.
+
+    Args:
+        tasks: Задачи всех поддеревьев с полями id, parent_task_id, status и deadline.
+        root_ids: ID корней, для которых нужны сводки.
+        now: Текущий момент для определения просрочки.
+
+    Returns:
+        dict: {ID корня: Rollup}.
+    """
+    now = now or timezone.now()
+    by_id = {task.id: task for task in tasks}
+    children = {}
+    for task in tasks:
+        if task.parent_task_id in by_id and task.id not in root_ids:
+            children.setdefault(task.parent_task_id, []).append(task)
+
+    # Порядок обхода в ширину от корней; в обратном порядке потомки обрабатываются раньше родителей.
+    order = [by_id[root_id] for root_id in root_ids if root_id in by_id]
+    visited = {task.id for task in order}
+    for task in order:
+        for child in children.get(task.id, []):
+            if child.id not in visited:
+                visited.add(child.id)
+                order.append(child)
+
+    rollups = {}
+    for task in reversed(order):
+        rollup = rollups.setdefault(task.id, Rollup())
+        if task.id in root_ids:
+            continue
+        parent = by_id[task.parent_task_id]
+        own = Rollup()
+        own.total = 1
+        own.completed = int(task.status == "completed")
+        own.late_deadlines = int(task.deadline > parent.deadline)
+        if task.status in ACTIVE_STATUSES and parent.status in ACTIVE_STATUSES:
+            if task.deadline <= now:
+                own.overdue_under_active = 1
+            else:
+                own.expires_at = task.deadline
+        own.merge(rollup)
+        rollups.setdefault(parent.id, Rollup()).merge(own)
+    return {root_id: rollups[root_id] for root_id in root_ids if root_id in rollups}
+
+
+def get_rollups(root_ids):
+    """
+    Получить сводки для корневых задач, используя кэш по каждому корню.
+
+    Отсутствующие в кэше или устаревшие по сроку сводки пересчитываются по поддеревьям,
+    загруженным одним запросом.
+
+    Returns:
+        dict: {ID корня: Rollup} для найденных задач.
+    """
+    now = timezone.now()
+    cache = get_cache()
+    cached = cache.get_many([rollup_cache_key(root_id) for root_id in root_ids])
+    result = {}
+    for root_id in root_ids:
+        data = cached.get(rollup_cache_key(root_id))
+        if data is not None and (data["expires_at"] is None or data["expires_at"] > now):
+            result[root_id] = Rollup.from_dict(data)
+
+    missing = [root_id for root_id in root_ids if root_id not in result]
+    if missing:
+        tasks = get_forest(missing, fields=("id", "parent_task_id", "status", "deadline"))
+        computed = compute_rollups(tasks, set(missing), now)
+        cache.set_many(
+            {rollup_cache_key(root_id): rollup.as_dict() for root_id, rollup in computed.items()},
+            ROLLUP_CACHE_TIMEOUT,
+        )
+        result.update(computed)
+    return result
+
+
+def invalidate_rollups(task_ids, using=None):
+    """
+    Сбросить кэшированные сводки деревьев, в которые входят указанные задачи.
+
+    Сводки сбрасываются сразу и повторно после фиксации транзакции, как и версия данных
+    (см. `tracker.caching.bump_data_version`): иначе параллельный запрос, прочитавший деревья
+    до фиксации, сохранил бы устаревшие сводки на ROLLUP_CACHE_TIMEOUT секунд.
+    """
+    using = using or router.db_for_write(Task)
+    keys = [rollup_cache_key(root_id) for root_id in get_roots(task_ids, using)]
+    if keys:
+        get_cache().delete_many(keys)
+        transaction.on_commit(lambda: get_cache().delete_many(keys), using=using)
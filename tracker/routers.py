@@ -0,0 +1,117 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+PRIMARY = DEFAULT_DB_ALIAS
+# Приложения, модели которых читаются с реплик. Остальные модели, в том числе таблица DatabaseCache
+# с версией данных и закэшированными ответами, читаются из основной базы: на отстающей реплике
+# версия данных была бы устаревшей или отсутствовала сразу после записи.
+REPLICA_APPS = {"tracker"}
+
+
+class RoutingState:
+    """Состояние маршрутизации запросов к базе данных в рамках одного HTTP-запроса."""
+
+    __slots__ = ("pinned", "used_replica")
+
+    def __init__(self, pinned):
+        self.pinned = pinned
+        self.used_replica = False
+
+
+_routing = ContextVar("tracker_db_routing", default=None)
+# {псевдоним реплики: (доступна ли, момент следующей проверки)}.
+_health = {}
+
+
+@contextmanager
+def routing_context(pinned):
+    """
+    Разрешить чтение с реплик на время обработки HTTP-запроса.
+
+    Args:
+        pinned: Направлять все запросы в основную базу (изменяющий запрос или окно после записи).
+    """
+    token = _routing.set(RoutingState(pinned))
+    try:
+        yield
+    finally:
+        _routing.reset(token)
+
+
+def reads_primary_only():
+    """Должен ли текущий HTTP-запрос читать только из основной базы, хотя реплики настроены."""
+    state = _routing.get()
+    return state is not None and state.pinned and bool(get_replicas())
+
+
+def used_replica():
+    """Читал ли текущий HTTP-запрос данные с реплики."""
+    state = _routing.get()
+    return state is not None and state.used_replica
+
+
+def get_replicas():
+    return getattr(settings, "TRACKER_DB_REPLICAS", [])
+
+
+def is_healthy(alias):
+    """
+    Проверить доступность реплики.
+
+    Результат проверки запоминается на TRACKER_DB_HEALTH_CHECK_INTERVAL секунд, поэтому
+    недоступная реплика не замедляет каждый запрос попыткой подключения.
+    """
+    now = time.monotonic()
+    state = _health.get(alias)
+    if state is not None and now < state[1]:
+        return state[0]
+    try:
+        connections[alias].ensure_connection()
+        healthy = True
+    except DatabaseError:
+        healthy = False
+    _health[alias] = (healthy, now + getattr(settings, "TRACKER_DB_HEALTH_CHECK_INTERVAL", 10))
+    return healthy
+
+
+def reset_health():
+    _health.clear()
+
+
+class PrimaryReplicaRouter:
+    """
+    Маршрутизатор «основная база — реплики для чтения».
+
+    Запись всегда выполняется в основную базу. Чтение направляется на случайную доступную реплику
+    из TRACKER_DB_REPLICAS, только если HTTP-запрос безопасный и клиент не писал данные в течение
+    окна TRACKER_DB_PIN_SECONDS (см. `ReplicaPinningMiddleware`). Чтение вне HTTP-запросов
+    (команды управления, фоновые задачи) и чтение моделей вне REPLICA_APPS идет в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+
+        state = _routing.get()
+        if state is None or state.pinned or model._meta.app_label not in REPLICA_APPS:
+            return PRIMARY
+        replicas = [alias for alias in get_replicas() if is_healthy(alias)]
+        if not replicas:
+            return PRIMARY
+        state.used_replica = True
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {PRIMARY, *get_replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
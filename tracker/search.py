@@ -0,0 +1,261 @@
+import re
+import threading
+from collections import Counter, defaultdict
+
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections, router
+from django.db.models import Case, F, Lookup, Q, Value, When
+from django.utils import timezone
+
+from .caching import get_data_version
+from .models import Employee, Task, Tombstone
+from .sync import get_settle_window
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+SEARCH_MODES = ("fuzzy", "prefix")
+# Порог сходства, как word_similarity_threshold в pg_trgm по умолчанию.
+SIMILARITY_THRESHOLD = 0.6
+
+# Область поиска: модель, поле поиска и поля результата.
+TARGETS = {
+    "employees": (Employee, "full_name", ("id", "full_name", "position")),
+    "tasks": (Task, "name", ("id", "name", "status")),
+}
+
+_WORD = re.compile(r"\w+")
+
+
+class ILike(Lookup):
+    """
+    Условие `ILIKE` PostgreSQL.
+
+    Встроенные `__istartswith`/`__icontains` компилируются в `UPPER(поле::text) LIKE UPPER(...)`, и индекс
+    `gin_trgm_ops` по самому столбцу такое выражение не обслуживает; `ILIKE` по столбцу — обслуживает.
+    """
+
+    lookup_name = "ilike"
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} ILIKE {rhs}", [*lhs_params, *rhs_params]
+
+
+def like_escape(text):
+    """Экранировать спецсимволы шаблона LIKE (экранирующий символ по умолчанию — обратная косая черта)."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def normalize(text):
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def trigrams(text):
+    """
+    Получить триграммы текста так же, как pg_trgm.
+
+    Текст разбивается на слова, каждое слово дополняется двумя пробелами в начале и одним в конце.
+    """
+    result = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        result.update(padded[index:index + 3] for index in range(len(padded) - 2))
+    return result
+
+
+def prefix_trigrams(prefix):
+    """Триграммы, которые обязательно есть у слова, начинающегося с `prefix` (без завершающего пробела)."""
+    padded = f"  {prefix.lower()}"
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class NgramIndex:
+    """
+    Инвертированный индекс триграмм в памяти процесса.
+
+    Используется для поиска на базах данных без pg_trgm. Кандидаты выбираются по спискам задач
+    для триграмм запроса, поэтому поиск не просматривает все строки. Оценка сходства — доля
+    триграмм запроса, найденных в тексте (приближение word_similarity из pg_trgm).
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(set)
+        self.grams = {}
+        self.texts = {}
+
+    def __len__(self):
+        return len(self.texts)
+
+    def add(self, object_id, text):
+        self.remove(object_id)
+        grams = trigrams(text)
+        self.grams[object_id] = grams
+        self.texts[object_id] = normalize(text)
+        for gram in grams:
+            self.postings[gram].add(object_id)
+
+    def remove(self, object_id):
+        for gram in self.grams.pop(object_id, ()):
+            ids = self.postings[gram]
+            ids.discard(object_id)
+            if not ids:
+                del self.postings[gram]
+        self.texts.pop(object_id, None)
+
+    def search(self, query, limit, mode="fuzzy"):
+        """
+        Найти объекты по запросу.
+
+        Returns:
+            list: Пары (ID, оценка) по убыванию оценки, при равенстве — по ID.
+        """
+        if mode == "prefix":
+            return self._search_prefix(normalize(query), limit)
+
+        grams = trigrams(query)
+        if not grams:
+            return []
+        counts = Counter()
+        for gram in grams:
+            counts.update(self.postings.get(gram, ()))
+        scored = [
+            (object_id, round(count / len(grams), 4))
+            for object_id, count in counts.items()
+            if count / len(grams) >= SIMILARITY_THRESHOLD
+        ]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def _search_prefix(self, prefix, limit):
+        if not prefix:
+            return []
+        # Кандидаты — пересечение списков по триграммам полных слов запроса и начала последнего слова,
+        # от самого короткого списка.
+        *words, last = prefix.split(" ")
+        grams = trigrams(" ".join(words)) | prefix_trigrams(last)
+        postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        scored = []
+        for object_id in candidates:
+            text = self.texts[object_id]
+            if text.startswith(prefix):
+                scored.append((object_id, 1.0))
+            elif f" {prefix}" in text:
+                scored.append((object_id, 0.5))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+
+class _IndexState:
+    __slots__ = ("index", "version", "watermark", "lock")
+
+    def __init__(self):
+        self.index = NgramIndex()
+        self.version = None
+        self.watermark = None
+        self.lock = threading.Lock()
+
+
+_states = {name: _IndexState() for name in TARGETS}
+
+
+def _refresh(state, target):
+    version = get_data_version()
+    if state.version == version:
+        return
+    model, field, _ = TARGETS[target]
+    started = timezone.now()
+    rows = model.objects.all()
+    tombstones = Tombstone.objects.none()
+    if state.watermark is not None:
+        since = state.watermark - get_settle_window()
+        rows = rows.filter(updated_at__gte=since)
+        tombstones = Tombstone.objects.filter(model=model._meta.model_name, deleted_at__gte=since)
+    for object_id, text in rows.values_list("id", field).iterator(chunk_size=10_000):
+        state.index.add(object_id, text)
+    for object_id in tombstones.values_list("object_id", flat=True):
+        state.index.remove(object_id)
+    state.watermark = started
+    state.version = version
+
+
+def ngram_search(target, query, limit, mode="fuzzy"):
+    """
+    Найти объекты по индексу триграмм в памяти процесса.
+
+    Индекс строится при первом обращении и обновляется, когда меняется версия данных (см. `tracker.caching`):
+    перечитываются только строки, измененные после предыдущего обновления (по индексу `(updated_at, id)`),
+    и удаляются объекты из надгробий. Чтение начинается на окно TRACKER_SYNC_SETTLE_SECONDS раньше,
+    чтобы не пропустить строки транзакций, зафиксированных позже.
+
+    Returns:
+        list: Пары (ID, оценка) по убыванию оценки.
+    """
+    state = _states[target]
+    with state.lock:
+        _refresh(state, target)
+        return state.index.search(query, limit, mode)
+
+
+def reset_ngram_indexes():
+    for name in TARGETS:
+        _states[name] = _IndexState()
+
+
+def _search_postgresql(queryset, field, query, mode):
+    """
+    Поиск по GIN-индексу триграмм pg_trgm.
+
+    Нечеткий поиск — оператор `<%` (word_similarity), поиск по префиксу — ILIKE по началу
+    текста или слова; оба условия обслуживаются индексом `gin_trgm_ops`.
+    """
+    score = TrigramWordSimilarity(query, field)
+    if mode == "prefix":
+        pattern = like_escape(query)
+        leading = ILike(F(field), Value(f"{pattern}%"))
+        return (
+            queryset.filter(Q(leading) | Q(ILike(F(field), Value(f"% {pattern}%"))))
+            .annotate(
+                score=Case(
+                    When(leading, then=Value(1.0)),
+                    default=Value(0.5),
+                ),
+                rank=score,
+            )
+            .order_by("-score", "-rank", "id")
+        )
+    return (
+        queryset.filter(TrigramWordSimilar(F(field), Value(query)))
+        .annotate(score=score)
+        .order_by("-score", "id")
+    )
+
+
+def search(target, query, limit=SEARCH_DEFAULT_LIMIT, mode="fuzzy"):
+    """
+    Найти сотрудников или задачи по имени.
+
+    На PostgreSQL поиск выполняется запросом по триграммному индексу, на других базах —
+    по индексу триграмм в памяти процесса с дочиткой найденных строк одним запросом.
+
+    Args:
+        target: "employees" или "tasks".
+        query: Строка поиска.
+        mode: "fuzzy" — с опечатками и по подстроке, "prefix" — по началу слова (автодополнение).
+
+    Returns:
+        list: Словари полей результата с оценкой `score` по убыванию релевантности.
+    """
+    model, field, fields = TARGETS[target]
+    using = router.db_for_read(model)
+    queryset = model.objects.using(using)
+    if connections[using].vendor == "postgresql":
+        rows = _search_postgresql(queryset, field, query, mode).values(*fields, "score")[:limit]
+        return [{**row, "score": round(row["score"], 4)} for row in rows]
+
+    scored = ngram_search(target, query, limit, mode)
+    rows = {row["id"]: row for row in queryset.filter(pk__in=[object_id for object_id, _ in scored]).values(*fields)}
+    return [{**rows[object_id], "score": score} for object_id, score in scored if object_id in rows]
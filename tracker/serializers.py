@@ -1,7 +1,8 @@
 from django.utils import timezone
 from rest_framework import serializers
 
-from .models import Employee, Task
+from .hierarchy import find_cycles
+from .models import CYCLE_ERROR_MESSAGE, ArchivedTask, Employee, Task
 
 
 class EmployeeSerializer(serializers.ModelSerializer):
@@ -23,4 +24,59 @@ class TaskSerializer(serializers.ModelSerializer):
     def validate(self, data):
         if "id" in self.initial_data and data.get("parent_task") and self.initial_data["id"] == data["parent_task"].id:
             raise serializers.ValidationError("Задача не может быть своим собственным родителем.")
+        if self.instance is not None and data.get("parent_task"):
+            if find_cycles({self.instance.pk: data["parent_task"].pk}):
+                raise serializers.ValidationError({"parent_task": CYCLE_ERROR_MESSAGE})
         return data
+
+
+class EmployeeBulkSerializer(EmployeeSerializer):
+    """Сериализатор сотрудника для массовых операций: при обновлении `id` передается в каждом элементе."""
+
+    id = serializers.IntegerField(required=False)
+
+    def validate(self, data):
+        if self.partial and "id" not in data:
+            raise serializers.ValidationError({"id": "Обязательное поле."})
+        return data
+
+
+class TaskBulkSerializer(TaskSerializer):
+    """
+    Сериализатор задачи для массовых операций.
+
+    Связи принимаются как идентификаторы без обращения к базе данных: их существование
+    проверяется одним запросом на всю пачку в `TaskViewSet.check_bulk_items`.
+    """
+
+    id = serializers.IntegerField(required=False)
+    parent_task = serializers.IntegerField(source="parent_task_id", required=False, allow_null=True)
+    assignee = serializers.IntegerField(source="assignee_id", required=False, allow_null=True)
+
+    def validate(self, data):
+        if self.partial and "id" not in data:
+            raise serializers.ValidationError({"id": "Обязательное поле."})
+        return data
+
+
+class TaskTreeSerializer(TaskSerializer):
+    depth = serializers.IntegerField(read_only=True)
+
+    class Meta(TaskSerializer.Meta):
+        fields = TaskSerializer.Meta.fields + ["depth"]
+
+
+class EmployeeSyncSerializer(EmployeeSerializer):
+    class Meta(EmployeeSerializer.Meta):
+        fields = EmployeeSerializer.Meta.fields + ["updated_at"]
+
+
+class TaskSyncSerializer(TaskSerializer):
+    class Meta(TaskSerializer.Meta):
+        fields = TaskSerializer.Meta.fields + ["updated_at"]
+
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedTask
+        fields = TaskSerializer.Meta.fields + ["archived_at"]
@@ -0,0 +1,123 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Employee, Task, Tombstone
+from .pagination import KeysetPagination
+
+SYNC_DEFAULT_LIMIT = 500
+SYNC_MAX_LIMIT = 1000
+INVALID_CURSOR_MESSAGE = "Некорректный курсор синхронизации."
+
+# Потоки изменений: ключ в курсоре, выборка и поле времени, по которому идет курсор.
+STREAMS = {
+    "tasks": ("t", lambda: Task.objects.all(), "updated_at"),
+    "employees": ("e", lambda: Employee.objects.all(), "updated_at"),
+    "deleted": ("d", lambda: Tombstone.objects.all(), "deleted_at"),
+}
+
+
+def get_settle_window():
+    return timedelta(seconds=getattr(settings, "TRACKER_SYNC_SETTLE_SECONDS", 5))
+
+
+def encode_cursor(positions):
+    # Время сохраняется через isoformat(): DjangoJSONEncoder отбрасывает микросекунды, и курсор
+    # оказался бы раньше последней выданной записи.
+    data = {
+        STREAMS[name][0]: [position[0].isoformat(), position[1]]
+        for name, position in positions.items()
+        if position is not None
+    }
+    return urlsafe_b64encode(json.dumps(data).encode("ascii")).decode("ascii")
+
+
+def decode_cursor(encoded):
+    """
+    Разобрать курсор синхронизации.
+
+    Returns:
+        dict: {имя потока: [время, ID] или None}.
+
+    Raises:
+        ValueError: Если курсор поврежден.
+    """
+    try:
+        data = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+    except (TypeError, ValueError, UnicodeEncodeError):
+        raise ValueError(INVALID_CURSOR_MESSAGE)
+    if not isinstance(data, dict):
+        raise ValueError(INVALID_CURSOR_MESSAGE)
+
+    positions = {}
+    for name, (key, _, _) in STREAMS.items():
+        position = data.get(key)
+        if position is None:
+            positions[name] = None
+            continue
+        if not isinstance(position, list) or len(position) != 2 or not isinstance(position[1], int):
+            raise ValueError(INVALID_CURSOR_MESSAGE)
+        moment = parse_datetime(position[0]) if isinstance(position[0], str) else None
+        if moment is None:
+            raise ValueError(INVALID_CURSOR_MESSAGE)
+        positions[name] = [moment, position[1]]
+    return positions
+
+
+def get_changes(since=None, limit=SYNC_DEFAULT_LIMIT):
+    """
+    Получить изменения сотрудников и задач после курсора.
+
+    Каждый поток (задачи, сотрудники, надгробия удаленных объектов) читается одним
+    запросом по индексу (время изменения, id) от позиции курсора, поэтому стоимость
+    синхронизации зависит от объема изменений, а не от размера таблиц.
+
+    Верхняя граница чтения отстает от текущего времени на окно TRACKER_SYNC_SETTLE_SECONDS:
+    время изменения присваивается до фиксации транзакции, и запись, зафиксированная позже
+    более новой, иначе могла бы оказаться позади курсора клиента.
+
+    Args:
+        since: Курсор из предыдущего ответа или None для полной начальной выгрузки.
+        limit: Максимальное количество записей каждого потока в ответе.
+
+    Returns:
+        dict: Изменившиеся задачи и сотрудники, удаленные ID, новый курсор и признак `has_more`.
+
+    Raises:
+        ValueError: Если курсор поврежден.
+    """
+    positions = decode_cursor(since) if since else dict.fromkeys(STREAMS)
+    upper = timezone.now() - get_settle_window()
+    if not since:
+        # При начальной выгрузке клиенту не нужны удаления, случившиеся до нее.
+        positions["deleted"] = [upper, 0]
+
+    rows = {}
+    has_more = False
+    for name, (_, get_queryset, time_field) in STREAMS.items():
+        ordering = (time_field, "id")
+        queryset = get_queryset().filter(**{f"{time_field}__lte": upper}).order_by(*ordering)
+        if positions[name] is not None:
+            queryset = queryset.filter(KeysetPagination._after(ordering, positions[name]))
+        page = list(queryset[: limit + 1])
+        if len(page) > limit:
+            has_more = True
+            page = page[:limit]
+        if page:
+            positions[name] = [getattr(page[-1], time_field), page[-1].id]
+        rows[name] = page
+
+    deleted = {"tasks": [], "employees": []}
+    for tombstone in rows["deleted"]:
+        deleted[f"{tombstone.model}s"].append(tombstone.object_id)
+    return {
+        "tasks": rows["tasks"],
+        "employees": rows["employees"],
+        "deleted": deleted,
+        "cursor": encode_cursor(positions),
+        "has_more": has_more,
+    }
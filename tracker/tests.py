@@ -1,13 +1,66 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
 from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+from unittest.mock import patch
 
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.db import DatabaseCache
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection, connections, router
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
+from django.utils.http import parse_http_date
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
 
-from .models import Employee, Task
+from . import archive
+from .benchmarks import DEFAULT_SIZES, ENDPOINTS, check_results, load_baseline, run_benchmarks
+from .caching import get_cache, reset_cache_stats
+from .coalescing import LOCK_PREFIX, RESULT_PREFIX, SingleFlight, compute_across_processes
+from .dashboard import get_dashboard
+from .datasets import STATUS_WEIGHTS, seed_dataset
+from .deadlines import scan_deadlines
+from .fastpath import get_value_columns, iter_value_rows
+from .filters import TaskFilterBackend
+from .hierarchy import find_cycles, get_ancestors
+from .importer import ImportCheckpoint
+from .jobs import JOB_HANDLERS, claim_jobs, enqueue, release_stale_jobs, run_worker
+from .metrics import HISTOGRAMS
+from .middleware import ReplicaPinningMiddleware
+from .models import (
+    ArchivedTask,
+    DeadlineAlert,
+    DeadlineScanState,
+    Employee,
+    EmployeeWorkloadRollup,
+    ImportState,
+    Job,
+    PrecomputedResult,
+    StatusRollup,
+    StatusTransition,
+    Task,
+    Tombstone,
+)
+from .pagination import KeysetPagination
+from .recommendations import REASON_LEAST_BUSY, REASON_SUBTASK_ASSIGNEE, build_assignment_plan, recommend_assignees
+from .rollups import rollup_cache_key
+from .routers import reset_health, routing_context, used_replica
+from .search import NgramIndex, _search_postgresql, reset_ngram_indexes
 from .serializers import EmployeeSerializer, TaskSerializer
+from .workload import take_snapshot
 
 
 class EmployeeModelTest(TestCase):
@@ -114,7 +167,7 @@ class EmployeeAPITest(APITestCase):
     def test_employee_list(self):
         response = self.client.get("/api/employees/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_create_employee(self):
         data = {"full_name": "Петр Петров", "position": "Тестировщик"}
@@ -148,7 +201,7 @@ class TaskAPITest(APITestCase):
     def test_task_list(self):
         response = self.client.get("/api/tasks/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_create_task(self):
         data = {
@@ -207,3 +260,1791 @@ class TaskAPITest(APITestCase):
         found = any(task["Важная задача"] == parent_task.name for task in response.data)
 
         self.assertTrue(found, "Родительская задача не найдена в списке важных задач")
+
+
+class ImportantTasksRecommendationTest(APITestCase):
+    def setUp(self):
+        self.deadline = timezone.now() + timedelta(days=5)
+        self.busy = Employee.objects.create(full_name="Занятой Сотрудник", position="Разработчик")
+        self.free = Employee.objects.create(full_name="Свободный Сотрудник", position="Разработчик")
+        for i in range(4):
+            Task.objects.create(name=f"Нагрузка {i}", assignee=self.busy, deadline=self.deadline, status="in_progress")
+
+    def create_important_task(self, name, subtask_assignee):
+        parent = Task.objects.create(name=name, deadline=self.deadline, status="not_started")
+        Task.objects.create(
+            name=f"{name} подзадача",
+            assignee=subtask_assignee,
+            deadline=self.deadline,
+            status="in_progress",
+            parent_task=parent,
+        )
+        return parent
+
+    def test_subtask_assignee_within_tolerance(self):
+        parent = self.create_important_task("Родительская задача", self.free)
+        response = self.client.get("/api/tasks/important_tasks/")
+        item = next(t for t in response.data if t["ID задачи"] == parent.id)
+        self.assertEqual(item["ID предлагаемого сотрудника"], self.free.id)
+        self.assertEqual(item["Причина предложения"], "Сотрудник подзадачи не сильно загружен")
+
+    def test_least_busy_when_subtask_assignee_overloaded(self):
+        parent = self.create_important_task("Родительская задача", self.busy)
+        response = self.client.get("/api/tasks/important_tasks/")
+        item = next(t for t in response.data if t["ID задачи"] == parent.id)
+        self.assertEqual(item["ID предлагаемого сотрудника"], self.free.id)
+        self.assertEqual(item["Причина предложения"], "Случайный наименее загруженный сотрудник")
+
+    def test_unassigned_subtask_falls_back_to_least_busy(self):
+        parent = self.create_important_task("Родительская задача", None)
+        response = self.client.get("/api/tasks/important_tasks/")
+        item = next(t for t in response.data if t["ID задачи"] == parent.id)
+        self.assertEqual(item["ID предлагаемого сотрудника"], self.free.id)
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        for i in range(10):
+            self.create_important_task(f"Задача {i}", self.free if i % 2 else self.busy)
+        # Отпечатки задач и сотрудников для ETag, снимок загруженности, важные задачи и их подзадачи.
+        with self.assertNumQueries(5):
+            response = self.client.get("/api/tasks/important_tasks/")
+        self.assertEqual(len(response.data), 10)
+
+
+class ActiveTasksCounterTest(TestCase):
+    def setUp(self):
+        self.first = Employee.objects.create(full_name="Первый Сотрудник", position="Разработчик")
+        self.second = Employee.objects.create(full_name="Второй Сотрудник", position="Разработчик")
+        self.deadline = timezone.now() + timedelta(days=1)
+
+    def assertCounts(self, first, second):
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual((self.first.active_tasks_count, self.second.active_tasks_count), (first, second))
+
+    def test_save_path(self):
+        task = Task.objects.create(name="Задача", assignee=self.first, deadline=self.deadline)
+        self.assertCounts(1, 0)
+
+        task.assignee = self.second
+        task.save()
+        self.assertCounts(0, 1)
+
+        task.status = "completed"
+        task.save()
+        self.assertCounts(0, 0)
+
+        task.status = "in_progress"
+        task.save()
+        self.assertCounts(0, 1)
+
+        task.delete()
+        self.assertCounts(0, 0)
+
+    def test_queryset_bulk_operations(self):
+        Task.objects.bulk_create(
+            [Task(name=f"Задача {i}", assignee=self.first, deadline=self.deadline) for i in range(3)]
+        )
+        self.assertCounts(3, 0)
+
+        Task.objects.filter(name="Задача 0").update(assignee=self.second)
+        self.assertCounts(2, 1)
+
+        tasks = list(Task.objects.filter(assignee=self.first))
+        for task in tasks:
+            task.status = "completed"
+        Task.objects.bulk_update(tasks, ["status"])
+        self.assertCounts(0, 1)
+
+        Task.objects.all().delete()
+        self.assertCounts(0, 0)
+
+    def test_stale_instance_after_queryset_update(self):
+        task = Task.objects.create(name="Задача", assignee=self.first, deadline=self.deadline)
+        Task.objects.filter(pk=task.pk).update(status="completed")
+        task.assignee = self.second
+        task.save()
+        self.assertCounts(0, 1)
+        Task.objects.filter(pk=task.pk).update(status="completed")
+        task.delete()
+        self.assertCounts(0, 0)
+
+    def test_employee_save_keeps_counter(self):
+        stale = Employee.objects.get(pk=self.first.pk)
+        Task.objects.create(name="Задача", assignee=self.first, deadline=self.deadline)
+        stale.position = "Старший разработчик"
+        stale.save()
+        self.assertCounts(1, 0)
+
+    def test_save_with_update_fields_counts_only_written_fields(self):
+        task = Task.objects.create(name="Задача", assignee=self.first, deadline=self.deadline, status="in_progress")
+        task.status = "completed"
+        task.assignee = self.second
+        task.name = "Переименована"
+        task.save(update_fields=["name"])
+        self.assertCounts(1, 0)
+        self.assertFalse(StatusTransition.objects.exists())
+
+        task.save(update_fields=["assignee_id"])
+        self.assertCounts(0, 1)
+        task.save(update_fields=["status"])
+        self.assertCounts(0, 0)
+        self.assertEqual(list(StatusTransition.objects.values_list("to_status", flat=True)), ["completed"])
+
+    def test_counter_updates_keep_employee_unchanged(self):
+        updated_at = self.first.updated_at
+        response = self.client.get("/api/employees/busy_employees/")
+        etag = response["ETag"]
+
+        task = Task.objects.create(name="Задача", assignee=self.first, deadline=self.deadline)
+        task.status = "completed"
+        task.save()
+        Task.objects.filter(pk=task.pk).update(status="in_progress")
+        self.assertCounts(1, 0)
+        self.assertEqual(self.first.updated_at, updated_at)
+        # Ответ со счетчиками меняет ETag вместе с задачами.
+        response = self.client.get("/api/employees/busy_employees/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["Количество активных задач"], 1)
+
+    def test_recount_command(self):
+        Task.objects.create(name="Задача", assignee=self.first, deadline=self.deadline)
+        Employee.objects.filter(pk=self.first.pk).update(active_tasks_count=5)
+
+        with self.assertRaises(CommandError):
+            call_command("recount_active_tasks", "--check", stdout=StringIO())
+
+        call_command("recount_active_tasks", stdout=StringIO())
+        self.assertCounts(1, 0)
+        call_command("recount_active_tasks", "--check", stdout=StringIO())
+
+
+class KeysetPaginationTest(APITestCase):
+    def setUp(self):
+        deadline = timezone.now() + timedelta(days=1)
+        self.employees = [Employee.objects.create(full_name=f"Сотрудник {i}", position="Разработчик") for i in range(5)]
+        Task.objects.bulk_create(
+            [Task(name=f"Задача {i}", assignee=self.employees[i % 3], deadline=deadline) for i in range(25)]
+        )
+
+    def collect(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(item.get("id", item.get("ID")) for item in response.data["results"])
+            url = response.data["next"]
+        return ids
+
+    def test_task_pages_cover_table_in_id_order(self):
+        ids = self.collect("/api/tasks/?page_size=10")
+        self.assertEqual(ids, list(Task.objects.order_by("id").values_list("id", flat=True)))
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get("/api/tasks/?page_size=10")
+        second = self.client.get(first.data["next"])
+        previous = self.client.get(second.data["previous"])
+        self.assertEqual(previous.data["results"], first.data["results"])
+        self.assertIsNotNone(previous.data["next"])
+
+    def test_busy_employees_pages_by_workload(self):
+        ids = self.collect("/api/employees/busy_employees/?page_size=2")
+        expected = Employee.objects.order_by("-active_tasks_count", "-id").values_list("id", flat=True)
+        self.assertEqual(ids, list(expected))
+
+    def test_deep_page_query_count(self):
+        response = self.client.get("/api/tasks/?page_size=5")
+        for _ in range(3):
+            response = self.client.get(response.data["next"])
+        # Отпечаток выборки для ETag и сама страница.
+        with self.assertNumQueries(2):
+            self.client.get(response.data["next"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/tasks/?cursor=bad")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def set_microsecond_times(self):
+        base = timezone.now().replace(microsecond=0) + timedelta(days=2)
+        # Пары задач отличаются сроком и временем изменения меньше чем на миллисекунду.
+        for index, task in enumerate(Task.objects.order_by("id")[:6]):
+            moment = base + timedelta(seconds=index // 2, microseconds=100 + index % 2 * 200)
+            Task.objects.filter(pk=task.pk).update(deadline=moment, updated_at=moment)
+        return list(Task.objects.order_by("deadline", "id").values_list("id", flat=True))
+
+    def test_deadline_pages_keep_microseconds(self):
+        expected = self.set_microsecond_times()
+        Task.objects.exclude(pk__in=expected[:6]).delete()
+        self.assertEqual(self.collect("/api/tasks/?ordering=deadline&page_size=2"), expected[:6])
+        self.assertEqual(self.collect("/api/tasks/?ordering=-deadline&page_size=2"), expected[:6][::-1])
+
+        last = self.client.get("/api/tasks/?ordering=deadline&page_size=2")
+        while last.data["next"]:
+            last = self.client.get(last.data["next"])
+        previous = self.client.get(last.data["previous"])
+        self.assertEqual([task["id"] for task in previous.data["results"]], expected[2:4])
+
+    def test_updated_at_pages_keep_microseconds(self):
+        self.set_microsecond_times()
+        queryset = Task.objects.order_by("updated_at", "id")
+        expected = list(queryset.values_list("id", flat=True))
+        for ordering, ids in ((queryset, expected), (queryset.order_by("-updated_at", "-id"), expected[::-1])):
+            paginator = KeysetPagination()
+            url, collected = "/api/tasks/?page_size=4", []
+            while url:
+                page = paginator.paginate_queryset(ordering, Request(APIRequestFactory().get(url)))
+                collected.extend(task.id for task in page)
+                url = paginator.get_next_link()
+            self.assertEqual(collected, ids)
+
+
+class TaskFilterTest(APITestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.employee = Employee.objects.create(full_name="Игорь Смирнов", position="Разработчик")
+        self.parent = Task.objects.create(name="Родитель", deadline=self.now + timedelta(days=10))
+        self.soon = Task.objects.create(
+            name="Скоро",
+            assignee=self.employee,
+            deadline=self.now + timedelta(days=1),
+            status="in_progress",
+            parent_task=self.parent,
+        )
+        self.later = Task.objects.create(
+            name="Позже", assignee=self.employee, deadline=self.now + timedelta(days=5), status="completed"
+        )
+
+    def get_ids(self, query):
+        response = self.client.get(f"/api/tasks/?{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task["id"] for task in response.data["results"]]
+
+    def test_filters(self):
+        self.assertEqual(self.get_ids("status=in_progress,completed"), [self.later.id, self.soon.id])
+        self.assertEqual(self.get_ids(f"assignee={self.employee.id}&status=completed"), [self.later.id])
+        self.assertEqual(self.get_ids("assignee=null"), [self.parent.id])
+        self.assertEqual(self.get_ids(f"parent_task={self.parent.id}"), [self.soon.id])
+        self.assertEqual(self.get_ids("top_level=true"), [self.parent.id, self.later.id])
+
+    def test_deadline_range_ordered_by_deadline(self):
+        after = (self.now + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S")
+        before = (self.now + timedelta(days=7)).strftime("%Y-%m-%dT%H:%M:%S")
+        self.assertEqual(
+            self.get_ids(f"deadline_after={after}&deadline_before={before}"), [self.soon.id, self.later.id]
+        )
+
+    def test_default_ordering_follows_index(self):
+        # Без явной сортировки выборка по исполнителю и по статусу упорядочена по статусу.
+        self.assertEqual(self.get_ids(f"assignee={self.employee.id}"), [self.later.id, self.soon.id])
+        self.assertEqual(
+            self.get_ids("status=completed,in_progress,not_started"), [self.later.id, self.soon.id, self.parent.id]
+        )
+
+    def test_ordering(self):
+        self.assertEqual(self.get_ids("ordering=-deadline"), [self.parent.id, self.later.id, self.soon.id])
+
+    def test_invalid_parameters(self):
+        for query in ("status=unknown", "assignee=abc", "deadline_after=tomorrow", "ordering=name"):
+            response = self.client.get(f"/api/tasks/?{query}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+
+class TaskFilterQueryPlanTest(TestCase):
+    """Каждая поддерживаемая комбинация фильтров должна обслуживаться предназначенным для нее индексом."""
+
+    # Запрос и столбцы индекса, условием по которому должна выбираться выборка.
+    queries = [
+        ("status=not_started", ("status", "deadline")),
+        ("status=in_progress&deadline_after=2030-01-01T00:00:00", ("status", "deadline")),
+        ("status=completed&ordering=deadline", ("status", "deadline")),
+        ("assignee=1", ("assignee_id", "status")),
+        ("assignee=1&status=in_progress", ("assignee_id", "status")),
+        ("assignee=null", ("assignee_id", "status")),
+        ("parent_task=1", ("parent_task_id",)),
+        ("top_level=true", ("parent_task_id",)),
+        ("deadline_before=2030-01-01T00:00:00", ("deadline",)),
+        ("deadline_after=2030-01-01T00:00:00&deadline_before=2031-01-01T00:00:00", ("deadline",)),
+    ]
+
+    def explain(self, model, query):
+        request = Request(APIRequestFactory().get(f"/api/tasks/?{query}"))
+        queryset = TaskFilterBackend().filter_queryset(request, model.objects.all(), None)
+        return queryset.order_by(*(queryset.query.order_by or ["id"]))[:100].explain()
+
+    def get_index_names(self, model):
+        """Имена индексов таблицы по наборам их столбцов."""
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+        return {
+            tuple(info["columns"]): name
+            for name, info in constraints.items()
+            if info["index"] and not info["primary_key"] and not info["unique"]
+        }
+
+    def test_filters_use_indexes(self):
+        if connection.vendor == "postgresql":
+            # На почти пустых таблицах планировщик иначе выбрал бы полный просмотр.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        # Архив фильтруется тем же фильтром, что и основная таблица задач.
+        for model in (Task, ArchivedTask):
+            index_names = self.get_index_names(model)
+            for query, columns in self.queries:
+                plan = self.explain(model, query)
+                index = re.escape(index_names[columns])
+                with self.subTest(model=model.__name__, query=query):
+                    if connection.vendor == "postgresql":
+                        self.assertRegex(plan, rf"(Scan using|Index Scan on) {index} .*\n\s*Index Cond: ")
+                    elif connection.vendor == "sqlite":
+                        table = model._meta.db_table
+                        self.assertRegex(plan, rf"SEARCH {table} USING (COVERING )?INDEX {index} \(")
+
+
+class BulkAPITest(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(full_name="Борис Орлов", position="Разработчик")
+        self.deadline = (timezone.now() + timedelta(days=2)).isoformat()
+
+    def task_payload(self, count, **extra):
+        return [
+            {"name": f"Задача {i}", "deadline": self.deadline, "assignee": self.employee.id, **extra}
+            for i in range(count)
+        ]
+
+    def test_bulk_create_tasks(self):
+        response = self.client.post("/api/tasks/bulk/", self.task_payload(5), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 5)
+        self.assertTrue(all(task["id"] for task in response.data))
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.active_tasks_count, 5)
+
+    def test_bulk_create_query_count_is_constant(self):
+        counts = []
+        for size in (5, 50):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post("/api/tasks/bulk/", self.task_payload(size), format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_bulk_create_reports_errors_per_item(self):
+        payload = self.task_payload(3)
+        payload[1]["assignee"] = 999999
+        payload[2]["deadline"] = (timezone.now() - timedelta(days=1)).isoformat()
+        response = self.client.post("/api/tasks/bulk/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data["errors"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("assignee", errors[1])
+        self.assertIn("deadline", errors[2])
+        self.assertEqual(Task.objects.count(), 0)
+
+    def test_bulk_update_tasks(self):
+        deadline = timezone.now() + timedelta(days=1)
+        tasks = Task.objects.bulk_create(
+            [Task(name=f"Задача {i}", assignee=self.employee, deadline=deadline) for i in range(3)]
+        )
+        payload = [{"id": task.id, "status": "completed"} for task in tasks[:2]]
+        payload.append({"id": tasks[2].id, "parent_task": tasks[2].id})
+        response = self.client.patch("/api/tasks/bulk/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("parent_task", response.data["errors"][2])
+
+        response = self.client.patch("/api/tasks/bulk/", payload[:2], format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Task.objects.filter(status="completed").count(), 2)
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.active_tasks_count, 1)
+
+    def test_bulk_delete_tasks(self):
+        deadline = timezone.now() + timedelta(days=1)
+        tasks = Task.objects.bulk_create(
+            [Task(name=f"Задача {i}", assignee=self.employee, deadline=deadline) for i in range(3)]
+        )
+        response = self.client.delete("/api/tasks/bulk/", [tasks[0].id, 999999], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0], {})
+
+        response = self.client.delete("/api/tasks/bulk/", [tasks[0].id, tasks[1].id], format="json")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(list(Task.objects.values_list("id", flat=True)), [tasks[2].id])
+
+    def test_bulk_employees(self):
+        response = self.client.post(
+            "/api/employees/bulk/", [{"full_name": "Новый Сотрудник", "position": "Аналитик"}], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.patch(
+            "/api/employees/bulk/", [{"id": self.employee.id, "position": "Тимлид"}], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.position, "Тимлид")
+
+    def test_bulk_rejects_non_list(self):
+        response = self.client.post("/api/tasks/bulk/", {"name": "Задача"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskExportTest(APITestCase):
+    def setUp(self):
+        employee = Employee.objects.create(full_name="Вера Павлова", position="Аналитик")
+        deadline = timezone.now() + timedelta(days=1)
+        self.tasks = Task.objects.bulk_create(
+            [Task(name=f"Задача {i}", assignee=employee if i % 2 else None, deadline=deadline) for i in range(5)]
+        )
+        Task.objects.filter(pk=self.tasks[0].pk).update(status="completed")
+
+    def test_ndjson_matches_serializer(self):
+        response = self.client.get("/api/tasks/export/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        expected = TaskSerializer(Task.objects.order_by("id"), many=True).data
+        self.assertEqual(sorted(rows, key=lambda row: row["id"]), [dict(item) for item in expected])
+
+    def test_csv_with_filters(self):
+        response = self.client.get("/api/tasks/export/?export_format=csv&status=completed")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,name,parent_task,assignee,deadline,status,created_at")
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith(f"{self.tasks[0].id},Задача 0,,,"))
+
+    def test_unknown_format(self):
+        response = self.client.get("/api/tasks/export/?export_format=xml")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskHierarchyTest(APITestCase):
+    def setUp(self):
+        deadline = timezone.now() + timedelta(days=1)
+        self.root = Task.objects.create(name="Корень", deadline=deadline)
+        self.child = Task.objects.create(name="Потомок", deadline=deadline, parent_task=self.root)
+        self.sibling = Task.objects.create(name="Сосед", deadline=deadline, parent_task=self.root)
+        self.grandchild = Task.objects.create(name="Внук", deadline=deadline, parent_task=self.child)
+
+    def test_tree_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/tasks/{self.root.id}/tree/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(task["id"], task["depth"]) for task in response.data],
+            [(self.root.id, 0), (self.child.id, 1), (self.grandchild.id, 2), (self.sibling.id, 1)],
+        )
+
+    def test_ancestors_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/tasks/{self.grandchild.id}/ancestors/")
+        self.assertEqual([task["id"] for task in response.data], [self.child.id, self.root.id])
+        self.assertEqual(self.client.get(f"/api/tasks/{self.root.id}/ancestors/").data, [])
+
+    def test_missing_task(self):
+        self.assertEqual(self.client.get("/api/tasks/999999/tree/").status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get("/api/tasks/999999/ancestors/").status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_find_cycles(self):
+        self.assertEqual(find_cycles({self.root.id: self.grandchild.id}), {self.root.id})
+        self.assertEqual(find_cycles({self.grandchild.id: self.sibling.id}), set())
+        swap = {self.child.id: self.sibling.id, self.sibling.id: self.child.id}
+        self.assertEqual(find_cycles(swap), {self.child.id, self.sibling.id})
+
+    def test_reparenting_into_own_subtree_is_rejected(self):
+        self.root.parent_task = self.grandchild
+        with self.assertRaises(ValidationError):
+            self.root.save()
+
+        response = self.client.patch(f"/api/tasks/{self.root.id}/", {"parent_task": self.grandchild.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        payload = [
+            {"id": self.child.id, "parent_task": self.sibling.id},
+            {"id": self.sibling.id, "parent_task": self.child.id},
+        ]
+        response = self.client.patch("/api/tasks/bulk/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("parent_task", response.data["errors"][0])
+
+
+class TaskRollupTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.root = Task.objects.create(name="Корень", deadline=now + timedelta(days=5), status="in_progress")
+        self.child = Task.objects.create(name="Потомок", deadline=now + timedelta(days=3), parent_task=self.root)
+        self.late = Task.objects.create(name="Поздний", deadline=now + timedelta(days=9), parent_task=self.child)
+        self.done = Task.objects.create(
+            name="Готовый", deadline=now + timedelta(days=1), parent_task=self.root, status="completed"
+        )
+        self.other_root = Task.objects.create(name="Второй корень", deadline=now + timedelta(days=5))
+
+    def get_rollup(self, root):
+        response = self.client.get(f"/api/tasks/rollups/?root={root.id}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"][0]
+
+    def test_rollup_values(self):
+        response = self.client.get("/api/tasks/rollups/")
+        by_id = {item["ID задачи"]: item for item in response.data["results"]}
+        self.assertEqual(set(by_id), {self.root.id, self.other_root.id})
+
+        rollup = by_id[self.root.id]
+        self.assertEqual(rollup["Всего подзадач"], 3)
+        self.assertEqual(rollup["Завершено подзадач"], 1)
+        self.assertEqual(rollup["Подзадач со сроком позже родителя"], 1)
+        self.assertEqual(rollup["Просроченных подзадач у активных задач"], 0)
+        self.assertTrue(rollup["Есть риск по срокам"])
+        self.assertIsNone(by_id[self.other_root.id]["Доля завершенных"])
+
+    def test_overdue_subtask_of_active_parent(self):
+        Task.objects.filter(pk=self.child.pk).update(deadline=timezone.now() - timedelta(hours=1))
+        self.assertEqual(self.get_rollup(self.root)["Просроченных подзадач у активных задач"], 1)
+
+    def test_rollup_is_cached_and_invalidated(self):
+        self.get_rollup(self.root)
+        with self.assertNumQueries(1):
+            self.get_rollup(self.root)
+
+        self.late.status = "completed"
+        self.late.save()
+        self.assertEqual(self.get_rollup(self.root)["Завершено подзадач"], 2)
+
+        Task.objects.filter(pk=self.child.pk).update(parent_task=self.other_root)
+        self.assertEqual(self.get_rollup(self.root)["Всего подзадач"], 1)
+        self.assertEqual(self.get_rollup(self.other_root)["Всего подзадач"], 2)
+
+        Task.objects.filter(pk=self.late.pk).delete()
+        self.assertEqual(self.get_rollup(self.other_root)["Всего подзадач"], 1)
+
+    def test_rollup_is_invalidated_again_after_commit(self):
+        key = rollup_cache_key(self.root.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.late.status = "completed"
+            self.late.save()
+            # Параллельный запрос прочитал дерево до фиксации и сохранил устаревшую сводку.
+            get_cache().set(key, {"stale": True})
+        self.assertIsNone(get_cache().get(key))
+
+    def test_save_without_rollup_changes_skips_invalidation(self):
+        self.late.name = "Переименованная"
+        with patch("tracker.models._invalidate_rollups") as invalidate:
+            self.late.save()
+        invalidate.assert_not_called()
+
+        self.late.deadline = timezone.now() + timedelta(days=2)
+        with patch("tracker.models._invalidate_rollups") as invalidate:
+            self.late.save()
+        invalidate.assert_called_once()
+
+
+class ResponseCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        reset_cache_stats()
+        self.employee = Employee.objects.create(full_name="Денис Белов", position="Разработчик")
+        self.parent = Task.objects.create(name="Родитель", deadline=timezone.now() + timedelta(days=3))
+        self.subtask = Task.objects.create(
+            name="Подзадача",
+            assignee=self.employee,
+            deadline=timezone.now() + timedelta(days=2),
+            status="in_progress",
+            parent_task=self.parent,
+        )
+
+    def test_repeated_request_is_served_from_cache(self):
+        first = self.client.get("/api/tasks/important_tasks/")
+        self.assertEqual(first["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/tasks/important_tasks/")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(self.client.get("/api/cache/stats/").data, {"hits": 1, "misses": 1})
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "tracker_cache"}}
+    )
+    def test_database_cache_hit_only_reads(self):
+        call_command("createcachetable", stdout=StringIO())
+        etag = self.client.get("/api/tasks/")["ETag"]
+        for headers in ({}, {"HTTP_IF_NONE_MATCH": etag}):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get("/api/tasks/", **headers)
+            self.assertEqual(response["X-Cache"], "HIT")
+            # Версия данных и сам ответ; ни одной записи в таблицу кэша.
+            self.assertEqual([query["sql"].split()[0] for query in queries], ["SELECT", "SELECT"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_status_change_invalidates_important_tasks(self):
+        self.assertEqual(len(self.client.get("/api/tasks/important_tasks/").data), 1)
+        self.subtask.status = "completed"
+        self.subtask.save()
+        response = self.client.get("/api/tasks/important_tasks/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data, [])
+
+    def test_bulk_update_invalidates_list_and_detail(self):
+        self.client.get("/api/tasks/")
+        self.client.get(f"/api/tasks/{self.parent.id}/")
+        Task.objects.filter(pk=self.parent.pk).update(name="Переименованная")
+        self.assertEqual(self.client.get("/api/tasks/")["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(f"/api/tasks/{self.parent.id}/").data["name"], "Переименованная")
+
+    def test_employee_write_invalidates_busy_employees(self):
+        self.client.get("/api/employees/busy_employees/")
+        Employee.objects.create(full_name="Новый Сотрудник", position="Аналитик")
+        response = self.client.get("/api/employees/busy_employees/")
+        self.assertEqual(len(response.data["results"]), 2)
+
+
+class ConditionalGetTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employee = Employee.objects.create(full_name="Елена Соколова", position="Тестировщик")
+        self.task = Task.objects.create(
+            name="Задача", assignee=self.employee, deadline=timezone.now() + timedelta(days=1)
+        )
+
+    def test_etag_and_not_modified(self):
+        # busy_employees зависит и от задач: счетчики меняются без Employee.updated_at.
+        urls = {"/api/tasks/": 1, f"/api/tasks/{self.task.id}/": 1, "/api/employees/busy_employees/": 2}
+        for url, queries in urls.items():
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response["ETag"].startswith('"'))
+            self.assertIn("Last-Modified", response)
+
+            cache.clear()
+            with self.assertNumQueries(queries):
+                not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+            self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(not_modified["ETag"], response["ETag"])
+
+    def test_cached_response_answers_conditional_request_without_queries(self):
+        response = self.client.get("/api/tasks/")
+        with self.assertNumQueries(0):
+            not_modified = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_changes_after_write(self):
+        etag = self.client.get("/api/tasks/")["ETag"]
+        Task.objects.filter(pk=self.task.pk).update(status="completed")
+        response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        etag = response["ETag"]
+        self.task.delete()
+        self.assertNotEqual(self.client.get("/api/tasks/")["ETag"], etag)
+
+    def test_deletion_moves_last_modified_forward(self):
+        Task.objects.create(name="Вторая", deadline=timezone.now() + timedelta(days=2))
+        response = self.client.get("/api/tasks/")
+        # Надгробия других моделей не влияют на Last-Modified задач.
+        Tombstone.objects.create(model="employee", object_id=0, deleted_at=timezone.now() + timedelta(days=1))
+        self.task.delete()
+        Tombstone.objects.filter(model="task").update(deleted_at=timezone.now() + timedelta(seconds=5))
+
+        cache.clear()
+        modified = self.client.get("/api/tasks/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(modified.data["results"]), 1)
+        self.assertLess(parse_http_date(modified["Last-Modified"]), (timezone.now() + timedelta(hours=1)).timestamp())
+
+    def test_invalid_pk_returns_not_found(self):
+        for url in ("/api/tasks/abc/", "/api/employees/abc/"):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND, url)
+
+
+@override_settings(TRACKER_SYNC_SETTLE_SECONDS=0)
+class DeltaSyncTest(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(full_name="Петр Иванов", position="Разработчик")
+        self.parent = Task.objects.create(name="Родитель", deadline=timezone.now() + timedelta(days=2))
+        self.child = Task.objects.create(
+            name="Подзадача",
+            parent_task=self.parent,
+            assignee=self.employee,
+            deadline=timezone.now() + timedelta(days=1),
+        )
+
+    def sync(self, since=None, **params):
+        if since:
+            params["since"] = since
+        response = self.client.get("/api/changes/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_initial_sync_returns_everything(self):
+        data = self.sync()
+        self.assertEqual([task["id"] for task in data["tasks"]], [self.parent.id, self.child.id])
+        self.assertEqual([employee["id"] for employee in data["employees"]], [self.employee.id])
+        self.assertIn("updated_at", data["tasks"][0])
+        self.assertEqual(data["deleted"], {"tasks": [], "employees": []})
+        self.assertFalse(data["has_more"])
+
+    def test_incremental_sync_returns_only_changes(self):
+        cursor = self.sync()["cursor"]
+        with self.assertNumQueries(3):
+            data = self.sync(cursor)
+        self.assertEqual(data["tasks"], [])
+        self.assertEqual(data["employees"], [])
+
+        Task.objects.filter(pk=self.child.pk).update(name="Переименованная подзадача")
+        data = self.sync(cursor)
+        self.assertEqual([task["id"] for task in data["tasks"]], [self.child.id])
+        self.assertEqual(data["tasks"][0]["name"], "Переименованная подзадача")
+        self.assertEqual(data["employees"], [])
+
+    def test_deletions_are_reported_with_side_effects(self):
+        cursor = self.sync()["cursor"]
+        parent_id, employee_id = self.parent.id, self.employee.id
+        self.parent.delete()
+        self.employee.delete()
+        data = self.sync(cursor)
+        self.assertEqual(data["deleted"], {"tasks": [parent_id], "employees": [employee_id]})
+        # Подзадача потеряла родителя и исполнителя, поэтому тоже попадает в изменения.
+        self.assertEqual(len(data["tasks"]), 1)
+        self.assertEqual(data["tasks"][0]["id"], self.child.id)
+        self.assertIsNone(data["tasks"][0]["parent_task"])
+        self.assertIsNone(data["tasks"][0]["assignee"])
+
+    def test_limit_pages_through_changes(self):
+        data = self.sync(limit=1)
+        self.assertTrue(data["has_more"])
+        self.assertEqual(len(data["tasks"]), 1)
+        data = self.sync(data["cursor"], limit=1)
+        self.assertEqual([task["id"] for task in data["tasks"]], [self.child.id])
+        data = self.sync(data["cursor"], limit=1)
+        self.assertFalse(data["has_more"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/changes/", {"since": "не-курсор"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FastListSerializationTest(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(full_name="Мария «Тестовая» Петрова", position="Аналитик")
+        parent = Task.objects.create(
+            name="Задача с \"кавычками\" и юникодом ✓",
+            deadline=timezone.now() + timedelta(days=1, microseconds=123456),
+        )
+        Task.objects.create(
+            name="Подзадача",
+            parent_task=parent,
+            assignee=self.employee,
+            status="in_progress",
+            deadline=timezone.now() + timedelta(days=2),
+        )
+
+    def test_list_is_byte_compatible_with_serializers(self):
+        for url, serializer_class in (("/api/tasks/", TaskSerializer), ("/api/employees/", EmployeeSerializer)):
+            response = self.client.get(url)
+            expected = {
+                "next": None,
+                "previous": None,
+                "results": serializer_class(serializer_class.Meta.model.objects.order_by("id"), many=True).data,
+            }
+            self.assertEqual(response.content, JSONRenderer().render(expected))
+
+    def test_rows_match_serializer_in_other_timezone(self):
+        with timezone.override("Europe/Moscow"):
+            columns = get_value_columns(TaskSerializer)
+            rows = Task.objects.order_by("id").values(*[column for _, column, _ in columns])
+            self.assertEqual(
+                list(iter_value_rows(rows, columns)),
+                TaskSerializer(Task.objects.order_by("id"), many=True).data,
+            )
+
+
+class AssignmentPlanTest(APITestCase):
+    def setUp(self):
+        self.employees = [
+            Employee.objects.create(full_name=f"Сотрудник {number}", position="Разработчик") for number in range(3)
+        ]
+        deadline = timezone.now() + timedelta(days=1)
+        self.parents = []
+        for number in range(9):
+            parent = Task.objects.create(name=f"Важная задача {number}", deadline=deadline)
+            Task.objects.create(name=f"Подзадача {number}", parent_task=parent, status="in_progress", deadline=deadline)
+            self.parents.append(parent)
+
+    def test_plan_spreads_tasks_evenly(self):
+        response = self.client.get("/api/tasks/assignment_plan/", {"seed": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["ID задачи"] for item in response.data], [parent.id for parent in self.parents])
+        counts = {}
+        for item in response.data:
+            counts[item["ID сотрудника"]] = counts.get(item["ID сотрудника"], 0) + 1
+        self.assertEqual(sorted(counts.values()), [3, 3, 3])
+        self.assertFalse(Task.objects.filter(pk__in=[parent.id for parent in self.parents], assignee__isnull=False))
+
+    def test_plan_is_deterministic_with_seed(self):
+        first = self.client.get("/api/tasks/assignment_plan/", {"seed": 7}).data
+        self.assertEqual(self.client.get("/api/tasks/assignment_plan/", {"seed": 7}).data, first)
+
+    def test_subtask_assignee_preferred_within_tolerance(self):
+        busy, free = self.employees[0].id, self.employees[1].id
+        plan = build_assignment_plan({1: busy, 2: busy}, {busy: 2, free: 0})
+        # Второй задаче сотрудник подзадачи уже не подходит: его нагрузка 3 при минимальной 0.
+        self.assertEqual(
+            [(employee_id, reason) for _, employee_id, reason, _ in plan],
+            [(busy, REASON_SUBTASK_ASSIGNEE), (free, REASON_LEAST_BUSY)],
+        )
+
+    def test_apply_assigns_tasks_and_updates_counters(self):
+        response = self.client.post("/api/tasks/assignment_plan/?seed=3")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for item in response.data:
+            self.assertEqual(Task.objects.get(pk=item["ID задачи"]).assignee_id, item["ID сотрудника"])
+        for employee in self.employees:
+            employee.refresh_from_db()
+            self.assertEqual(employee.active_tasks_count, 3)
+        self.assertEqual(self.client.get("/api/tasks/assignment_plan/").data, [])
+
+
+class InstrumentationTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        for histogram in HISTOGRAMS:
+            histogram.clear()
+        Employee.objects.create(full_name="Анна Смирнова", position="Разработчик")
+
+    def test_server_timing_header(self):
+        response = self.client.get("/api/employees/")
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+, render;dur=[\d.]+, total;dur=[\d.]+$',
+        )
+        queries = int(re.search(r'desc="(\d+) queries"', response["Server-Timing"]).group(1))
+        self.assertGreater(queries, 0)
+
+        # Ответ из кэша не обращается к базе данных.
+        response = self.client.get("/api/employees/")
+        self.assertIn('desc="0 queries"', response["Server-Timing"])
+
+    def test_serialization_time_is_reported(self):
+        def slow_rows(rows, columns):
+            time.sleep(0.05)
+            return iter_value_rows(rows, columns)
+
+        with patch("tracker.fastpath.iter_value_rows", slow_rows):
+            response = self.client.get("/api/tasks/")
+        serialize = float(re.search(r"serialize;dur=([\d.]+)", response["Server-Timing"]).group(1))
+        self.assertGreaterEqual(serialize, 50)
+        self.assertLess(serialize, float(re.search(r"total;dur=([\d.]+)", response["Server-Timing"]).group(1)))
+        content = self.client.get("/api/metrics/").content.decode()
+        self.assertIn('tracker_serialize_duration_seconds_bucket{method="GET",route="task-list",le="0.05"} 0', content)
+
+    def test_metrics_in_prometheus_format(self):
+        self.client.get("/api/employees/")
+        self.client.get("/api/employees/")
+        response = self.client.get("/api/metrics/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        content = response.content.decode()
+        self.assertIn("# TYPE tracker_request_duration_seconds histogram", content)
+        self.assertIn('tracker_request_duration_seconds_count{method="GET",route="employee-list"} 2', content)
+        self.assertIn('tracker_db_queries_bucket{method="GET",route="employee-list",le="+Inf"} 2', content)
+        self.assertIn('tracker_db_queries_bucket{method="GET",route="employee-list",le="0.0"} 1', content)
+
+
+class DatasetSeederTest(TestCase):
+    def test_seed_dataset(self):
+        employee_ids, task_ids = seed_dataset(20, 500, max_depth=5, seed=1)
+        self.assertEqual((Employee.objects.count(), Task.objects.count()), (20, 500))
+        self.assertEqual(len(get_ancestors(task_ids[-1])), 5)
+        self.assertEqual(set(Task.objects.values_list("status", flat=True)), set(STATUS_WEIGHTS))
+        call_command("recount_active_tasks", "--check", stdout=StringIO())
+
+
+class QueryBudgetTest(TestCase):
+    def test_endpoints_within_query_budget(self):
+        results = run_benchmarks(sizes=[100, 400], repeat=1)
+        self.assertEqual(check_results(results), [])
+        # Количество запросов не должно расти вместе с объемом данных.
+        for name, result in results["100"].items():
+            self.assertEqual(result["queries"], results["400"][name]["queries"], name)
+
+    def test_endpoint_missing_from_baseline_is_a_violation(self):
+        measured = {"latency_ms": 3.0, "queries": 1}
+        results = {"1000": {"employee-list": measured, "search": measured}}
+        baseline = {"1000": {"employee-list": measured}}
+        self.assertEqual(
+            check_results(results, baseline), ["search (1000): нет в базовом замере, обновите его с --update-baseline"]
+        )
+        self.assertEqual(check_results(results), [])
+        # Размер, которого нет в базовом замере, сравнивать не с чем.
+        self.assertEqual(check_results({"100000": results["1000"]}, baseline), [])
+
+    def test_saved_baseline_covers_all_endpoints(self):
+        baseline = load_baseline(settings.BASE_DIR / "benchmarks" / "baseline.json")
+        for size in DEFAULT_SIZES:
+            self.assertEqual(sorted(baseline[str(size)]), sorted(name for name, _, _ in ENDPOINTS), size)
+
+
+class AsyncViewsTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employee = Employee.objects.create(full_name="Олег Кузнецов", position="Разработчик")
+        deadline = timezone.now() + timedelta(days=1)
+        self.parent = Task.objects.create(name="Важная задача", deadline=deadline)
+        self.subtask = Task.objects.create(
+            name="Подзадача", parent_task=self.parent, assignee=self.employee, status="in_progress", deadline=deadline
+        )
+
+    def test_async_responses_match_sync(self):
+        urls = [
+            "employees/",
+            f"employees/{self.employee.id}/",
+            "employees/busy_employees/",
+            "tasks/",
+            "tasks/?status=in_progress",
+            f"tasks/{self.subtask.id}/",
+            "tasks/important_tasks/",
+        ]
+        for url in urls:
+            sync_response = self.client.get(f"/api/{url}")
+            async_response = async_to_sync(self.async_client.get)(f"/api/async/{url}")
+            self.assertEqual(async_response.status_code, status.HTTP_200_OK, url)
+            self.assertEqual(async_response.content, sync_response.content, url)
+
+    def test_async_errors(self):
+        response = async_to_sync(self.async_client.get)("/api/async/tasks/999999/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = async_to_sync(self.async_client.get)("/api/async/tasks/", {"cursor": "не-курсор"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = async_to_sync(self.async_client.post)("/api/async/tasks/")
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class AsyncConcurrencyTest(TransactionTestCase):
+    def test_important_tasks_loaded_concurrently(self):
+        employee = Employee.objects.create(full_name="Олег Кузнецов", position="Разработчик")
+        parent = Task.objects.create(name="Важная задача", deadline=timezone.now() + timedelta(days=1))
+        Task.objects.create(
+            name="Подзадача",
+            parent_task=parent,
+            assignee=employee,
+            status="in_progress",
+            deadline=timezone.now() + timedelta(days=1),
+        )
+        response = async_to_sync(self.async_client.get)("/api/async/tasks/important_tasks/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()[0]["ID предлагаемого сотрудника"], employee.id)
+
+
+@skipUnless("replica" in settings.DATABASES, "Нужна база данных replica (config.test_settings).")
+@override_settings(TRACKER_DB_REPLICAS=["replica"])
+class ReplicaRoutingTest(APITestCase):
+    databases = {"default", "replica"} & set(settings.DATABASES)
+
+    def setUp(self):
+        cache.clear()
+        reset_health()
+        Employee.objects.create(full_name="Сотрудник основной базы", position="Разработчик")
+        Employee.objects.using("replica").create(full_name="Сотрудник реплики", position="Разработчик")
+
+    def names(self, response):
+        return [employee["full_name"] for employee in response.data["results"]]
+
+    def test_reads_go_to_replica(self):
+        response = self.client.get("/api/employees/")
+        self.assertEqual(self.names(response), ["Сотрудник реплики"])
+        # Закрепленный за основной базой клиент не получает закэшированный ответ реплики.
+        self.client.cookies[ReplicaPinningMiddleware.cookie_name] = str(time.time() + 60)
+        self.assertEqual(self.names(self.client.get("/api/employees/")), ["Сотрудник основной базы"])
+        # Вне HTTP-запроса чтение идет в основную базу.
+        self.assertEqual(Employee.objects.get().full_name, "Сотрудник основной базы")
+
+    def test_client_is_pinned_to_primary_after_write(self):
+        response = self.client.post("/api/employees/", {"full_name": "Новый сотрудник", "position": "Аналитик"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn(ReplicaPinningMiddleware.cookie_name, response.cookies)
+        self.assertEqual(self.names(self.client.get("/api/employees/")), ["Сотрудник основной базы", "Новый сотрудник"])
+
+        self.client.cookies.clear()
+        cache.clear()
+        self.assertEqual(self.names(self.client.get("/api/employees/")), ["Сотрудник реплики"])
+
+    def test_only_tracker_models_are_read_from_replica(self):
+        cache_model = DatabaseCache("tracker_cache", {}).cache_model_class
+        with routing_context(pinned=False):
+            self.assertEqual(router.db_for_read(cache_model), "default")
+            self.assertEqual(router.db_for_read(User), "default")
+            self.assertFalse(used_replica())
+            self.assertEqual(router.db_for_read(Employee), "replica")
+            self.assertTrue(used_replica())
+
+    def test_unhealthy_replica_falls_back_to_primary(self):
+        with patch.object(connections["replica"], "ensure_connection", side_effect=OperationalError):
+            response = self.client.get("/api/employees/")
+        self.assertEqual(self.names(response), ["Сотрудник основной базы"])
+
+    @override_settings(TRACKER_DB_REPLICA_CACHE_TIMEOUT=0)
+    def test_replica_responses_cached_briefly(self):
+        self.client.get("/api/employees/")
+        self.assertEqual(self.client.get("/api/employees/")["X-Cache"], "MISS")
+
+
+class SingleFlightTest(TestCase):
+    def test_concurrent_calls_share_one_computation(self):
+        flights = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "результат"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flights.do("key", compute)))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=lambda: results.append(flights.do("key", compute)))
+        follower.start()
+        time.sleep(0.1)
+        release.set()
+        leader.join()
+        follower.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertCountEqual(results, [("результат", False), ("результат", True)])
+        # После завершения ключ освобождается: результат не кэшируется.
+        self.assertEqual(flights.do("key", lambda: "новый"), ("новый", False))
+
+    def test_error_is_raised_in_caller(self):
+        with self.assertRaises(ZeroDivisionError):
+            SingleFlight().do("key", lambda: 1 / 0)
+
+    def test_across_processes_waits_for_lock_holder(self):
+        cache.clear()
+        cache.add(f"{LOCK_PREFIX}:key", 1)
+        timer = threading.Timer(0.1, lambda: cache.set(f"{RESULT_PREFIX}:key", "чужой результат"))
+        timer.start()
+        self.assertEqual(compute_across_processes("key", lambda: "свой результат"), ("чужой результат", True))
+        timer.join()
+
+    @override_settings(TRACKER_COALESCE_TIMEOUT=0)
+    def test_across_processes_computes_after_timeout(self):
+        cache.clear()
+        cache.add(f"{LOCK_PREFIX}:key", 1)
+        self.assertEqual(compute_across_processes("key", lambda: "свой результат"), ("свой результат", False))
+
+
+class RequestCoalescingTest(TransactionTestCase):
+    def test_concurrent_important_tasks_computed_once(self):
+        cache.clear()
+        employee = Employee.objects.create(full_name="Олег Кузнецов", position="Разработчик")
+        parent = Task.objects.create(name="Важная задача", deadline=timezone.now() + timedelta(days=1))
+        Task.objects.create(
+            name="Подзадача",
+            parent_task=parent,
+            assignee=employee,
+            status="in_progress",
+            deadline=timezone.now() + timedelta(days=1),
+        )
+
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_recommend_assignees():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return recommend_assignees()
+
+        responses = []
+
+        def fetch():
+            responses.append(self.client_class().get("/api/tasks/important_tasks/"))
+
+        with patch("tracker.views.recommend_assignees", slow_recommend_assignees):
+            leader = threading.Thread(target=fetch)
+            leader.start()
+            started.wait(5)
+            follower = threading.Thread(target=fetch)
+            follower.start()
+            time.sleep(0.1)
+            release.set()
+            leader.join()
+            follower.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([response.status_code for response in responses], [200, 200])
+        self.assertEqual(responses[0].content, responses[1].content)
+        self.assertEqual(sorted(response.get("X-Coalesced", "") for response in responses), ["", "1"])
+
+
+class WorkloadHistoryTest(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(full_name="Мария Орлова", position="Разработчик")
+        self.idle = Employee.objects.create(full_name="Иван Седов", position="Аналитик")
+        deadline = timezone.now() + timedelta(days=1)
+        for status_value in ("not_started", "in_progress", "completed"):
+            Task.objects.create(name=status_value, assignee=self.employee, status=status_value, deadline=deadline)
+        self.today = timezone.localdate()
+
+    def test_snapshot_is_idempotent(self):
+        out = StringIO()
+        call_command("snapshot_workload", stdout=out)
+        self.assertIn("сотрудников 2", out.getvalue())
+        self.assertEqual(
+            dict(EmployeeWorkloadRollup.objects.values_list("employee_id", "active_tasks")),
+            {self.employee.id: 2, self.idle.id: 0},
+        )
+        self.assertEqual(
+            dict(StatusRollup.objects.values_list("status", "tasks")),
+            {"not_started": 1, "in_progress": 1, "completed": 1},
+        )
+
+        self.assertEqual(take_snapshot()["employees"], 0)
+        Task.objects.filter(status="not_started").update(assignee=self.idle)
+        self.idle.delete()
+        self.assertEqual(take_snapshot()["employees"], 1)
+        self.assertEqual(
+            dict(EmployeeWorkloadRollup.objects.values_list("employee_id", "active_tasks")), {self.employee.id: 1}
+        )
+        self.assertEqual(StatusRollup.objects.count(), 3)
+
+    def test_series_by_granularity(self):
+        monday = self.today - timedelta(days=self.today.weekday() + 7)
+        EmployeeWorkloadRollup.objects.bulk_create(
+            [
+                EmployeeWorkloadRollup(date=monday, employee_id=self.employee.id, active_tasks=2),
+                EmployeeWorkloadRollup(date=monday + timedelta(days=1), employee_id=self.employee.id, active_tasks=4),
+                EmployeeWorkloadRollup(date=monday, employee_id=self.idle.id, active_tasks=0),
+            ]
+        )
+        params = {"start": monday.isoformat(), "end": self.today.isoformat()}
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/workload/employees/", {**params, "employee": self.employee.id})
+        self.assertEqual([row["Активных задач"] for row in response.data], [2, 4])
+
+        response = self.client.get(
+            "/api/workload/employees/", {**params, "employee": self.employee.id, "granularity": "week"}
+        )
+        self.assertEqual(response.data, [{"Период": monday, "ID сотрудника": self.employee.id, "Активных задач": 3}])
+
+        response = self.client.get("/api/workload/employees/", {**params, "granularity": "week"})
+        self.assertEqual(
+            response.data,
+            [{"Период": monday, "Активных задач": 3, "Сотрудников": 1.5, "В среднем на сотрудника": 2}],
+        )
+
+    def test_status_series(self):
+        task = Task.objects.get(status="in_progress")
+        task.status = "completed"
+        task.save()
+        task.name = "Переименована"
+        task.save()
+        Task.objects.filter(status="not_started").update(status="in_progress")
+        Task.objects.filter(status="in_progress").update(assignee=self.idle)
+        take_snapshot()
+        response = self.client.get("/api/workload/statuses/", {"granularity": "month"})
+        self.assertEqual(
+            [(row["Статус"], row["Задач"], row["Переходов в статус"]) for row in response.data],
+            [("completed", 2, 1), ("in_progress", 1, 1), ("not_started", 0, 0)],
+        )
+        self.assertEqual(response.data[0]["Период"], self.today.replace(day=1))
+
+    def test_late_transitions_are_added_to_previous_day(self):
+        yesterday = timezone.now() - timedelta(days=1)
+        StatusRollup.objects.create(date=self.today - timedelta(days=1), status="completed", tasks=1, transitions=0)
+        StatusTransition.objects.bulk_create(
+            [
+                StatusTransition(task_id=1, from_status="in_progress", to_status="completed", changed_at=yesterday),
+                StatusTransition(
+                    task_id=2,
+                    from_status="in_progress",
+                    to_status="completed",
+                    changed_at=yesterday - timedelta(days=1),
+                ),
+            ]
+        )
+        take_snapshot()
+        self.assertEqual(
+            StatusRollup.objects.get(date=self.today - timedelta(days=1), status="completed").transitions, 1
+        )
+        self.assertEqual(StatusRollup.objects.get(date=self.today, status="completed").transitions, 0)
+        self.assertEqual(list(StatusTransition.objects.values_list("task_id", flat=True)), [1])
+
+    def test_invalid_parameters(self):
+        for params in ({"start": "вчера"}, {"start": "2026-02-01", "end": "2026-01-01"}, {"granularity": "year"}):
+            response = self.client.get("/api/workload/statuses/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+        response = self.client.get("/api/workload/employees/", {"employee": "один"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskArchiveTest(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(full_name="Анна Белова", position="Разработчик")
+        deadline = timezone.now() + timedelta(days=1)
+
+        def create(name, status_value="completed", parent=None):
+            return Task.objects.create(
+                name=name, status=status_value, parent_task=parent, assignee=self.employee, deadline=deadline
+            )
+
+        self.old_root = create("Старое дерево")
+        self.old_child = create("Подзадача старого дерева", parent=self.old_root)
+        self.old_grandchild = create("Вложенная подзадача", parent=self.old_child)
+        self.mixed_root = create("Дерево с активной подзадачей")
+        self.active_child = create("Активная подзадача", "in_progress", self.mixed_root)
+        self.single = create("Старая задача")
+        self.recent = create("Недавняя задача")
+        Task.objects.exclude(pk=self.recent.pk).update(updated_at=timezone.now() - timedelta(days=100))
+
+    def test_archives_completed_trees_in_batches(self):
+        out = StringIO()
+        call_command("archive_tasks", "--batch-size", "3", stdout=out)
+        self.assertIn("Перенесено задач: 4", out.getvalue())
+
+        archived = {self.old_root.id, self.old_child.id, self.old_grandchild.id, self.single.id}
+        self.assertEqual(set(ArchivedTask.objects.values_list("id", flat=True)), archived)
+        self.assertFalse(Task.objects.filter(pk__in=archived).exists())
+        self.assertEqual(ArchivedTask.objects.get(pk=self.old_grandchild.id).parent_task_id, self.old_child.id)
+        self.assertEqual(ArchivedTask.objects.get(pk=self.old_root.id).assignee_id, self.employee.id)
+        self.assertEqual(set(Tombstone.objects.filter(model="task").values_list("object_id", flat=True)), archived)
+        # Активные задачи сотрудника не менялись.
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.active_tasks_count, 1)
+
+        # Повторный запуск ничего не переносит.
+        call_command("archive_tasks", stdout=StringIO())
+        self.assertEqual(ArchivedTask.objects.count(), 4)
+
+    def test_batch_is_capped_by_task_count(self):
+        out = StringIO()
+        manager = ArchivedTask.objects
+        with patch.object(manager, "bulk_create", wraps=manager.bulk_create) as bulk_create:
+            call_command("archive_tasks", "--batch-size", "2", stdout=out)
+        self.assertTrue(all(len(call.args[0]) <= 2 for call in bulk_create.call_args_list))
+        # Дерево из трех задач больше порции и остается в основной таблице.
+        self.assertEqual(set(ArchivedTask.objects.values_list("id", flat=True)), {self.single.id})
+        self.assertIn(f"Дерево задачи {self.old_root.id} больше порции", out.getvalue())
+
+        call_command("archive_tasks", "--batch-size", "3", stdout=StringIO())
+        self.assertEqual(ArchivedTask.objects.count(), 4)
+
+    def test_batch_changed_after_loading_is_skipped(self):
+        load_trees = archive._load_trees
+
+        def load_and_change(roots, limit):
+            trees = load_trees(roots, limit)
+            Task.objects.filter(pk=self.old_grandchild.pk).update(name="Переименована")
+            Task.objects.create(
+                name="Новая подзадача", status="completed", parent_task=self.old_child, deadline=self.old_root.deadline
+            )
+            return trees
+
+        with patch("tracker.archive._load_trees", side_effect=load_and_change):
+            archive.archive_batch(archive.get_archive_cutoff(), batch_size=10)
+        self.assertFalse(ArchivedTask.objects.exists())
+        self.assertEqual(Task.objects.get(name="Новая подзадача").parent_task_id, self.old_child.id)
+
+    def test_archive_read_apis(self):
+        call_command("archive_tasks", stdout=StringIO())
+        response = self.client.get("/api/archived-tasks/", {"top_level": "true"})
+        self.assertEqual([task["id"] for task in response.data["results"]], [self.old_root.id, self.single.id])
+        response = self.client.get(f"/api/archived-tasks/{self.old_child.id}/")
+        self.assertEqual(response.data["parent_task"], self.old_root.id)
+
+        response = self.client.get("/api/tasks/export/", {"status": "completed", "include_archived": "true"})
+        ids = [json.loads(line)["id"] for line in b"".join(response.streaming_content).decode().splitlines()]
+        # Задачи из архива следуют за задачами из основной таблицы.
+        self.assertCountEqual(ids[:2], [self.mixed_root.id, self.recent.id])
+        self.assertCountEqual(ids[2:], [self.old_root.id, self.old_child.id, self.old_grandchild.id, self.single.id])
+
+    def test_employee_deletion_clears_archived_assignee(self):
+        call_command("archive_tasks", stdout=StringIO())
+        self.employee.delete()
+        self.assertFalse(ArchivedTask.objects.filter(assignee__isnull=False).exists())
+
+
+class SearchTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        reset_ngram_indexes()
+        self.petrov = Employee.objects.create(full_name="Иван Петров", position="Разработчик")
+        self.sidorova = Employee.objects.create(full_name="Ивана Сидорова", position="Аналитик")
+        self.ivanov = Employee.objects.create(full_name="Петр Иванов", position="Тестировщик")
+        deadline = timezone.now() + timedelta(days=1)
+        self.report = Task.objects.create(name="Подготовить отчет", deadline=deadline)
+        self.sales = Task.objects.create(name="Отчет по продажам", deadline=deadline)
+
+    def ids(self, response, target):
+        return [row["id"] for row in response.data[target]]
+
+    def test_fuzzy_search_tolerates_typos(self):
+        response = self.client.get("/api/search/", {"q": "Петрова"})
+        self.assertEqual(self.ids(response, "employees"), [self.petrov.id])
+        self.assertEqual(response.data["employees"][0]["full_name"], "Иван Петров")
+        self.assertEqual(response.data["tasks"], [])
+
+        response = self.client.get("/api/search/", {"q": "отчет", "type": "tasks"})
+        self.assertEqual(self.ids(response, "tasks"), [self.report.id, self.sales.id])
+        self.assertNotIn("employees", response.data)
+
+    def test_prefix_search_ranks_leading_matches_first(self):
+        response = self.client.get("/api/search/", {"q": "ив", "mode": "prefix", "type": "employees"})
+        self.assertEqual(self.ids(response, "employees"), [self.petrov.id, self.sidorova.id, self.ivanov.id])
+        response = self.client.get("/api/search/", {"q": "петр ив", "mode": "prefix", "type": "employees"})
+        self.assertEqual(self.ids(response, "employees"), [self.ivanov.id])
+
+    def test_postgresql_prefix_search_uses_ilike(self):
+        queryset = _search_postgresql(Task.objects.all(), "name", "от_ч", "prefix")
+        sql = str(queryset.query)
+        self.assertIn("ILIKE", sql)
+        self.assertNotIn("UPPER", sql)
+        self.assertIn("от\\_ч%", sql)
+
+    @skipUnless(connection.vendor == "postgresql", "индекс gin_trgm_ops есть только в PostgreSQL")
+    def test_prefix_search_uses_trigram_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = _search_postgresql(Task.objects.all(), "name", "отч", "prefix").explain()
+        self.assertIn("tracker_task_name_trgm", plan)
+
+    def test_index_follows_writes(self):
+        self.client.get("/api/search/", {"q": "отчет"})
+        Task.objects.filter(pk=self.report.pk).update(name="Подготовить презентацию")
+        self.sales.delete()
+        Employee.objects.create(full_name="Ольга Отчетова", position="Бухгалтер")
+        response = self.client.get("/api/search/", {"q": "отчет"})
+        self.assertEqual(response.data["tasks"], [])
+        self.assertEqual([row["full_name"] for row in response.data["employees"]], ["Ольга Отчетова"])
+
+    def test_invalid_parameters(self):
+        for params in ({}, {"q": "отчет", "type": "projects"}, {"q": "отчет", "mode": "exact"}):
+            response = self.client.get("/api/search/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_ngram_index_candidates(self):
+        index = NgramIndex()
+        index.add(1, "Отчет по продажам")
+        index.add(2, "Отчет")
+        index.remove(1)
+        self.assertEqual(index.search("отчет", 10), [(2, 1.0)])
+        self.assertEqual(len(index), 1)
+
+
+class ImportCommandTest(TestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(full_name="Ирина Лебедева", position="Менеджер")
+        self.deadline = (timezone.now() + timedelta(days=5)).isoformat()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, lines):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+        return path
+
+    def task(self, ref, **fields):
+        record = {"ref": ref, "name": f"Задача {ref}", "deadline": self.deadline, **fields}
+        return json.dumps(record, ensure_ascii=False)
+
+    def test_import_tasks_with_forward_references(self):
+        path = self.write(
+            "tasks.jsonl",
+            [
+                self.task("child", parent_ref="root", status="in_progress", assignee=self.employee.id),
+                self.task("root"),
+                self.task("grandchild", parent_ref="child"),
+            ],
+        )
+        out = StringIO()
+        call_command("import_data", "tasks", path, "--batch-size", "1", stdout=out)
+        self.assertIn("Создано: 3", out.getvalue())
+
+        tasks = {task.name: task for task in Task.objects.all()}
+        self.assertEqual(tasks["Задача child"].parent_task_id, tasks["Задача root"].id)
+        self.assertEqual(tasks["Задача grandchild"].parent_task_id, tasks["Задача child"].id)
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.active_tasks_count, 1)
+
+    def test_import_employees_from_csv(self):
+        path = self.write("employees.csv", ["full_name,position", "Олег Смирнов,Аналитик", "Вера Котова,Дизайнер"])
+        call_command("import_data", "employees", path, stdout=StringIO())
+        self.assertEqual(Employee.objects.filter(full_name__in=["Олег Смирнов", "Вера Котова"]).count(), 2)
+
+    def test_dry_run_saves_nothing(self):
+        path = self.write("tasks.jsonl", [self.task("a"), self.task("b", parent_ref="a")])
+        out = StringIO()
+        call_command("import_data", "tasks", path, "--dry-run", stdout=out)
+        self.assertIn("Проверено (без сохранения): 2", out.getvalue())
+        self.assertFalse(Task.objects.exists())
+
+    def test_resume_after_invalid_record(self):
+        lines = [self.task("a"), self.task("b", parent_ref="a"), self.task("c", status="unknown")]
+        path = self.write("tasks.jsonl", lines)
+        with self.assertRaises(CommandError):
+            call_command("import_data", "tasks", path, "--batch-size", "2", stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(Task.objects.count(), 2)
+        self.assertEqual(ImportState.objects.get(model="tasks").records, 2)
+
+        lines[2] = self.task("c", parent_ref="b")
+        self.write("tasks.jsonl", lines)
+        with self.assertRaisesMessage(CommandError, "--resume"):
+            call_command("import_data", "tasks", path, "--batch-size", "2", stdout=StringIO())
+        call_command("import_data", "tasks", path, "--batch-size", "2", "--resume", stdout=StringIO())
+        self.assertEqual(Task.objects.count(), 3)
+        self.assertEqual(Task.objects.get(name="Задача c").parent_task.name, "Задача b")
+        self.assertFalse(ImportState.objects.exists())
+
+    def test_batch_and_checkpoint_are_committed_together(self):
+        path = self.write(
+            "tasks.jsonl", [self.task("a"), self.task("b", parent_ref="a"), self.task("c"), self.task("d")]
+        )
+        original = ImportCheckpoint.save_batch
+        calls = []
+
+        def fail_second_batch(checkpoint, *args):
+            calls.append(args)
+            original(checkpoint, *args)
+            # Сбой после вставки второй пачки и записи ее состояния, но до фиксации транзакции.
+            if len(calls) == 2:
+                raise RuntimeError
+
+        with patch("tracker.importer.ImportCheckpoint.save_batch", fail_second_batch):
+            with self.assertRaises(RuntimeError):
+                call_command("import_data", "tasks", path, "--batch-size", "2", stdout=StringIO())
+        self.assertEqual(Task.objects.count(), 2)
+        self.assertEqual(ImportState.objects.get().records, 2)
+
+        call_command("import_data", "tasks", path, "--batch-size", "2", "--resume", stdout=StringIO())
+        names = ["Задача a", "Задача b", "Задача c", "Задача d"]
+        self.assertEqual(sorted(Task.objects.values_list("name", flat=True)), names)
+        self.assertEqual(Task.objects.get(name="Задача b").parent_task.name, "Задача a")
+
+    def test_checkpoint_is_per_file(self):
+        first = self.write("first.jsonl", [self.task("a"), self.task("b", status="unknown")])
+        with self.assertRaises(CommandError):
+            call_command("import_data", "tasks", first, "--batch-size", "1", stdout=StringIO(), stderr=StringIO())
+        second = self.write("second.jsonl", [self.task("x"), self.task("y")])
+        call_command("import_data", "tasks", second, stdout=StringIO())
+        self.assertEqual(Task.objects.filter(name__in=["Задача x", "Задача y"]).count(), 2)
+        self.assertEqual(ImportState.objects.get().records, 1)
+
+    def test_cycles_and_unknown_references_are_reported(self):
+        path = self.write(
+            "tasks.jsonl",
+            [self.task("a", parent_ref="b"), self.task("b", parent_ref="a"), self.task("c", parent_ref="нет")],
+        )
+        err = StringIO()
+        call_command("import_data", "tasks", path, "--skip-invalid", stdout=StringIO(), stderr=err)
+        for number in (1, 2, 3):
+            self.assertIn(f"Запись {number}", err.getvalue())
+        # Задачи созданы, но ссылки из цикла и на отсутствующую запись не назначены.
+        self.assertEqual(Task.objects.count(), 3)
+        self.assertFalse(Task.objects.filter(parent_task__isnull=False).exists())
+
+    def test_unresolved_references_end_the_import(self):
+        path = self.write("tasks.jsonl", [self.task("a"), self.task("b", parent_ref="нет")])
+        err = StringIO()
+        with self.assertRaisesMessage(CommandError, "повторный запуск не нужен"):
+            call_command("import_data", "tasks", path, stdout=StringIO(), stderr=err)
+        self.assertIn("Запись 2", err.getvalue())
+        self.assertEqual(Task.objects.count(), 2)
+        self.assertFalse(ImportState.objects.exists())
+
+    def test_malformed_json_line_is_skipped(self):
+        path = self.write("tasks.jsonl", [self.task("a"), "{не json", "[1, 2]", self.task("b", parent_ref="a")])
+        err = StringIO()
+        call_command("import_data", "tasks", path, "--skip-invalid", stdout=StringIO(), stderr=err)
+        self.assertIn("Запись 2", err.getvalue())
+        self.assertIn("Запись 3", err.getvalue())
+        self.assertEqual(Task.objects.get(name="Задача b").parent_task.name, "Задача a")
+
+        with self.assertRaises(CommandError):
+            call_command("import_data", "tasks", path, "--restart", stdout=StringIO(), stderr=StringIO())
+
+
+class DeadlineScanTest(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create(full_name="Павел Орлов", position="Разработчик")
+        now = timezone.now()
+
+        def create(name, deadline, status_value="in_progress", assignee=self.employee):
+            return Task(name=name, deadline=deadline, status=status_value, assignee=assignee)
+
+        # Задачи с прошедшим сроком нельзя сохранить через save(), поэтому они создаются массово.
+        self.overdue, self.approaching, self.far, self.completed, self.unassigned = Task.objects.bulk_create(
+            [
+                create("Просроченная задача", now - timedelta(hours=1)),
+                create("Задача со скорым сроком", now + timedelta(hours=2)),
+                create("Задача с далеким сроком", now + timedelta(days=5)),
+                create("Завершенная просроченная задача", now - timedelta(hours=1), "completed"),
+                create("Просроченная задача без исполнителя", now - timedelta(days=1), "not_started", None),
+            ]
+        )
+
+    def kinds(self):
+        return dict(DeadlineAlert.objects.values_list("task_id", "kind"))
+
+    def test_scan_flags_overdue_and_approaching_tasks(self):
+        out = StringIO()
+        call_command("scan_deadlines", stdout=out)
+        self.assertIn("просрочено 2, скоро срок 1", out.getvalue())
+        self.assertEqual(
+            self.kinds(),
+            {self.overdue.id: "overdue", self.approaching.id: "approaching", self.unassigned.id: "overdue"},
+        )
+
+        response = self.client.get("/api/deadline-alerts/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        groups = [
+            (group["ID сотрудника"], group["ФИО"], group["Просрочено"], group["Скоро срок"]) for group in response.data
+        ]
+        self.assertEqual(groups, [(self.employee.id, "Павел Орлов", 1, 1), (None, None, 1, 0)])
+        response = self.client.get("/api/deadline-alerts/tasks/", {"employee": self.employee.id, "kind": "overdue"})
+        self.assertEqual([alert["Название"] for alert in response.data], ["Просроченная задача"])
+        response = self.client.get("/api/deadline-alerts/tasks/", {"employee": 0})
+        self.assertEqual([alert["ID задачи"] for alert in response.data], [self.unassigned.id])
+        response = self.client.get("/api/deadline-alerts/tasks/", {"kind": "soon"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_repeated_scan_processes_only_new_events(self):
+        scan_deadlines()
+        raised_at = DeadlineAlert.objects.get(task_id=self.overdue.id).raised_at
+        self.assertEqual(scan_deadlines(), {"overdue": 0, "approaching": 0, "removed": 0})
+
+        # Через три часа срок задачи со скорым сроком прошел, хотя сама задача не менялась.
+        later = timezone.now() + timedelta(hours=3)
+        # Изменений задач за это время не было.
+        DeadlineScanState.objects.update(changes_since=later)
+        with patch("tracker.deadlines.timezone.now", return_value=later), CaptureQueriesContext(connection) as queries:
+            result = scan_deadlines()
+        self.assertEqual(result, {"overdue": 1, "approaching": 0, "removed": 0})
+        self.assertEqual(self.kinds()[self.approaching.id], "overdue")
+        self.assertEqual(DeadlineAlert.objects.get(task_id=self.overdue.id).raised_at, raised_at)
+        # Чтение сроков идет по диапазонам после сохраненных границ, а не по всей таблице.
+        deadline_reads = [query["sql"] for query in queries.captured_queries if '"deadline" <=' in query["sql"]]
+        self.assertTrue(deadline_reads)
+        self.assertTrue(all('"deadline" >' in sql for sql in deadline_reads))
+
+    def test_changed_and_deleted_tasks_update_alerts(self):
+        scan_deadlines()
+        Task.objects.filter(pk=self.overdue.pk).update(status="completed")
+        Task.objects.filter(pk=self.approaching.pk).delete()
+        Task.objects.filter(pk=self.unassigned.pk).update(assignee=self.employee)
+        # Задача со сроком внутри уже обработанного диапазона.
+        (late,) = Task.objects.bulk_create(
+            [Task(name="Поздно добавленная задача", deadline=timezone.now() - timedelta(days=2))]
+        )
+
+        self.assertEqual(scan_deadlines(), {"overdue": 1, "approaching": 0, "removed": 2})
+        self.assertEqual(self.kinds(), {self.unassigned.id: "overdue", late.id: "overdue"})
+        self.assertEqual(DeadlineAlert.objects.get(task_id=self.unassigned.id).assignee_id, self.employee.id)
+
+    def test_window_change_updates_approaching_alerts(self):
+        self.assertEqual(scan_deadlines(hours=200)["approaching"], 2)
+        self.assertEqual(self.kinds()[self.far.id], "approaching")
+
+        self.assertEqual(scan_deadlines(hours=24), {"overdue": 0, "approaching": 0, "removed": 1})
+        self.assertNotIn(self.far.id, self.kinds())
+        self.assertEqual(self.kinds()[self.approaching.id], "approaching")
+        self.assertEqual(DeadlineScanState.objects.get().warning_hours, 24)
+
+        self.assertEqual(scan_deadlines(hours=200), {"overdue": 0, "approaching": 1, "removed": 0})
+        self.assertEqual(self.kinds()[self.far.id], "approaching")
+
+    def test_scan_api(self):
+        response = self.client.post("/api/deadline-alerts/scan/?hours=200")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"overdue": 2, "approaching": 2, "removed": 0})
+        response = self.client.post("/api/deadline-alerts/scan/?hours=-1")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class JobQueueTest(APITestCase):
+    def setUp(self):
+        self.calls = []
+        handlers = patch.dict(JOB_HANDLERS, {"record": self.calls.append, "fail": self.fail_job})
+        handlers.start()
+        self.addCleanup(handlers.stop)
+
+    @staticmethod
+    def fail_job(payload):
+        raise RuntimeError("Сбой задания")
+
+    def test_enqueue_deduplicates_queued_jobs_by_key(self):
+        job, created = enqueue("record", {"n": 1}, key="record:1")
+        self.assertTrue(created)
+        self.assertEqual(enqueue("record", {"n": 1}, key="record:1"), (job, False))
+        self.assertTrue(enqueue("record", {"n": 1})[1])
+
+        # Задание с тем же ключом, которое уже выполняется, не мешает постановке.
+        claim_jobs("worker-1", batch_size=10)
+        self.assertTrue(enqueue("record", {"n": 1}, key="record:1")[1])
+        with self.assertRaises(ValueError):
+            enqueue("unknown")
+
+    def test_workers_claim_disjoint_batches(self):
+        for number in range(5):
+            enqueue("record", {"n": number})
+        first = claim_jobs("worker-1", batch_size=2)
+        second = claim_jobs("worker-2", batch_size=10)
+        self.assertEqual([job.payload["n"] for job in first], [0, 1])
+        self.assertEqual([job.payload["n"] for job in second], [2, 3, 4])
+        self.assertEqual(claim_jobs("worker-3"), [])
+        self.assertEqual(set(Job.objects.values_list("status", flat=True)), {Job.RUNNING})
+
+    def test_worker_runs_jobs_and_retries_with_backoff(self):
+        for number in range(3):
+            enqueue("record", {"n": number})
+        failing, _ = enqueue("fail", max_attempts=2)
+        self.assertEqual(run_worker(batch_size=2, burst=True), (3, 1))
+        self.assertEqual(self.calls, [{"n": 0}, {"n": 1}, {"n": 2}])
+
+        failing.refresh_from_db()
+        self.assertEqual((failing.status, failing.attempts), (Job.QUEUED, 1))
+        self.assertIn("Сбой задания", failing.last_error)
+        self.assertGreater(failing.run_after, timezone.now())
+        # Пока не истекла задержка, задание не выполняется.
+        self.assertEqual(run_worker(burst=True), (0, 0))
+
+        Job.objects.filter(pk=failing.pk).update(run_after=timezone.now())
+        self.assertEqual(run_worker(burst=True), (0, 1))
+        failing.refresh_from_db()
+        self.assertEqual((failing.status, failing.attempts), (Job.FAILED, 2))
+
+    def test_abandoned_jobs_are_released(self):
+        enqueue("record", key="record")
+        claim_jobs("worker-1")
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(release_stale_jobs(), 1)
+        self.assertEqual(run_worker(burst=True), (1, 0))
+
+    def test_commands(self):
+        out = StringIO()
+        call_command("enqueue_job", "scan_deadlines", "--payload", '{"hours": 1}', stdout=out)
+        call_command("enqueue_job", "scan_deadlines", "--payload", '{"hours": 1}', stdout=out)
+        self.assertIn("уже ждет выполнения", out.getvalue())
+        self.assertEqual(Job.objects.count(), 1)
+
+        out = StringIO()
+        call_command("run_worker", "--burst", stdout=out)
+        self.assertIn("Выполнено заданий: 1, с ошибкой: 0", out.getvalue())
+        self.assertTrue(DeadlineScanState.objects.exists())
+        self.assertEqual(self.client.get("/api/jobs/stats/").data["done"], 1)
+
+    def test_precomputed_analytics(self):
+        deadline = timezone.now() + timedelta(days=5)
+        parent = Task.objects.create(name="Важная задача", deadline=deadline)
+        subtask = Task.objects.create(name="Подзадача", deadline=deadline, status="in_progress", parent_task=parent)
+
+        response = self.client.get("/api/precomputed/important_tasks/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["ID задачи"] for item in response.data], [parent.id])
+        self.assertNotIn("X-Stale", response)
+
+        # После изменения данных возвращается сохраненный результат, а пересчет ставится в очередь один раз.
+        Task.objects.filter(pk=subtask.pk).update(status="completed")
+        for _ in range(2):
+            response = self.client.get("/api/precomputed/important_tasks/")
+            self.assertEqual(response["X-Stale"], "1")
+            self.assertEqual([item["ID задачи"] for item in response.data], [parent.id])
+        self.assertEqual(Job.objects.filter(name="precompute", status=Job.QUEUED).count(), 1)
+
+        run_worker(burst=True)
+        response = self.client.get("/api/precomputed/important_tasks/")
+        self.assertNotIn("X-Stale", response)
+        self.assertEqual(response.data, [])
+        self.assertEqual(PrecomputedResult.objects.count(), 1)
+        self.assertEqual(self.client.get("/api/precomputed/unknown/").status_code, status.HTTP_404_NOT_FOUND)
+
+
+class DashboardTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = timezone.now()
+        self.first = Employee.objects.create(full_name="Олег Первый", position="Разработчик")
+        self.second = Employee.objects.create(full_name="Олег Второй", position="Разработчик")
+        self.parent = Task.objects.create(
+            name="Родитель", assignee=self.first, deadline=self.now + timedelta(days=5), status="in_progress"
+        )
+
+        def create(name, deadline, status_value, assignee):
+            return Task(name=name, deadline=deadline, status=status_value, assignee=assignee, parent_task=self.parent)
+
+        # Просроченную задачу нельзя сохранить через save(), поэтому подзадачи создаются массово.
+        self.soon_deadline = self.now + timedelta(hours=2)
+        Task.objects.bulk_create(
+            [
+                create("Просроченная", self.now - timedelta(hours=1), "in_progress", self.first),
+                create("Скоро срок", self.soon_deadline, "not_started", self.second),
+                create("Завершенная", self.now - timedelta(days=1), "completed", self.second),
+                create("Без исполнителя", self.now + timedelta(days=3), "not_started", None),
+            ]
+        )
+
+    def test_headline_metrics_in_one_query(self):
+        for breakdowns in [(), ("employee",), ("employee", "parent")]:
+            with self.assertNumQueries(1):
+                result, _ = get_dashboard(breakdowns, now=self.now)
+            self.assertEqual(result["Всего задач"], 5)
+            self.assertEqual(result["Активных"], 4)
+            self.assertEqual(result["Просрочено"], 1)
+            self.assertEqual(result["Скоро срок"], 1)
+            self.assertEqual(result["Без исполнителя"], 1)
+            self.assertEqual(result["По статусам"], {"not_started": 2, "in_progress": 2, "completed": 1})
+            self.assertEqual(result["Занятых сотрудников"], 2)
+            self.assertEqual(result["Ближайший срок"], self.soon_deadline)
+
+    def test_breakdowns(self):
+        result, _ = get_dashboard(["employee", "parent"], now=self.now)
+        employees = [(row["ID сотрудника"], row["Всего задач"], row["Просрочено"]) for row in result["По сотрудникам"]]
+        self.assertEqual(employees, [(self.first.id, 2, 1), (self.second.id, 2, 0), (None, 1, 0)])
+        self.assertEqual(
+            result["По родительским задачам"],
+            [
+                {
+                    "ID родительской задачи": self.parent.id,
+                    "Всего задач": 4,
+                    "Активных": 3,
+                    "Завершено": 1,
+                    "Просрочено": 1,
+                    "Скоро срок": 1,
+                }
+            ],
+        )
+        result, _ = get_dashboard(["employee"], limit=1, now=self.now)
+        self.assertEqual(len(result["По сотрудникам"]), 1)
+
+    def test_cache_lifetime_ends_when_metrics_change(self):
+        # Через 2 часа наступит срок задачи «Скоро срок»; раньше — задача «Без исполнителя» войдет в окно 24 часов.
+        _, expires_at = get_dashboard(hours=60, now=self.now)
+        self.assertEqual(expires_at, self.soon_deadline)
+        _, expires_at = get_dashboard(hours=24, now=self.now)
+        self.assertEqual(expires_at, self.soon_deadline)
+        _, expires_at = get_dashboard(hours=71, now=self.now)
+        self.assertEqual(expires_at, self.now + timedelta(hours=1))
+
+    def test_endpoint_uses_response_cache(self):
+        first = self.client.get("/api/tasks/dashboard/", {"breakdown": "employee"})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/tasks/dashboard/", {"breakdown": "employee"})
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.data, first.data)
+
+        Task.objects.filter(assignee=self.second).update(status="completed")
+        response = self.client.get("/api/tasks/dashboard/", {"breakdown": "employee"})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["Занятых сотрудников"], 1)
+
+        response = self.client.get("/api/tasks/dashboard/", {"breakdown": "status"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_response_is_not_cached_past_next_change(self):
+        Task.objects.filter(name="Скоро срок").update(deadline=self.now - timedelta(seconds=1))
+        Task.objects.filter(name="Без исполнителя").update(deadline=timezone.now() + timedelta(milliseconds=500))
+        self.client.get("/api/tasks/dashboard/")
+        self.assertEqual(self.client.get("/api/tasks/dashboard/")["X-Cache"], "MISS")
@@ -1,12 +1,46 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import EmployeeViewSet, TaskViewSet
+from . import async_views
+from .views import (
+    ArchivedTaskViewSet,
+    CacheStatsView,
+    ChangesView,
+    DeadlineAlertListView,
+    DeadlineAlertsView,
+    DeadlineScanView,
+    EmployeeViewSet,
+    EmployeeWorkloadHistoryView,
+    JobStatsView,
+    MetricsView,
+    PrecomputedResultView,
+    SearchView,
+    StatusHistoryView,
+    TaskViewSet,
+)
 
 router = DefaultRouter()
 router.register(r"employees", EmployeeViewSet)
 router.register(r"tasks", TaskViewSet)
+router.register(r"archived-tasks", ArchivedTaskViewSet)
 
 urlpatterns = [
+    path("cache/stats/", CacheStatsView.as_view(), name="cache-stats"),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+    path("jobs/stats/", JobStatsView.as_view(), name="job-stats"),
+    path("precomputed/<str:name>/", PrecomputedResultView.as_view(), name="precomputed"),
+    path("changes/", ChangesView.as_view(), name="changes"),
+    path("search/", SearchView.as_view(), name="search"),
+    path("workload/employees/", EmployeeWorkloadHistoryView.as_view(), name="workload-employees"),
+    path("deadline-alerts/", DeadlineAlertsView.as_view(), name="deadline-alerts"),
+    path("deadline-alerts/tasks/", DeadlineAlertListView.as_view(), name="deadline-alert-tasks"),
+    path("deadline-alerts/scan/", DeadlineScanView.as_view(), name="deadline-scan"),
+    path("workload/statuses/", StatusHistoryView.as_view(), name="workload-statuses"),
+    path("async/employees/", async_views.employee_list, name="async-employee-list"),
+    path("async/employees/busy_employees/", async_views.busy_employees, name="async-employee-busy-employees"),
+    path("async/employees/<int:pk>/", async_views.employee_detail, name="async-employee-detail"),
+    path("async/tasks/", async_views.task_list, name="async-task-list"),
+    path("async/tasks/important_tasks/", async_views.important_tasks, name="async-task-important-tasks"),
+    path("async/tasks/<int:pk>/", async_views.task_detail, name="async-task-detail"),
     path("", include(router.urls)),
 ]
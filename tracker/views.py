@@ -1,15 +1,56 @@
 import random
-from django.db.models import Count, Q
-from drf_spectacular.utils import extend_schema
+from datetime import timedelta
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
 from rest_framework import viewsets
+from rest_framework.views import APIView
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
 
-from .models import Employee, Task
-from .serializers import EmployeeSerializer, TaskSerializer
+from .bulk import BulkModelMixin
+from .caching import CachedResponseMixin, cache_response, get_cache_stats
+from .coalescing import coalesce_requests
+from .conditional import ConditionalGetMixin, conditional_get
+from .dashboard import BREAKDOWN_DEFAULT_LIMIT, BREAKDOWN_MAX_LIMIT, BREAKDOWNS, get_dashboard
+from .deadlines import (
+    ALERT_KINDS,
+    ALERTS_DEFAULT_LIMIT,
+    ALERTS_MAX_LIMIT,
+    get_alert_groups,
+    get_alerts,
+    get_warning_hours,
+    scan_deadlines,
+)
+from .export import EXPORT_FORMATS
+from .fastpath import FastListMixin
+from .filters import TaskFilterBackend
+from .hierarchy import find_cycles, get_ancestors, get_subtree
+from .jobs import PRECOMPUTED, get_precomputed, get_queue_stats
+from .metrics import render_metrics
+from .middleware import timed_serialization
+from .models import CYCLE_ERROR_MESSAGE, ArchivedTask, Employee, Task
+from .recommendations import important_task_item, plan_assignments, recommend_assignees
+from .rollups import get_rollups
+from .search import SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT, SEARCH_MODES, TARGETS, search
+from .serializers import (
+    ArchivedTaskSerializer,
+    EmployeeBulkSerializer,
+    EmployeeSerializer,
+    EmployeeSyncSerializer,
+    TaskBulkSerializer,
+    TaskSerializer,
+    TaskSyncSerializer,
+    TaskTreeSerializer,
+)
+from .sync import SYNC_DEFAULT_LIMIT, SYNC_MAX_LIMIT, get_changes
+from .workload import DEFAULT_RANGE_DAYS, GRANULARITIES, get_employee_series, get_status_series
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(CachedResponseMixin, ConditionalGetMixin, FastListMixin, BulkModelMixin, viewsets.ModelViewSet):
     """
     API endpoint для работы с сотрудниками.
 
@@ -18,12 +59,17 @@ class EmployeeViewSet(viewsets.ModelViewSet):
 
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
+    bulk_serializer_class = EmployeeBulkSerializer
 
     @extend_schema(
         description="Получить список сотрудников, отсортированный по количеству активных задач.",
         responses={200: EmployeeSerializer(many=True)},
     )
     @action(detail=False, methods=["get"])
+    @cache_response
+    @coalesce_requests
+    # Счетчики активных задач меняются без `Employee.updated_at`, поэтому ответ зависит и от задач.
+    @conditional_get(lambda view, request: [Employee.objects.all(), Task.objects.all()])
     def busy_employees(self, request):
         """
         Получить список сотрудников, отсортированный по количеству активных задач.
@@ -31,23 +77,22 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         Returns:
             Response: Список сотрудников с количеством их активных задач.
         """
-        employees = Employee.objects.annotate(
-            active_tasks_count=Count("tasks", filter=Q(tasks__status__in=["not_started", "in_progress"]))
-        ).order_by("-active_tasks_count")
+        employees = self.paginate_queryset(Employee.objects.order_by("-active_tasks_count", "-id"))
         result = []
-        for employee in employees:
-            result.append(
-                {
-                    "ФИО": employee.full_name,
-                    "ID": employee.id,
-                    "Должность": employee.position,
-                    "Количество активных задач": employee.active_tasks_count,
-                }
-            )
-        return Response(result)
+        with timed_serialization():
+            for employee in employees:
+                result.append(
+                    {
+                        "ФИО": employee.full_name,
+                        "ID": employee.id,
+                        "Должность": employee.position,
+                        "Количество активных задач": employee.active_tasks_count,
+                    }
+                )
+        return self.get_paginated_response(result)
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(CachedResponseMixin, ConditionalGetMixin, FastListMixin, BulkModelMixin, viewsets.ModelViewSet):
     """
     API endpoint для работы с задачами.
 
@@ -56,60 +101,577 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
+    bulk_serializer_class = TaskBulkSerializer
+    filter_backends = [TaskFilterBackend]
+
+    def check_bulk_items(self, items, errors, instances=None):
+        assignee_ids = {item["assignee_id"] for item in items if item.get("assignee_id")}
+        parent_ids = {item["parent_task_id"] for item in items if item.get("parent_task_id")}
+        existing_assignees = set(Employee.objects.filter(pk__in=assignee_ids).values_list("pk", flat=True))
+        existing_parents = set(Task.objects.filter(pk__in=parent_ids).values_list("pk", flat=True))
+
+        cycles = set()
+        if instances is not None:
+            cycles = find_cycles({item["id"]: item["parent_task_id"] for item in items if "parent_task_id" in item})
+
+        for item, item_errors in zip(items, errors):
+            assignee_id = item.get("assignee_id")
+            if assignee_id and assignee_id not in existing_assignees:
+                item_errors["assignee"] = [f"Сотрудник {assignee_id} не найден."]
+            parent_id = item.get("parent_task_id")
+            if parent_id and parent_id == item.get("id"):
+                item_errors["parent_task"] = ["Задача не может быть своим собственным родителем."]
+            elif parent_id and parent_id not in existing_parents:
+                item_errors["parent_task"] = [f"Задача {parent_id} не найдена."]
+            elif item.get("id") in cycles:
+                item_errors["parent_task"] = [CYCLE_ERROR_MESSAGE]
 
     @extend_schema(
         description="Получить список важных задач с рекомендуемыми исполнителями.",
         responses={200: TaskSerializer(many=True)},
     )
-    @action(detail=False, methods=["get"])
+    @action(detail=False, methods=["get"], pagination_class=None)
+    @cache_response
+    @coalesce_requests
+    @conditional_get(lambda view, request: [Task.objects.all(), Employee.objects.all()])
     def important_tasks(self, request):
-        important_tasks = Task.objects.filter(
-            Q(status="not_started", subtasks__status="in_progress")
-            | Q(assignee__isnull=True, subtasks__status="in_progress")
-        ).distinct()
+        """
+        Получить список важных задач с рекомендуемыми исполнителями.
 
-        result = []
-        for task in important_tasks:
-            suggested_employee = None
-            suggested_reason = ""
-
-            employees = Employee.objects.annotate(
-                active_tasks_count=Count("tasks", filter=Q(tasks__status__in=["not_started", "in_progress"]))
-            ).order_by("active_tasks_count")
-
-            if not task.assignee:
-                if employees.exists():
-                    least_busy_employee = employees.first()
-                    min_tasks = least_busy_employee.active_tasks_count
-                    subtask_assignee = task.subtasks.filter(status="in_progress").values("assignee").first()
-                    if subtask_assignee:
-                        subtask_employee = employees.get(id=subtask_assignee["assignee"])
-
-                        if subtask_employee.active_tasks_count <= min_tasks + 2:
-                            suggested_employee = subtask_employee
-                            suggested_reason = "Сотрудник подзадачи не сильно загружен"
-                        else:
-                            suggested_employee = random.choice(employees.filter(active_tasks_count=min_tasks))
-                            suggested_reason = "Случайный наименее загруженный сотрудник"
-                    else:
-                        suggested_employee = random.choice(employees.filter(active_tasks_count=min_tasks))
-                        suggested_reason = "Случайный наименее загруженный сотрудник"
-            else:
-                suggested_employee = employees.get(id=task.assignee.id)
-                suggested_reason = "Уже назначенный исполнитель"
-
-            active_tasks_count = suggested_employee.active_tasks_count if suggested_employee else None
+        Returns:
+            Response: Список важных задач с предлагаемыми сотрудниками и причиной предложения.
+        """
+        result = [important_task_item(*recommendation) for recommendation in recommend_assignees()]
+        return Response(result)
+
+    @extend_schema(
+        description=(
+            "Получить основные показатели задач для дашборда: количество по статусам, активных, просроченных, "
+            "со скорым сроком и без исполнителя, а также количество занятых сотрудников. Все показатели "
+            "и разбивки вычисляются одним группирующим запросом."
+        ),
+        parameters=[
+            OpenApiParameter("breakdown", str, description=f"Разбивки через запятую: {', '.join(BREAKDOWNS)}."),
+            OpenApiParameter(
+                "limit",
+                OpenApiTypes.INT,
+                description=f"Строк в каждой разбивке (по умолчанию {BREAKDOWN_DEFAULT_LIMIT}, "
+                f"не более {BREAKDOWN_MAX_LIMIT}).",
+            ),
+            OpenApiParameter(
+                "hours",
+                OpenApiTypes.INT,
+                description="За сколько часов до срока задача считается задачей со скорым сроком "
+                "(по умолчанию TRACKER_DEADLINE_WARNING_HOURS).",
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["get"], pagination_class=None, filter_backends=[])
+    @cache_response
+    @coalesce_requests
+    def dashboard(self, request):
+        """
+        Получить сводные показатели задач.
+
+        Returns:
+            Response: Показатели и, по запросу, разбивки по сотрудникам и родительским задачам.
+            Ответ хранится в кэше не дольше момента, когда какая-либо задача станет просроченной
+            или войдет в окно скорого срока.
+        """
+        params = request.query_params
+        breakdowns = [name for name in params.get("breakdown", "").split(",") if name]
+        unknown = set(breakdowns) - set(BREAKDOWNS)
+        if unknown:
+            raise ValidationError({"breakdown": f"Допустимые значения: {', '.join(BREAKDOWNS)}."})
+        try:
+            limit = int(params.get("limit", BREAKDOWN_DEFAULT_LIMIT))
+        except ValueError:
+            raise ValidationError({"limit": "Ожидается целое число."})
+        try:
+            hours = int(params["hours"]) if "hours" in params else None
+        except ValueError:
+            raise ValidationError({"hours": "Ожидается целое число."})
+        if hours is not None and hours < 0:
+            raise ValidationError({"hours": "Ожидается неотрицательное число."})
+        limit = min(max(limit, 1), BREAKDOWN_MAX_LIMIT)
+
+        result, expires_at = get_dashboard(breakdowns, limit, hours)
+        response = Response(result)
+        response.cache_expires_at = expires_at
+        return response
+
+    @extend_schema(
+        description=(
+            "Составить план назначения всех неназначенных важных задач с учетом нагрузки, выданной в этом же плане. "
+            "GET возвращает план, POST назначает исполнителей."
+        ),
+        parameters=[OpenApiParameter("seed", int, description="Seed для воспроизводимого плана.")],
+        request=None,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["get", "post"], pagination_class=None, filter_backends=[])
+    @coalesce_requests
+    def assignment_plan(self, request):
+        """
+        Составить и при POST-запросе применить план назначения неназначенных важных задач.
+
+        Returns:
+            Response: Назначения с причиной и нагрузкой сотрудника после назначения.
+        """
+        seed = request.query_params.get("seed")
+        try:
+            rng = random.Random(int(seed)) if seed is not None else random.Random()
+        except ValueError:
+            raise ValidationError({"seed": "Ожидается целое число."})
+
+        plan = plan_assignments(rng, apply=request.method == "POST")
+        return Response(
+            [
+                {
+                    "ID задачи": task_id,
+                    "ID сотрудника": employee_id,
+                    "Причина предложения": reason,
+                    "Количество активных задач": load,
+                }
+                for task_id, employee_id, reason, load in plan
+            ]
+        )
+
+    @extend_schema(
+        description="Потоково выгрузить задачи в формате NDJSON или CSV. Поддерживает те же фильтры, что и список.",
+        parameters=[
+            OpenApiParameter("export_format", str, enum=list(EXPORT_FORMATS), description="Формат выгрузки."),
+            OpenApiParameter(
+                "include_archived", bool, description="Выгрузить после задач из основной таблицы задачи из архива."
+            ),
+        ],
+        responses={200: OpenApiTypes.BINARY},
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def export(self, request):
+        """
+        Потоково выгрузить задачи.
+
+        Returns:
+            StreamingHttpResponse: Задачи по одной на строку в формате NDJSON или CSV.
+        """
+        export_format = request.query_params.get("export_format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError({"export_format": f"Допустимые значения: {', '.join(EXPORT_FORMATS)}."})
+        iter_rows, content_type = EXPORT_FORMATS[export_format]
+
+        querysets = [self.filter_queryset(self.get_queryset())]
+        if request.query_params.get("include_archived") in ("1", "true"):
+            querysets.append(self.filter_queryset(ArchivedTask.objects.all()))
+        response = StreamingHttpResponse(iter_rows(*querysets), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="tasks.{export_format}"'
+        return response
+
+    @extend_schema(
+        description=(
+            "Получить сводку по деревьям задач: долю завершенных подзадач и нарушения сроков. "
+            "По умолчанию возвращаются все корневые задачи, параметр root ограничивает список."
+        ),
+        parameters=[OpenApiParameter("root", str, description="ID корневых задач через запятую.")],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["get"], filter_backends=[])
+    @coalesce_requests
+    def rollups(self, request):
+        """
+        Получить сводку по деревьям задач.
 
+        Returns:
+            Response: Для каждой корневой задачи — прогресс подзадач любой вложенности,
+            число подзадач со сроком позже срока родителя и просроченных подзадач активных задач.
+        """
+        roots = Task.objects.filter(parent_task__isnull=True).order_by("id")
+        if request.query_params.get("root"):
+            try:
+                root_ids = [int(root_id) for root_id in request.query_params["root"].split(",")]
+            except ValueError:
+                raise ValidationError({"root": "Ожидаются целочисленные идентификаторы через запятую."})
+            roots = roots.filter(pk__in=root_ids)
+
+        page = self.paginate_queryset(roots.only("id", "name"))
+        rollups = get_rollups([task.id for task in page])
+        result = []
+        for task in page:
+            rollup = rollups[task.id]
             result.append(
                 {
-                    "Важная задача": task.name,
                     "ID задачи": task.id,
-                    "Срок": task.deadline.strftime("%Y-%m-%d") if task.deadline else None,
-                    "ФИО предлагаемого сотрудника": suggested_employee.full_name if suggested_employee else [],
-                    "ID предлагаемого сотрудника": suggested_employee.id if suggested_employee else None,
-                    "Причина предложения": suggested_reason,
-                    "Количество активных задач": active_tasks_count,
+                    "Задача": task.name,
+                    "Всего подзадач": rollup.total,
+                    "Завершено подзадач": rollup.completed,
+                    "Доля завершенных": round(rollup.completed / rollup.total, 4) if rollup.total else None,
+                    "Подзадач со сроком позже родителя": rollup.late_deadlines,
+                    "Просроченных подзадач у активных задач": rollup.overdue_under_active,
+                    "Есть риск по срокам": bool(rollup.late_deadlines or rollup.overdue_under_active),
                 }
             )
+        return self.get_paginated_response(result)
 
-        return Response(result)
+    @extend_schema(
+        description="Получить задачу со всеми подзадачами любой вложенности в порядке обхода в глубину.",
+        responses={200: TaskTreeSerializer(many=True)},
+    )
+    @action(detail=True, methods=["get"], pagination_class=None, filter_backends=[])
+    def tree(self, request, pk=None):
+        """
+        Получить поддерево задачи.
+
+        Returns:
+            Response: Задача и все ее потомки с глубиной вложенности (0 — сама задача).
+        """
+        tasks = get_subtree(self.parse_pk(pk))
+        if not tasks:
+            raise NotFound()
+        with timed_serialization():
+            data = TaskTreeSerializer(tasks, many=True).data
+        return Response(data)
+
+    @extend_schema(
+        description="Получить цепочку родительских задач от непосредственного родителя до корня.",
+        responses={200: TaskTreeSerializer(many=True)},
+    )
+    @action(detail=True, methods=["get"], pagination_class=None, filter_backends=[])
+    def ancestors(self, request, pk=None):
+        """
+        Получить предков задачи.
+
+        Returns:
+            Response: Предки задачи с расстоянием до нее (1 — непосредственный родитель).
+        """
+        tasks = get_ancestors(self.parse_pk(pk))
+        if tasks is None:
+            raise NotFound()
+        with timed_serialization():
+            data = TaskTreeSerializer(tasks, many=True).data
+        return Response(data)
+
+    @staticmethod
+    def parse_pk(pk):
+        try:
+            return int(pk)
+        except ValueError:
+            raise NotFound()
+
+
+class ArchivedTaskViewSet(FastListMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint для чтения архива завершенных задач.
+
+    Поддерживает те же фильтры и сортировки, что и список задач.
+    """
+
+    queryset = ArchivedTask.objects.all()
+    serializer_class = ArchivedTaskSerializer
+    filter_backends = [TaskFilterBackend]
+
+
+class CacheStatsView(APIView):
+    """
+    Статистика кэша ответов.
+    """
+
+    @extend_schema(
+        description="Получить количество попаданий и промахов кэша ответов.",
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        return Response(get_cache_stats())
+
+
+class JobStatsView(APIView):
+    """
+    Состояние очереди фоновых заданий.
+    """
+
+    @extend_schema(
+        description=(
+            "Получить количество заданий по статусам и время, с которого ждет самое старое готовое задание "
+            "(если оно давнее, обработчиков не хватает или они не запущены)."
+        ),
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        return Response(get_queue_stats())
+
+
+class PrecomputedResultView(APIView):
+    """
+    Последний результат аналитики, вычисленный фоновым обработчиком.
+    """
+
+    @extend_schema(
+        description=(
+            f"Получить сохраненный результат аналитики ({', '.join(PRECOMPUTED)}) без его вычисления в запросе. "
+            "Если данные изменились после вычисления, возвращается сохраненный результат с заголовком "
+            "X-Stale: 1, а пересчет ставится в очередь фоновых заданий. Время вычисления — в заголовке X-Computed-At."
+        ),
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request, name):
+        if name not in PRECOMPUTED:
+            raise NotFound(f"Неизвестная аналитика: {name}.")
+        data, computed_at, stale = get_precomputed(name)
+        response = Response(data)
+        response["X-Computed-At"] = computed_at.isoformat()
+        if stale:
+            response["X-Stale"] = "1"
+        return response
+
+
+class MetricsView(APIView):
+    """
+    Метрики процесса в текстовом формате Prometheus.
+    """
+
+    @extend_schema(
+        description="Получить гистограммы времени обработки и количества SQL-запросов по маршрутам.",
+        responses={(200, "text/plain"): OpenApiTypes.STR},
+    )
+    def get(self, request):
+        return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+class ChangesView(APIView):
+    """
+    Delta-синхронизация: изменения сотрудников и задач после курсора.
+    """
+
+    @extend_schema(
+        description=(
+            "Получить задачи и сотрудников, созданных или измененных после курсора, и ID удаленных объектов. "
+            "Без параметра since возвращается полная выгрузка. Пока has_more=true, следующий запрос "
+            "нужно выполнять сразу с новым курсором."
+        ),
+        parameters=[
+            OpenApiParameter("since", OpenApiTypes.STR, description="Курсор из предыдущего ответа."),
+            OpenApiParameter(
+                "limit",
+                OpenApiTypes.INT,
+                description=f"Максимум записей каждого вида в ответе (не более {SYNC_MAX_LIMIT}).",
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", SYNC_DEFAULT_LIMIT))
+        except ValueError:
+            raise ValidationError({"limit": "Ожидается целое число."})
+        limit = min(max(limit, 1), SYNC_MAX_LIMIT)
+        try:
+            changes = get_changes(request.query_params.get("since"), limit)
+        except ValueError as error:
+            raise ValidationError({"since": str(error)})
+
+        with timed_serialization():
+            changes["tasks"] = TaskSyncSerializer(changes["tasks"], many=True).data
+            changes["employees"] = EmployeeSyncSerializer(changes["employees"], many=True).data
+        return Response(changes)
+
+
+WORKLOAD_PARAMETERS = [
+    OpenApiParameter(
+        "start", OpenApiTypes.DATE, description=f"Начало диапазона (по умолчанию {DEFAULT_RANGE_DAYS} дней до конца)."
+    ),
+    OpenApiParameter("end", OpenApiTypes.DATE, description="Конец диапазона включительно (по умолчанию сегодня)."),
+    OpenApiParameter("granularity", str, enum=list(GRANULARITIES), description="Размер периода."),
+]
+
+
+class WorkloadHistoryMixin:
+    """Разбор диапазона дат и размера периода для истории загруженности."""
+
+    def parse_range(self, request):
+        params = request.query_params
+        try:
+            end = parse_date(params["end"]) if "end" in params else timezone.localdate()
+            start = parse_date(params["start"]) if "start" in params else end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+        except ValueError:
+            end = start = None
+        if start is None or end is None:
+            raise ValidationError({"start": "Ожидаются даты в формате ГГГГ-ММ-ДД."})
+        if start > end:
+            raise ValidationError({"start": "Начало диапазона позже его конца."})
+        granularity = params.get("granularity", "day")
+        if granularity not in GRANULARITIES:
+            raise ValidationError({"granularity": f"Допустимые значения: {', '.join(GRANULARITIES)}."})
+        return start, end, granularity
+
+
+class EmployeeWorkloadHistoryView(WorkloadHistoryMixin, APIView):
+    """
+    История количества активных задач сотрудников по снимкам загруженности.
+    """
+
+    max_employees = 100
+
+    @extend_schema(
+        description=(
+            "Получить среднее количество активных задач сотрудников по периодам. Без параметра employee "
+            "возвращаются суммарные значения по всем сотрудникам. Данные берутся из снимков команды snapshot_workload."
+        ),
+        parameters=[
+            *WORKLOAD_PARAMETERS,
+            OpenApiParameter("employee", str, description="ID сотрудников через запятую (не более 100)."),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        start, end, granularity = self.parse_range(request)
+        employee_ids = None
+        if request.query_params.get("employee"):
+            try:
+                employee_ids = [int(employee_id) for employee_id in request.query_params["employee"].split(",")]
+            except ValueError:
+                raise ValidationError({"employee": "Ожидаются целочисленные идентификаторы через запятую."})
+            if len(employee_ids) > self.max_employees:
+                raise ValidationError({"employee": f"Не более {self.max_employees} сотрудников за запрос."})
+        return Response(get_employee_series(start, end, granularity, employee_ids))
+
+
+class StatusHistoryView(WorkloadHistoryMixin, APIView):
+    """
+    История количества задач по статусам по снимкам загруженности.
+    """
+
+    @extend_schema(
+        description=(
+            "Получить среднее количество задач в каждом статусе и количество измененных задач по периодам. "
+            "Данные берутся из снимков команды snapshot_workload."
+        ),
+        parameters=WORKLOAD_PARAMETERS,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        return Response(get_status_series(*self.parse_range(request)))
+
+
+class SearchView(APIView):
+    """
+    Поиск сотрудников по ФИО и задач по названию с учетом опечаток.
+    """
+
+    @extend_schema(
+        description=(
+            "Найти сотрудников и задачи по имени с ранжированием по сходству. Режим fuzzy находит совпадения "
+            "по подстроке и с опечатками, режим prefix — по началу слова (для автодополнения)."
+        ),
+        parameters=[
+            OpenApiParameter("q", str, required=True, description="Строка поиска."),
+            OpenApiParameter("type", str, enum=["all", *TARGETS], description="Где искать (по умолчанию all)."),
+            OpenApiParameter("mode", str, enum=list(SEARCH_MODES), description="Режим поиска (по умолчанию fuzzy)."),
+            OpenApiParameter(
+                "limit",
+                OpenApiTypes.INT,
+                description=f"Максимум результатов каждого вида (по умолчанию {SEARCH_DEFAULT_LIMIT}, "
+                f"не более {SEARCH_MAX_LIMIT}).",
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        params = request.query_params
+        query = params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "Обязательный параметр."})
+        target = params.get("type", "all")
+        if target != "all" and target not in TARGETS:
+            raise ValidationError({"type": f"Допустимые значения: all, {', '.join(TARGETS)}."})
+        mode = params.get("mode", "fuzzy")
+        if mode not in SEARCH_MODES:
+            raise ValidationError({"mode": f"Допустимые значения: {', '.join(SEARCH_MODES)}."})
+        try:
+            limit = int(params.get("limit", SEARCH_DEFAULT_LIMIT))
+        except ValueError:
+            raise ValidationError({"limit": "Ожидается целое число."})
+        limit = min(max(limit, 1), SEARCH_MAX_LIMIT)
+
+        targets = TARGETS if target == "all" else [target]
+        return Response({name: search(name, query, limit, mode) for name in targets})
+
+
+class DeadlineAlertsView(APIView):
+    """
+    Предупреждения о сроках задач, сгруппированные по сотрудникам.
+    """
+
+    @extend_schema(
+        description=(
+            "Получить по каждому сотруднику количество просроченных задач и задач со скорым сроком "
+            "(ID сотрудника null — задачи без исполнителя). Данные обновляет сканер сроков."
+        ),
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        return Response(get_alert_groups())
+
+
+class DeadlineAlertListView(APIView):
+    """
+    Список предупреждений о сроках задач.
+    """
+
+    @extend_schema(
+        description="Получить предупреждения о сроках по возрастанию срока.",
+        parameters=[
+            OpenApiParameter("employee", OpenApiTypes.INT, description="ID сотрудника; 0 — задачи без исполнителя."),
+            OpenApiParameter("kind", str, enum=ALERT_KINDS, description="Вид предупреждения."),
+            OpenApiParameter(
+                "limit",
+                OpenApiTypes.INT,
+                description=f"Максимум записей (по умолчанию {ALERTS_DEFAULT_LIMIT}, не более {ALERTS_MAX_LIMIT}).",
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        params = request.query_params
+        try:
+            employee_id = int(params["employee"]) if "employee" in params else None
+        except ValueError:
+            raise ValidationError({"employee": "Ожидается целое число."})
+        kind = params.get("kind")
+        if kind is not None and kind not in ALERT_KINDS:
+            raise ValidationError({"kind": f"Допустимые значения: {', '.join(ALERT_KINDS)}."})
+        try:
+            limit = int(params.get("limit", ALERTS_DEFAULT_LIMIT))
+        except ValueError:
+            raise ValidationError({"limit": "Ожидается целое число."})
+        limit = min(max(limit, 1), ALERTS_MAX_LIMIT)
+        return Response(get_alerts(employee_id, kind, limit))
+
+
+class DeadlineScanView(APIView):
+    """
+    Запуск сканера сроков.
+    """
+
+    @extend_schema(
+        description=(
+            "Обработать задачи, срок которых прошел или вошел в окно предупреждения после предыдущего запуска, "
+            "и задачи, измененные с тех пор. Возвращает количество новых и снятых предупреждений."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "hours",
+                OpenApiTypes.INT,
+                description="За сколько часов до срока предупреждать (по умолчанию TRACKER_DEADLINE_WARNING_HOURS).",
+            ),
+        ],
+        request=None,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def post(self, request):
+        try:
+            hours = int(request.query_params.get("hours", get_warning_hours()))
+        except ValueError:
+            raise ValidationError({"hours": "Ожидается целое число."})
+        if hours < 0:
+            raise ValidationError({"hours": "Ожидается неотрицательное число."})
+        return Response(scan_deadlines(hours))
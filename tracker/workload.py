@@ -0,0 +1,173 @@
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Avg, Count, F, Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import Employee, EmployeeWorkloadRollup, StatusRollup, StatusTransition, Task
+
+# Функция усечения даты до начала периода; значение за период — среднее по дням снимков.
+GRANULARITIES = {
+    "day": None,
+    "week": TruncWeek,
+    "month": TruncMonth,
+}
+DEFAULT_RANGE_DAYS = 30
+
+
+def take_snapshot():
+    """
+    Записать снимок загруженности за текущий день.
+
+    Количество активных задач сотрудников берется из хранимых счетчиков одним запросом
+    к `Employee`, количество задач по статусам — одним группирующим запросом к `Task`,
+    количество переходов в каждый статус — из журнала смен статуса `StatusTransition`.
+    Повторный запуск в тот же день заменяет снимок этого дня: записываются только строки,
+    значения которых изменились, а строки удаленных с тех пор сотрудников удаляются.
+    Количество переходов за предыдущий день уточняется (в него попадают переходы после его
+    последнего снимка), после чего журнал до начала предыдущего дня удаляется.
+
+    Returns:
+        dict: Дата снимка и количество записанных строк сотрудников и статусов.
+    """
+    day = timezone.localdate()
+    day_start = timezone.make_aware(datetime.combine(day, time.min))
+    previous_start = timezone.make_aware(datetime.combine(day - timedelta(days=1), time.min))
+
+    with transaction.atomic():
+        loads = dict(Employee.objects.values_list("id", "active_tasks_count"))
+        stored = dict(EmployeeWorkloadRollup.objects.filter(date=day).values_list("employee_id", "active_tasks"))
+        changed = [
+            EmployeeWorkloadRollup(date=day, employee_id=employee_id, active_tasks=active_tasks)
+            for employee_id, active_tasks in loads.items()
+            if stored.get(employee_id) != active_tasks
+        ]
+        EmployeeWorkloadRollup.objects.bulk_create(
+            changed,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["employee_id", "date"],
+            update_fields=["active_tasks"],
+        )
+        removed = stored.keys() - loads.keys()
+        if removed:
+            EmployeeWorkloadRollup.objects.filter(date=day, employee_id__in=removed).delete()
+
+        counts = dict(
+            Task.objects.order_by().values("status").annotate(tasks=Count("pk")).values_list("status", "tasks")
+        )
+        transitions = {
+            row["to_status"]: row
+            for row in StatusTransition.objects.filter(changed_at__gte=previous_start)
+            .order_by()
+            .values("to_status")
+            .annotate(
+                today=Count("pk", filter=Q(changed_at__gte=day_start)),
+                previous=Count("pk", filter=Q(changed_at__lt=day_start)),
+            )
+        }
+        statuses = [
+            StatusRollup(
+                date=day,
+                status=status,
+                tasks=counts.get(status, 0),
+                transitions=transitions.get(status, {}).get("today", 0),
+            )
+            for status, _ in Task.STATUS_CHOICES
+        ]
+        StatusRollup.objects.bulk_create(
+            statuses, update_conflicts=True, unique_fields=["date", "status"], update_fields=["tasks", "transitions"]
+        )
+        previous = list(StatusRollup.objects.filter(date=day - timedelta(days=1)))
+        for rollup in previous:
+            rollup.transitions = transitions.get(rollup.status, {}).get("previous", 0)
+        StatusRollup.objects.bulk_update(previous, ["transitions"])
+        StatusTransition.objects.filter(changed_at__lt=previous_start).delete()
+    return {"date": day, "employees": len(changed), "statuses": len(statuses)}
+
+
+def _period(granularity):
+    trunc = GRANULARITIES[granularity]
+    return trunc("date") if trunc else F("date")
+
+
+def get_employee_series(start, end, granularity="day", employee_ids=None):
+    """
+    Получить количество активных задач сотрудников по периодам.
+
+    Читает только таблицу снимков: для выбранных сотрудников — по индексу (сотрудник, дата),
+    без них — по индексу даты.
+
+    Args:
+        start, end: Границы диапазона дат включительно.
+        granularity: "day", "week" или "month".
+        employee_ids: ID сотрудников; без них возвращаются суммарные значения по всем сотрудникам.
+
+    Returns:
+        list: Словари с началом периода и средним за период количеством активных задач,
+        в порядке периодов (и ID сотрудников).
+    """
+    queryset = EmployeeWorkloadRollup.objects.filter(date__range=(start, end)).order_by()
+    if employee_ids:
+        rows = (
+            queryset.filter(employee_id__in=employee_ids)
+            .values("employee_id", period=_period(granularity))
+            .annotate(average=Avg("active_tasks"))
+            .values_list("period", "employee_id", "average")
+            .order_by("period", "employee_id")
+        )
+        return [
+            {"Период": period, "ID сотрудника": employee_id, "Активных задач": round(average, 2)}
+            for period, employee_id, average in rows
+        ]
+
+    # Сначала суммы по дням, затем средние по периодам: вложенную агрегацию ORM не выражает.
+    days = queryset.values("date").annotate(total=Sum("active_tasks"), employees=Count("pk")).order_by("date")
+    periods = {}
+    for day in days:
+        period = _truncate(day["date"], granularity)
+        periods.setdefault(period, []).append(day)
+    result = []
+    for period, rows in periods.items():
+        total = sum(row["total"] for row in rows) / len(rows)
+        employees = sum(row["employees"] for row in rows) / len(rows)
+        result.append(
+            {
+                "Период": period,
+                "Активных задач": round(total, 2),
+                "Сотрудников": round(employees, 2),
+                "В среднем на сотрудника": round(total / employees, 2) if employees else None,
+            }
+        )
+    return result
+
+
+def _truncate(day, granularity):
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def get_status_series(start, end, granularity="day"):
+    """
+    Получить количество задач по статусам и количество переходов в статусы по периодам.
+
+    Returns:
+        list: Словари с началом периода, статусом, средним за период количеством задач
+        и суммой переходов задач в статус за дни периода.
+    """
+    rows = (
+        StatusRollup.objects.filter(date__range=(start, end))
+        .order_by()
+        .values("status", period=_period(granularity))
+        .annotate(average=Avg("tasks"), transitions=Sum("transitions"))
+        .values_list("period", "status", "average", "transitions")
+        .order_by("period", "status")
+    )
+    return [
+        {"Период": period, "Статус": status, "Задач": round(average, 2), "Переходов в статус": transitions}
+        for period, status, average, transitions in rows
+    ]